@@ -0,0 +1,86 @@
+# animation.py
+
+# Relógio de animação compartilhado e tabelas de frames pré-compiladas.
+# Em vez de cada personagem ter seu próprio 'frame_timer' que avança a cada tick, existe um único
+# relógio (AnimationClock). Cada personagem guarda apenas QUANDO sua animação atual começou
+# (o "deslocamento de fase"); o frame atual é uma conta: (agora - início) / duração do frame.
+# As tabelas de frames guardam, para cada animação, os nomes e as imagens (Surfaces) já resolvidas.
+FRAME_DURATION = 0.15 # Tempo em segundos que cada frame fica na tela (mesmo valor de antes)
+
+
+class AnimationClock:
+    # Tempo de animação em segundos, avançado uma vez por tick pelo mundo.
+    def __init__(self):
+        self.time = 0.0
+
+    def advance(self, dt):
+        """Avança o relógio; todas as animações "andam" juntas, sem trabalho por personagem."""
+        self.time += dt
+
+    def frame_index(self, start, length, frame_duration=FRAME_DURATION):
+        """Índice do frame de uma animação de 'length' frames que começou no instante 'start'."""
+        return int((self.time - start) / frame_duration) % length
+
+
+# Relógio usado por personagens criados sem mundo (ex: em testes rápidos).
+default_clock = AnimationClock()
+
+
+class FrameTable:
+    # Uma animação "compilada": nomes dos frames e, quando possível, as Surfaces já carregadas.
+    def __init__(self, animations, resolve=None):
+        self.names = {name: tuple(frames) for name, frames in animations.items()}
+        self.lengths = {name: len(frames) for name, frames in self.names.items()}
+        self.surfaces = None
+        if resolve:
+            self.surfaces = {name: tuple(resolve(frame) for frame in frames)
+                             for name, frames in self.names.items()}
+
+    def frame(self, animation_name, index):
+        """Retorna (nome, surface) do frame; a surface é None se não houver resolvedor de imagens."""
+        surface = self.surfaces[animation_name][index] if self.surfaces else None
+        return self.names[animation_name][index], surface
+
+
+# Tabelas compiladas, uma por dicionário de animações (player_animations, enemy_animations, ...).
+_frame_tables = {}
+_resolve = None
+
+
+def set_frame_resolver(resolve):
+    """
+    Define como um nome de imagem vira uma Surface (no jogo: images.load do PgZero).
+    As tabelas são recompiladas sob demanda com o novo resolvedor.
+    """
+    global _resolve
+    _resolve = resolve
+    _frame_tables.clear()
+
+
+def frame_table(animations):
+    """Retorna a tabela compilada de um dicionário de animações, compilando-a na primeira vez."""
+    table = _frame_tables.get(id(animations))
+    if table is None:
+        table = _frame_tables[id(animations)] = FrameTable(animations, _resolve)
+    return table
+
+
+def show_frame(actor, name, surface):
+    """
+    Troca a imagem do Actor para um frame já resolvido, sem passar pelo carregador do PgZero.
+    Sem surface (nenhum resolvedor definido), usa o caminho normal 'actor.image = nome'.
+    """
+    if surface is None:
+        actor.image = name
+        return
+    # Mesmo efeito do setter Actor.image do PgZero 1.2, mas com a Surface já em mãos.
+    actor._image_name = name
+    actor._orig_surf = actor._surf = surface
+    actor._update_pos()
+
+# Explicação da Decisão:
+# - Um relógio único transforma "N timers avançando a cada tick" em "uma soma por tick";
+#   o frame de cada personagem só é calculado quando alguém precisa dele (na hora de desenhar).
+# - As tabelas são indexadas pelo próprio dicionário de animações, então 'player_animations' e
+#   'enemy_animations' continuam sendo escritos da mesma forma, como listas de nomes.
+# - Guardar as Surfaces resolvidas evita que o PgZero procure a imagem pelo nome a cada troca de frame.
@@ -0,0 +1,148 @@
+# assets.py
+
+# Gerenciador de assets com carregamento em segundo plano.
+# Cada asset é uma tarefa com duas partes:
+#   - load(): o trabalho pesado (ler o arquivo, decodificar PNG/OGG), feito por uma thread auxiliar;
+#   - finish(resultado): o acabamento que precisa da thread principal (ex: convert_alpha(), que usa
+#     a janela, ou tocar a música), feito em poll() assim que a tarefa termina.
+# Enquanto isso, o jogo continua desenhando a tela de carregamento com o progresso.
+# Um asset pedido antes de a thread chegar nele (get()) é carregado na hora, sob demanda.
+import json
+import threading
+import time
+
+
+class AssetManager:
+    # Lista de tarefas de carregamento, executadas em ordem por uma thread auxiliar.
+    def __init__(self):
+        self.tasks = {} # nome -> (load, finish)
+        self.order = [] # Ordem de carregamento
+        self.results = {} # nome -> resultado de load() (None se falhou)
+        self.errors = {} # nome -> exceção de load() ou finish()
+        self.claimed = set() # Tarefas que alguém (a thread ou um get()) já começou a carregar
+        self.loaded = {} # nome -> threading.Event, sinalizado quando load() termina
+        self.finished = set() # Tarefas cujo finish() já rodou na thread principal
+        self.lock = threading.Lock()
+        self.thread = None
+        self.created = time.perf_counter() # Referência para os tempos de inicialização
+        self.first_frame_time = None # Segundos até o primeiro frame desenhado
+        self.ready_time = None # Segundos até todos os assets estarem prontos
+
+    def add(self, name, load, finish=None):
+        """Registra um asset: 'load()' roda na thread auxiliar; 'finish(resultado)', na thread principal."""
+        self.tasks[name] = (load, finish)
+        self.order.append(name)
+        self.loaded[name] = threading.Event()
+
+    def start(self):
+        """Começa a carregar em segundo plano; retorna imediatamente."""
+        self.thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def _claim(self, name):
+        with self.lock:
+            if name in self.claimed:
+                return False
+            self.claimed.add(name)
+            return True
+
+    def _load(self, name):
+        """Executa o load() de uma tarefa (em qualquer thread) e guarda o resultado ou o erro."""
+        try:
+            self.results[name] = self.tasks[name][0]()
+        except Exception as e: # Um asset quebrado não pode impedir o jogo de abrir
+            self.results[name] = None
+            self.errors[name] = e
+            print(f"❌ ERRO ao carregar '{name}': {e}")
+        self.loaded[name].set()
+
+    def _run(self):
+        for name in self.order:
+            if self._claim(name):
+                self._load(name)
+
+    @property
+    def progress(self):
+        """Fração dos assets já carregados (0.0 a 1.0)."""
+        if not self.order:
+            return 1.0
+        return sum(event.is_set() for event in self.loaded.values()) / len(self.order)
+
+    @property
+    def ready(self):
+        return self.ready_time is not None
+
+    def _finish(self, name):
+        """Roda o acabamento de uma tarefa já carregada na thread principal (uma única vez)."""
+        if name in self.finished:
+            return
+        self.finished.add(name)
+        finish = self.tasks[name][1]
+        if finish and name not in self.errors:
+            try:
+                finish(self.results[name])
+            except Exception as e:
+                self.errors[name] = e
+                print(f"❌ ERRO ao preparar '{name}': {e}")
+
+    def poll(self):
+        """
+        Chamado pela thread principal a cada frame: faz o acabamento das tarefas que já terminaram,
+        na ordem em que foram registradas. Retorna True quando tudo está pronto.
+        """
+        if self.ready:
+            return True
+        for name in self.order:
+            if not self.loaded[name].is_set():
+                return False # Respeita a ordem: o acabamento de um asset pode depender do anterior
+            self._finish(name)
+        self.ready_time = time.perf_counter() - self.created
+        return True
+
+    def wait(self):
+        """Bloqueia até tudo estar carregado e pronto (ex: testes e benchmarks sem janela)."""
+        for name in self.order:
+            self.get(name)
+        return self.poll()
+
+    def get(self, name):
+        """
+        Retorna o asset, carregando-o na hora se a thread auxiliar ainda não chegou nele
+        (ou esperando por ela, se ela já estiver no meio do carregamento).
+        """
+        if self._claim(name):
+            self._load(name)
+        self.loaded[name].wait()
+        self._finish(name)
+        return self.results[name]
+
+    def mark_first_frame(self):
+        """Registra o tempo até o primeiro frame (chamado pelo draw())."""
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter() - self.created
+
+    def startup_report(self):
+        """Tempos de inicialização em milissegundos, para acompanhar a evolução entre versões."""
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "first_frame_ms": None if self.first_frame_time is None else round(self.first_frame_time * 1000, 2),
+            "ready_ms": None if self.ready_time is None else round(self.ready_time * 1000, 2),
+            "assets": len(self.order),
+            "errors": sorted(self.errors),
+        }
+
+    def log_startup(self, path):
+        """Acrescenta o relatório de inicialização a um arquivo JSON Lines (uma linha por execução)."""
+        try:
+            with open(path, "a") as f:
+                f.write(json.dumps(self.startup_report()) + "\n")
+        except OSError as e:
+            print(f"Não foi possível gravar os tempos de inicialização: {e}")
+
+# Explicação da Decisão:
+# - Ler e decodificar arquivos é a parte lenta e não precisa da janela, então vai para uma thread;
+#   o que mexe com a janela ou com o mixer "ao vivo" (converter superfícies, tocar música) fica
+#   no acabamento, na thread principal, onde o Pygame espera que aconteça.
+# - A tela de carregamento aparece no primeiro frame, antes de qualquer arquivo ser lido: o tempo
+#   até o primeiro frame deixa de depender da quantidade de assets.
+# - get() permite que um asset necessário antes da hora seja carregado sob demanda, sem esperar a fila.
@@ -0,0 +1,163 @@
+# atlas.py
+
+# Atlas de sprites: todos os frames do jogo (persona_*, enemy_*, key, door-*) e os frames
+# recortados do 'rogue spritesheet calciumtrice.png' são empacotados em UMA imagem (images/atlas.png),
+# com um índice (images/atlas.json) que diz onde cada frame está.
+#
+# Para (re)gerar o atlas depois de mudar alguma imagem:
+#     python atlas.py
+#
+# Em tempo de execução, o jogo abre só o atlas (o AssetManager do game.py cria o SpriteAtlas e chama
+# install()) e entrega ao PgZero um "pedaço" (subsurface) dele para cada nome de imagem, então
+# Actor("key") e actor.image = "persona_walk_up_0" continuam iguais.
+import fnmatch
+import json
+import os
+
+import pygame
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+ATLAS_MAX_WIDTH = 1024 # Largura máxima da textura; a altura cresce conforme necessário
+ATLAS_PADDING = 1 # Pixels vazios entre frames, para evitar "vazamento" de um frame no vizinho
+
+# Imagens avulsas que entram no atlas (padrões de nome de arquivo, sem a pasta).
+ATLAS_PATTERNS = ["persona_*.png", "enemy_*.png", "key.png", "door-*.png"]
+
+# Spritesheets recortadas em frames de tamanho fixo: arquivo -> (prefixo, largura, altura do frame).
+# Cada frame vira "<prefixo>_<linha>_<coluna>"; frames totalmente transparentes são ignorados.
+ATLAS_SHEETS = {
+    "rogue spritesheet calciumtrice.png": ("rogue", 32, 32),
+}
+
+
+def collect_frames(images_dir=IMAGES_DIR):
+    """
+    Carrega as imagens do atlas e retorna um dicionário nome -> Surface.
+    O nome é o mesmo que o PgZero usaria (nome do arquivo sem extensão).
+    """
+    frames = {}
+    for filename in sorted(os.listdir(images_dir)):
+        if any(fnmatch.fnmatch(filename, pattern) for pattern in ATLAS_PATTERNS):
+            name = os.path.splitext(filename)[0]
+            frames[name] = pygame.image.load(os.path.join(images_dir, filename))
+
+    for filename, (prefix, frame_width, frame_height) in ATLAS_SHEETS.items():
+        sheet = pygame.image.load(os.path.join(images_dir, filename))
+        columns = sheet.get_width() // frame_width
+        rows = sheet.get_height() // frame_height
+        for row in range(rows):
+            for column in range(columns):
+                rect = pygame.Rect(column * frame_width, row * frame_height, frame_width, frame_height)
+                frame = sheet.subsurface(rect)
+                if frame.get_bounding_rect().width == 0: # Frame vazio
+                    continue
+                frames[f"{prefix}_{row}_{column}"] = frame
+    return frames
+
+
+def pack(sizes, max_width=ATLAS_MAX_WIDTH, padding=ATLAS_PADDING):
+    """
+    Empacotamento em "prateleiras": os frames são ordenados do mais alto para o mais baixo e
+    colocados lado a lado; quando a linha enche, abre-se uma nova prateleira abaixo.
+    'sizes' é um dicionário nome -> (largura, altura). Retorna (posições, largura, altura) do atlas.
+    """
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], name))
+    positions = {}
+    x = y = shelf_height = used_width = 0
+    for name in order:
+        width, height = sizes[name]
+        if width > max_width:
+            raise ValueError(f"O frame '{name}' ({width}px) é mais largo que o atlas ({max_width}px).")
+        if x + width > max_width: # Não cabe na prateleira atual: começa outra
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        positions[name] = (x, y)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+        used_width = max(used_width, x - padding)
+    return positions, used_width, y + shelf_height
+
+
+def build_atlas(images_dir=IMAGES_DIR):
+    """Gera atlas.png e atlas.json na pasta de imagens. Retorna a quantidade de frames."""
+    frames = collect_frames(images_dir)
+    sizes = {name: surface.get_size() for name, surface in frames.items()}
+    positions, width, height = pack(sizes)
+
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    index = {}
+    for name, surface in frames.items():
+        x, y = positions[name]
+        atlas.blit(surface, (x, y))
+        index[name] = [x, y, *sizes[name]]
+
+    pygame.image.save(atlas, os.path.join(images_dir, ATLAS_IMAGE))
+    # Um frame por linha, em ordem alfabética: o diff do índice mostra exatamente o que mudou.
+    lines = [f"  {json.dumps(name)}: {json.dumps(index[name])}" for name in sorted(index)]
+    with open(os.path.join(images_dir, ATLAS_INDEX), "w") as f:
+        f.write('{\n "image": %s,\n "frames": {\n%s\n }\n}\n' % (json.dumps(ATLAS_IMAGE), ",\n".join(lines)))
+    return len(index)
+
+# Explicação da Decisão:
+# - O empacotamento em prateleiras é simples e, para sprites de alturas parecidas como os nossos,
+#   desperdiça pouco espaço; não justifica uma dependência externa.
+# - O índice em JSON é legível e fácil de conferir em um diff quando uma imagem muda.
+
+
+class SpriteAtlas:
+    # Atlas carregado em memória: uma textura e um retângulo por nome de frame.
+    def __init__(self, images_dir=IMAGES_DIR, convert=True):
+        """
+        Lê o índice e a textura. Com convert=False, a conversão para o formato da tela fica para
+        depois (convert()): assim a leitura pode ser feita por uma thread de carregamento.
+        """
+        with open(os.path.join(images_dir, ATLAS_INDEX)) as f:
+            index = json.load(f)
+        self.texture = pygame.image.load(os.path.join(images_dir, index["image"]))
+        self.rects = {name: pygame.Rect(rect) for name, rect in index["frames"].items()}
+        self.frames = {} # Cache de subsurfaces já criadas
+        if convert:
+            self.convert()
+
+    def convert(self):
+        """Converte a textura para o formato da janela (blits mais rápidos); exige a thread principal."""
+        if pygame.display.get_surface(): # convert_alpha() exige uma janela (não existe no modo headless)
+            self.texture = self.texture.convert_alpha()
+            self.frames.clear() # Subsurfaces antigas apontariam para a textura não convertida
+
+    def __contains__(self, name):
+        return name in self.rects
+
+    def get(self, name):
+        """Retorna o frame como uma subsurface da textura (sem copiar pixels)."""
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = self.frames[name] = self.texture.subsurface(self.rects[name])
+        return frame
+
+    def install(self, image_loader):
+        """
+        Registra todos os frames no cache do carregador de imagens do PgZero ('images'),
+        para que Actor(nome) e actor.image = nome usem o atlas em vez de abrir arquivos.
+        """
+        for name in self.rects:
+            image_loader.cache[image_loader.cache_key(name, (), {})] = self.get(name)
+
+
+def atlas_available(images_dir=IMAGES_DIR):
+    """True se o atlas já foi gerado (existe images/atlas.json)."""
+    return os.path.exists(os.path.join(images_dir, ATLAS_INDEX))
+
+# Explicação da Decisão:
+# - Usar o cache do próprio carregador do PgZero mantém o resto do código intacto: nenhum Actor
+#   precisa saber que a imagem veio de um atlas.
+# - Subsurfaces compartilham os pixels da textura, então o atlas ocupa a memória de uma imagem só
+#   e a abertura do jogo lê um arquivo em vez de cerca de 40.
+
+
+if __name__ == "__main__":
+    count = build_atlas()
+    print(f"Atlas gerado com {count} frames em {os.path.join(IMAGES_DIR, ATLAS_IMAGE)}")
@@ -0,0 +1,156 @@
+# audio.py
+
+# Gerenciador de áudio: um conjunto fixo de canais do pygame.mixer para os efeitos sonoros e a música.
+# Cada efeito tem regras (settings.SOUND_EFFECTS):
+#   - cooldown: disparos repetidos dentro do intervalo são ignorados (sem "metralhadora" de sons);
+#   - max_voices: quantas cópias do mesmo som podem tocar juntas;
+#   - priority: com todos os canais ocupados, um som mais importante "rouba" o canal do menos importante.
+# A música (streaming pelo pygame.mixer.music) também passa por aqui, inclusive o liga/desliga do menu.
+#
+# Uso:
+#     audio.add("door_open", pygame.mixer.Sound("sounds/door-open-close.ogg"))
+#     audio.play("door_open") # Chamado quando o EVENTO acontece, não a cada frame do estado
+import time
+
+import pygame
+
+from settings import AUDIO_CHANNELS, MUSIC_VOLUME, SOUND_EFFECTS
+
+DEFAULT_RULE = {"cooldown": 0.0, "priority": 1, "max_voices": 1} # Efeitos sem entrada em SOUND_EFFECTS
+
+
+class Voice:
+    # O que está tocando em um canal: qual som, com qual prioridade e desde quando.
+    __slots__ = ("name", "priority", "started")
+
+    def __init__(self, name, priority, started):
+        self.name = name
+        self.priority = priority
+        self.started = started
+
+
+class AudioManager:
+    # Dono dos canais de efeitos e da música. Sem mixer (sem placa de som), tudo vira silêncio.
+    def __init__(self, channel_count=AUDIO_CHANNELS, rules=SOUND_EFFECTS, clock=time.perf_counter):
+        self.channel_count = channel_count
+        self.rules = rules
+        self.clock = clock
+        self.enabled = True # Música e sons ligados (botão "Music" do menu)
+        self.sounds = {} # nome -> pygame.mixer.Sound
+        self.channels = [] # pygame.mixer.Channel, criados em init()
+        self.voices = [] # Voice (ou None) de cada canal
+        self.last_played = {} # nome -> instante do último disparo aceito
+        self.music_loaded = False
+        self.stats = {"played": 0, "debounced": 0, "stolen": 0, "dropped": 0}
+
+    def init(self):
+        """Inicializa o mixer e reserva os canais dos efeitos (chamado uma vez, pelo carregamento)."""
+        pygame.mixer.init()
+        pygame.mixer.set_num_channels(self.channel_count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+        self.voices = [None] * self.channel_count
+
+    def add(self, name, sound):
+        """Registra um efeito já carregado."""
+        self.sounds[name] = sound
+
+    def rule(self, name):
+        return self.rules.get(name, DEFAULT_RULE)
+
+    def _free_channel(self, name, priority, max_voices):
+        """
+        Escolhe o canal para um novo som: um canal livre; se o som já atingiu 'max_voices', a cópia
+        mais antiga dele; senão, o canal com a voz de menor prioridade (a mais antiga entre as iguais),
+        desde que ela não seja mais importante que o som novo. Retorna (índice, roubado) ou (None, False).
+        """
+        voices = self.voices
+        copies = []
+        free = None
+        for index, channel in enumerate(self.channels):
+            voice = voices[index]
+            if voice is None or not channel.get_busy():
+                voices[index] = None
+                if free is None:
+                    free = index
+            elif voice.name == name:
+                copies.append(index)
+        if len(copies) >= max_voices:
+            return min(copies, key=lambda index: voices[index].started), True
+        if free is not None:
+            return free, False
+        victim = min(range(len(voices)), key=lambda index: (voices[index].priority, voices[index].started))
+        if voices[victim].priority > priority:
+            return None, False # Só há sons mais importantes tocando: o novo é descartado
+        return victim, True
+
+    def play(self, name):
+        """
+        Dispara um efeito respeitando cooldown, limite de vozes e prioridade.
+        Retorna True se o som começou a tocar.
+        """
+        sound = self.sounds.get(name)
+        if not self.enabled or sound is None or not self.channels:
+            return False
+        rule = self.rule(name)
+        now = self.clock()
+        last = self.last_played.get(name)
+        if last is not None and now - last < rule["cooldown"]:
+            self.stats["debounced"] += 1
+            return False
+
+        index, stolen = self._free_channel(name, rule["priority"], rule["max_voices"])
+        if index is None:
+            self.stats["dropped"] += 1
+            return False
+        if stolen:
+            self.stats["stolen"] += 1
+        self.channels[index].play(sound) # Channel.play() interrompe o que estava tocando no canal
+        self.voices[index] = Voice(name, rule["priority"], now)
+        self.last_played[name] = now
+        self.stats["played"] += 1
+        return True
+
+    def active_voices(self):
+        """Quantos canais de efeitos estão tocando agora."""
+        return sum(1 for channel in self.channels if channel.get_busy())
+
+    def load_music(self, path):
+        """Prepara o streaming da música (pode rodar na thread de carregamento)."""
+        pygame.mixer.music.load(path)
+        self.music_loaded = True
+
+    def play_music(self, volume=MUSIC_VOLUME):
+        """Começa a música em loop; com o som desligado, ela fica carregada e pausada."""
+        if not self.music_loaded:
+            return
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(-1)  # -1 = loop infinito
+        if not self.enabled:
+            pygame.mixer.music.pause()
+
+    def set_enabled(self, enabled, volume=MUSIC_VOLUME):
+        """Liga/desliga música e efeitos: a música é pausada (não reiniciada) e os efeitos param."""
+        self.enabled = enabled
+        if not self.channels:
+            return # Sem mixer não há o que pausar
+        if enabled:
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.unpause()
+        else:
+            pygame.mixer.music.pause()
+            for channel in self.channels:
+                channel.stop()
+            self.voices = [None] * self.channel_count
+
+
+# Gerenciador único do jogo, usado pelo game.py e pelo carregamento de assets.
+audio = AudioManager()
+
+# Explicação da Decisão:
+# - Um número fixo de canais limita o custo do mixer: sem ele, cada Sound.play() pode ocupar um canal
+#   novo, e um som disparado a cada frame enche o mixer de cópias sobrepostas.
+# - O cooldown é a rede de segurança; a correção de verdade é tocar sons em eventos (uma vez ao
+#   encostar na porta), não em estados (a cada frame encostado).
+# - O roubo por prioridade garante que um som importante (a porta abrindo) sempre toque, mesmo com
+#   o mixer cheio de sons menores; sons menos importantes que tudo o que está tocando são descartados.
+# - As estatísticas (tocados, ignorados pelo cooldown, roubos, descartes) mostram se as regras estão boas.
@@ -0,0 +1,268 @@
+# balance.py
+
+# Balanceamento por Monte Carlo: milhares de partidas sem janela, com semente, jogadas por um
+# jogador automático, em todos os núcleos da máquina. Para cada combinação de regras (quantidade
+# e velocidade dos inimigos, velocidade do jogador, distâncias de spawn, comportamento) mede:
+#   - a taxa de vitória;
+#   - o tempo até pegar a chave e até abrir a porta;
+#   - as causas de derrota (pego procurando a chave, pego levando a chave, tempo esgotado).
+# Cada partida vira uma linha de BALANCE_RESULTS_PATH assim que termina: uma varredura longa pode
+# ser interrompida (Ctrl+C) e retomada depois, sem repetir as partidas já jogadas.
+#
+# Uso:
+#     python balance.py --games 2000 --enemies 3 5 8 --enemy-speed 100 130
+#     python balance.py --report   (só agrega o arquivo de resultados)
+import itertools
+import json
+import os
+import random
+import signal
+import statistics
+import time
+from multiprocessing import Pool
+
+from settings import (
+    FIXED_DT, WORLD_WIDTH, WORLD_HEIGHT, ENEMY_COUNT, PLAYER_SPEED, ENEMY_SPEED, ENEMY_MIN_DISTANCE,
+    ITEM_MIN_DISTANCE, ENEMY_BEHAVIOR, BALANCE_MAX_SECONDS, BALANCE_RESULTS_PATH,
+)
+from simulation import World, EVENT_KEY_PICKED, OUTCOME_VICTORY
+from flowfield import FlowFields, NEIGHBOURS
+
+# Causas de fim de partida registradas no relatório.
+RESULT_VICTORY = "victory"
+CAUSE_CAUGHT_SEARCHING = "caught_searching_key" # Pego antes de pegar a chave
+CAUSE_CAUGHT_CARRYING = "caught_carrying_key" # Pego com a chave, a caminho da porta
+CAUSE_TIMEOUT = "timeout" # O jogador automático não terminou em BALANCE_MAX_SECONDS
+CHUNKSIZE = 8 # Partidas enviadas de uma vez para cada processo (menos comunicação entre processos)
+
+
+class ScriptedPlayer:
+    # Jogador automático: desce o campo de distância até a chave e depois até a porta,
+    # sem entrar em tiles a até 'caution' tiles de um inimigo.
+    def __init__(self, world, seed, caution=1):
+        self.world = world
+        # Campos próprios, sem limite de raio: o alvo pode estar em qualquer ponto do mapa.
+        self.fields = FlowFields(world, max_cost=world.grid_width * world.grid_height)
+        # Gerador próprio: a entrada do jogador não pode consumir números de world.rng (ver random_policy).
+        self.rng = random.Random(seed)
+        self.caution = caution
+
+    def danger(self, tile_x, tile_y):
+        """Verifica se há um inimigo a até 'caution' tiles do tile."""
+        radius = self.caution
+        return any(entity.kind == "enemy" for entity in self.world.tile_index.near(tile_x, tile_y, radius, radius))
+
+    def __call__(self, world):
+        """Mesmo contrato das políticas de simulation.run_headless(): policy(world) -> (dx, dy) ou None."""
+        player = world.player
+        if player.moving:
+            return None
+        tile_x, tile_y = player.current_tile_x, player.current_tile_y
+        field = self.fields.goal("door" if world.player_has_key else "key")
+        moves = [move for move in NEIGHBOURS if world.is_walkable(tile_x + move[0], tile_y + move[1])]
+        self.rng.shuffle(moves) # Desempate aleatório entre caminhos igualmente curtos
+        if field is not None:
+            def cost(move):
+                distance = field.get(tile_x + move[0], tile_y + move[1])
+                return float("inf") if distance is None else distance
+            moves.sort(key=cost)
+        for dx, dy in moves:
+            if not self.danger(tile_x + dx, tile_y + dy):
+                return (dx, dy)
+        return None # Cercado: espera os inimigos se afastarem
+
+
+def play_game(config, seed, max_ticks):
+    """Joga uma partida com o jogador automático e retorna o resultado (um dicionário serializável)."""
+    world = World(seed=seed, **config)
+    world.reset(seed)
+    player = ScriptedPlayer(world, seed)
+    time_to_key = None
+    while not world.outcome and world.tick_count < max_ticks:
+        if EVENT_KEY_PICKED in world.step(FIXED_DT, player(world)):
+            time_to_key = world.tick_count * FIXED_DT
+
+    if world.outcome == OUTCOME_VICTORY:
+        result, cause = RESULT_VICTORY, None
+    elif world.outcome:
+        result, cause = "defeat", CAUSE_CAUGHT_CARRYING if world.player_has_key else CAUSE_CAUGHT_SEARCHING
+    else:
+        result, cause = "defeat", CAUSE_TIMEOUT
+    return {
+        "config": config_id(config), "seed": seed, "result": result, "cause": cause,
+        "seconds": world.tick_count * FIXED_DT, "time_to_key": time_to_key,
+        "time_to_door": world.tick_count * FIXED_DT if result == RESULT_VICTORY else None,
+    }
+
+
+def _play_task(task):
+    # Função de nível de módulo: o Pool precisa conseguir enviá-la (pickle) para os processos.
+    return play_game(*task)
+
+
+def _ignore_interrupt():
+    # Nos processos de trabalho, Ctrl+C fica a cargo do processo principal (que encerra o Pool).
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def config_id(config):
+    """Identificador estável de uma combinação de regras (as chaves em ordem alfabética)."""
+    return json.dumps(config, sort_keys=True)
+
+
+def sweep_configs(grid_width=WORLD_WIDTH, grid_height=WORLD_HEIGHT, enemy_counts=(ENEMY_COUNT,),
+                  player_speeds=(PLAYER_SPEED,), enemy_speeds=(ENEMY_SPEED,),
+                  enemy_distances=(ENEMY_MIN_DISTANCE,), item_distances=(ITEM_MIN_DISTANCE,),
+                  behaviors=(ENEMY_BEHAVIOR,), level=None):
+    """
+    Todas as combinações dos valores informados, como argumentos do World.
+    Com uma fase ('level', arquivo .map), ela entra na configuração (e o tamanho passa a ser o dela).
+    """
+    configs = [
+        {"grid_width": grid_width, "grid_height": grid_height, "enemy_count": enemies,
+         "player_speed": player_speed, "enemy_speed": enemy_speed, "enemy_min_distance": enemy_distance,
+         "item_min_distance": item_distance, "enemy_behavior": behavior}
+        for enemies, player_speed, enemy_speed, enemy_distance, item_distance, behavior in itertools.product(
+            enemy_counts, player_speeds, enemy_speeds, enemy_distances, item_distances, behaviors)
+    ]
+    if level:
+        for config in configs:
+            config["level"] = level # Só quando há fase: os resultados já gravados sem ela continuam valendo
+    return configs
+
+
+def load_results(path):
+    """Lê as partidas já gravadas; linhas incompletas (processo interrompido no meio da escrita) são ignoradas."""
+    results = []
+    if not os.path.exists(path):
+        return results
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def run_sweep(configs, games, path=BALANCE_RESULTS_PATH, workers=None, base_seed=0,
+              max_seconds=BALANCE_MAX_SECONDS, progress=None):
+    """
+    Joga 'games' partidas (sementes base_seed, base_seed + 1, ...) de cada combinação, em 'workers'
+    processos, e acrescenta cada resultado ao arquivo JSON Lines 'path' assim que ele chega.
+    Partidas que já estão no arquivo são puladas. Retorna quantas partidas foram jogadas agora.
+    """
+    done = {(result["config"], result["seed"]) for result in load_results(path)}
+    max_ticks = int(max_seconds / FIXED_DT)
+    # As mesmas sementes em todas as combinações: as diferenças medidas vêm das regras, não do sorteio.
+    tasks = [(config, seed, max_ticks) for seed in range(base_seed, base_seed + games) for config in configs
+             if (config_id(config), seed) not in done]
+    played = 0
+    if not tasks:
+        return played
+    with open(path, "a") as out, Pool(workers, initializer=_ignore_interrupt) as pool:
+        if out.tell() and not _ends_with_newline(path):
+            out.write("\n") # Fecha a linha incompleta deixada por uma interrupção
+        for result in pool.imap_unordered(_play_task, tasks, chunksize=CHUNKSIZE):
+            out.write(json.dumps(result) + "\n")
+            out.flush() # Cada partida fica no disco assim que termina
+            played += 1
+            if progress:
+                progress(played, len(tasks))
+    return played
+
+
+def aggregate(results):
+    """Resumo por combinação: taxa de vitória, tempos até a chave e a porta (s) e causas de derrota."""
+    groups = {}
+    for result in results:
+        groups.setdefault(result["config"], []).append(result)
+    report = []
+    for key, group in groups.items():
+        keys = [result["time_to_key"] for result in group if result["time_to_key"] is not None]
+        doors = [result["time_to_door"] for result in group if result["time_to_door"] is not None]
+        causes = {}
+        for result in group:
+            if result["cause"]:
+                causes[result["cause"]] = causes.get(result["cause"], 0) + 1
+        report.append({
+            "config": json.loads(key), "games": len(group),
+            "win_rate": len(doors) / len(group),
+            "key_rate": len(keys) / len(group),
+            "time_to_key": {"mean": statistics.fmean(keys), "median": statistics.median(keys)} if keys else None,
+            "time_to_door": {"mean": statistics.fmean(doors), "median": statistics.median(doors)} if doors else None,
+            "causes": causes,
+        })
+    report.sort(key=lambda entry: entry["win_rate"])
+    return report
+
+
+def print_report(report):
+    print(f"{'inimigos':>8} {'v.jog':>6} {'v.ini':>6} {'d.ini':>5} {'d.item':>6} {'comport.':>8} {'partidas':>8} "
+          f"{'vitória':>8} {'chave (s)':>9} {'porta (s)':>9}  causas")
+    for entry in report:
+        config = entry["config"]
+        key_time = f"{entry['time_to_key']['median']:9.1f}" if entry["time_to_key"] else f"{'-':>9}"
+        door_time = f"{entry['time_to_door']['median']:9.1f}" if entry["time_to_door"] else f"{'-':>9}"
+        causes = ", ".join(f"{cause} {count}" for cause, count in sorted(entry["causes"].items()))
+        print(f"{config['enemy_count']:>8} {config['player_speed']:>6} {config['enemy_speed']:>6} "
+              f"{config['enemy_min_distance']:>5} {config['item_min_distance']:>6} {config['enemy_behavior']:>8} "
+              f"{entry['games']:>8} {entry['win_rate']:>7.1%} {key_time} {door_time}  {causes}")
+
+# Explicação da Decisão:
+# - Cada partida é independente e só depende da sua semente e das regras: processos separados (e não
+#   threads, por causa do GIL) escalam com os núcleos, e o Pool envia as partidas em lotes (CHUNKSIZE)
+#   para que a comunicação entre processos não pese.
+# - Gravar cada resultado assim que chega (JSON Lines) torna a varredura retomável: na próxima
+#   execução, as partidas (combinação, semente) já presentes no arquivo são puladas.
+# - O jogador automático usa os mesmos campos de distância da IA e um gerador próprio, então cada
+#   partida é reproduzível pela semente, como as partidas gravadas pelo replay.py.
+# - Tempos são medidos em tempo de jogo (ticks x FIXED_DT), e não em tempo de relógio.
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Balanceamento por Monte Carlo com um jogador automático.")
+    parser.add_argument("--games", type=int, default=1000, help="Partidas por combinação de regras")
+    parser.add_argument("--enemies", type=int, nargs="+", default=[ENEMY_COUNT], help="Quantidades de inimigos")
+    parser.add_argument("--player-speed", type=float, nargs="+", default=[PLAYER_SPEED], help="px/s do jogador")
+    parser.add_argument("--enemy-speed", type=float, nargs="+", default=[ENEMY_SPEED], help="px/s dos inimigos")
+    parser.add_argument("--enemy-distance", type=int, nargs="+", default=[ENEMY_MIN_DISTANCE],
+                        help="Distância mínima inimigo-jogador no spawn")
+    parser.add_argument("--item-distance", type=int, nargs="+", default=[ITEM_MIN_DISTANCE],
+                        help="Distância mínima da chave e da porta no spawn")
+    parser.add_argument("--behavior", nargs="+", choices=["wander", "chase", "flee"], default=[ENEMY_BEHAVIOR],
+                        help="Comportamento dos inimigos")
+    parser.add_argument("--width", type=int, default=WORLD_WIDTH, help="Largura do mundo em tiles")
+    parser.add_argument("--height", type=int, default=WORLD_HEIGHT, help="Altura do mundo em tiles")
+    parser.add_argument("--level", metavar="MAPA", default=None, help="Fase em tiles (.map, ver tilemap.py, ou dungeon:..., ver dungeon.py)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processos (padrão: todos os núcleos)")
+    parser.add_argument("--seed", type=int, default=0, help="Primeira semente")
+    parser.add_argument("--max-seconds", type=float, default=BALANCE_MAX_SECONDS, help="Tempo de jogo máximo")
+    parser.add_argument("--out", default=BALANCE_RESULTS_PATH, help="Arquivo JSON Lines de resultados")
+    parser.add_argument("--report", action="store_true", help="Não joga: só agrega o arquivo de resultados")
+    args = parser.parse_args()
+
+    if not args.report:
+        configs = sweep_configs(args.width, args.height, args.enemies, args.player_speed, args.enemy_speed,
+                                args.enemy_distance, args.item_distance, args.behavior, args.level)
+        start = time.perf_counter()
+
+        def progress(played, total):
+            if played % 100 == 0 or played == total:
+                elapsed = time.perf_counter() - start
+                print(f"{played}/{total} partidas ({played / elapsed:.0f} partidas/s)", end="\r", flush=True)
+
+        try:
+            played = run_sweep(configs, args.games, args.out, args.workers, args.seed, args.max_seconds, progress)
+            print(f"\n{played} partidas em {time.perf_counter() - start:.1f}s com {args.workers} processos")
+        except KeyboardInterrupt:
+            print(f"\nInterrompido: as partidas já terminadas estão em {args.out}; rode de novo para continuar.")
+    print_report(aggregate(load_results(args.out)))
@@ -0,0 +1,316 @@
+# benchmark.py
+
+# Benchmark do jogo completo (update + draw) sem janela, usando os drivers "dummy" do SDL.
+# Carrega o game.py do mesmo jeito que o 'pgzrun', varre quantidades de inimigos, tamanhos de mapa
+# e cenas (menu, jogando, game over, vitória) e mede, frame a frame:
+#   - o tempo total do frame (p50, p95, p99);
+#   - o tempo de cada fase: atualização do jogador, dos inimigos, colisões/regras, e o desenho de
+#     cada camada (fundo, itens, atores, HUD) e do flip da tela;
+#   - as coletas do coletor de lixo (fase "gc", coletas por geração e a pausa mais longa).
+# Também mede o reinício da partida (cena RESTART: o start_game() da tecla R, repetido várias vezes).
+# O resultado vai para um arquivo JSON, que pode ser comparado com um anterior para achar regressões.
+#
+# Uso:
+#     python benchmark.py --out benchmark.json
+#     python benchmark.py --enemies 5 100 1000 10000 --sizes 12x9 100x100 400x400 --backend numpy
+#     python benchmark.py --compare benchmark.json   (sai com código 1 se algum p95 piorar além da tolerância)
+#     python benchmark.py --restarts 200               (tempo de cada reinício com R)
+import os
+
+# Sem janela nem placa de som: precisa vir antes de qualquer importação do Pygame.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import math
+import platform
+import random
+import sys
+import time
+import types
+
+from profiler import GcMonitor
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game.py")
+BENCHMARK_FORMAT = 2 # Versão do arquivo de resultados
+DEFAULT_ENEMIES = [5, 100, 1000, 10000]
+DEFAULT_SIZES = ["12x9", "100x100", "400x400"]
+DEFAULT_RESTARTS = 50
+MENU_SCENES = ["MENU", "GAME_OVER", "VICTORY_SCREEN"] # Cenas que não dependem do mundo
+MAX_OCCUPANCY = 0.5 # Combinações com mais inimigos que esta fração dos tiles são puladas
+
+
+def percentile(values, p):
+    """Percentil 'p' (0 a 100) por interpolação linear entre os valores ordenados."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * p / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(samples):
+    """Resumo de uma lista de tempos em segundos, convertido para milissegundos."""
+    return {
+        "mean": 1000 * sum(samples) / len(samples) if samples else 0.0,
+        "p50": 1000 * percentile(samples, 50),
+        "p95": 1000 * percentile(samples, 95),
+        "p99": 1000 * percentile(samples, 99),
+        "max": 1000 * max(samples, default=0.0),
+    }
+
+
+def load_game():
+    """Carrega o game.py como o 'pgzrun' faria e cria a tela (no driver dummy)."""
+    from pgzero.runner import prepare_mod
+    from pgzero.game import PGZeroGame
+
+    mod = types.ModuleType("game")
+    mod.__file__ = GAME_PATH
+    sys.modules["game"] = mod
+    prepare_mod(mod)
+    os.chdir(os.path.dirname(GAME_PATH)) # O jogo abre música e sons por caminhos relativos
+    with open(GAME_PATH) as f:
+        exec(compile(f.read(), GAME_PATH, "exec"), mod.__dict__)
+    PGZeroGame(mod).reinit_screen()
+    mod.draw() # Primeiro frame (tela de carregamento), como na janela de verdade
+    mod.assets.wait() # Sem janela, não há por que ir desenhando o progresso
+    mod.update(0) # Sai da tela de carregamento para o menu
+    return mod
+
+
+class PhaseTimer:
+    # Acumula o tempo gasto em cada fase durante o frame atual (as pausas do gc entram como a fase "gc").
+    def __init__(self):
+        self.frame = {}
+        self.gc = GcMonitor(self._gc_pause)
+
+    def _gc_pause(self, generation, start, end):
+        self.frame["gc"] = self.frame.get("gc", 0.0) + end - start
+
+    def wrap(self, name, function):
+        """Retorna uma versão de 'function' que soma seu tempo na fase 'name'."""
+        frame = self.frame
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                frame[name] = frame.get(name, 0.0) + clock() - start
+        return timed
+
+    def wrap_generator(self, name, function):
+        """Como wrap(), para funções geradoras (ex: World.touching): mede a consulta inteira."""
+        timed = self.wrap(name, lambda *args: list(function(*args)))
+        return lambda *args: iter(timed(*args))
+
+    def take(self):
+        """Retorna os tempos do frame que terminou e começa um novo."""
+        phases = dict(self.frame)
+        self.frame.clear()
+        return phases
+
+
+def instrument_world(world, timer):
+    """Mede as fases da simulação no próprio objeto (sem alterar o código do jogo)."""
+    world._update_player = timer.wrap("player_update", world._update_player)
+    world._update_enemies = timer.wrap("enemy_update", world._update_enemies)
+    world.touching = timer.wrap_generator("collision", world.touching)
+
+
+def instrument_layers(game, timer):
+    """Mede cada camada da cena PLAYING (fundo, itens, atores, HUD)."""
+    for layer in game.playing_layers.layers:
+        layer.draw_function = timer.wrap(f"draw_{layer.name}", layer.draw_function)
+
+
+def run_frames(game, frames, warmup, timer, dt):
+    """Roda 'warmup' + 'frames' frames (update, draw e flip) e retorna os tempos medidos."""
+    import pygame
+
+    flip = timer.wrap("flip", pygame.display.flip)
+    frame_times, phase_samples = [], {}
+    for i in range(warmup + frames):
+        start = time.perf_counter()
+        game.update(dt)
+        game.draw()
+        flip()
+        elapsed = time.perf_counter() - start
+        phases = timer.take()
+        if i == warmup - 1:
+            timer.gc.reset() # As coletas contadas são só as dos frames medidos
+        if game.GAME_STATE in ("GAME_OVER", "VICTORY_SCREEN") and game.world:
+            # A partida acabou: o benchmark continua na mesma cena, com o mesmo mundo.
+            game.world.outcome = None
+            game.GAME_STATE = "PLAYING"
+        if i < warmup:
+            continue
+        frame_times.append(elapsed)
+        for name in set(phases) | set(phase_samples):
+            phase_samples.setdefault(name, []).append(phases.get(name, 0.0))
+    return frame_times, phase_samples
+
+
+def bench_playing(game, timer, enemies, width, height, backend, frames, warmup, seed):
+    """Mede a cena PLAYING com um mundo de 'width' x 'height' tiles e 'enemies' inimigos."""
+    from pgzero.builtins import Actor
+    from simulation import World, random_policy
+    from replay import Recorder
+
+    random.seed(seed)
+    world = World(width, height, enemies, actor_factory=Actor, enemy_backend=backend, seed=seed)
+    world.reset()
+    game.world = world
+    game.recorder = Recorder(world)
+    game.GAME_STATE = "PLAYING"
+    game.sim_clock.reset()
+    game.dirty_tracker.invalidate()
+    game.read_move_input = random_policy # Um "jogador" que anda ao acaso
+
+    instrument_world(world, timer)
+    return run_frames(game, frames, warmup, timer, game.sim_clock.step)
+
+
+def bench_restart(game, timer, restarts):
+    """Mede o start_game() de cada reinício (tecla R no game over), com o mundo e as entidades dos pools."""
+    game.settings.PROCEDURAL_LEVEL = False # Mesma fase em todos os reinícios: mede o reinício, não o gerador
+    game.world = None
+    game.start_game() # Primeira partida: enche os pools
+    times = []
+    timer.take()
+    timer.gc.reset()
+    for _ in range(restarts):
+        game.GAME_STATE = "GAME_OVER"
+        start = time.perf_counter()
+        game.start_game()
+        times.append(time.perf_counter() - start)
+    phases = timer.take()
+    return times, {name: [seconds / restarts] * restarts for name, seconds in phases.items()}
+
+
+def bench_scene(game, timer, scene, frames, warmup):
+    """Mede uma cena sem mundo (menu, game over, vitória); nelas o update não faz trabalho de simulação."""
+    game.GAME_STATE = scene
+    game.world = None
+    return run_frames(game, frames, warmup, timer, game.sim_clock.step)
+
+
+def result(scene, frame_times, phase_samples, gc_stats=None, **config):
+    return {
+        "scene": scene, **config, "frames": len(frame_times),
+        "frame_ms": summarize(frame_times),
+        "phases_ms": {name: summarize(samples) for name, samples in sorted(phase_samples.items())},
+        "gc": gc_stats,
+    }
+
+
+def run_suite(enemy_counts, sizes, backend, frames, warmup, seed=1, restarts=DEFAULT_RESTARTS):
+    """Executa todas as combinações e retorna o documento de resultados."""
+    game = load_game()
+    game.settings.RECORD_GAMES = False # Fins de partida no benchmark não devem sobrescrever a última gravação
+    timer = PhaseTimer()
+    instrument_layers(game, timer) # As camadas são as mesmas em todas as combinações
+    timer.gc.start()
+    results = []
+    for width, height in sizes:
+        for enemies in enemy_counts:
+            if enemies > width * height * MAX_OCCUPANCY:
+                continue # Não cabe no mapa (ou viraria um teste de lotação, não de escala)
+            frame_times, phases = bench_playing(game, timer, enemies, width, height, backend, frames, warmup, seed)
+            results.append(result("PLAYING", frame_times, phases, timer.gc.stats(),
+                                  enemies=enemies, map=[width, height], backend=backend))
+            print_row(results[-1])
+
+    for scene in MENU_SCENES:
+        frame_times, phases = bench_scene(game, timer, scene, frames, warmup)
+        results.append(result(scene, frame_times, phases, timer.gc.stats()))
+        print_row(results[-1])
+
+    if restarts:
+        restart_times, phases = bench_restart(game, timer, restarts)
+        results.append(result("RESTART", restart_times, phases, timer.gc.stats(), pool=game.entity_pool.stats()))
+        print_row(results[-1])
+    timer.gc.stop()
+
+    import pygame
+    return {
+        "format": BENCHMARK_FORMAT,
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "pygame": pygame.version.ver, "platform": platform.platform(),
+            "frames": frames, "warmup": warmup, "seed": seed,
+            "startup": game.assets.startup_report(),
+        },
+        "results": results,
+    }
+
+
+def result_key(entry):
+    return (entry["scene"], entry.get("enemies"), tuple(entry.get("map") or ()), entry.get("backend"))
+
+
+def print_row(entry):
+    frame = entry["frame_ms"]
+    label = entry["scene"]
+    if "enemies" in entry:
+        label += f" {entry['enemies']} inimigos {entry['map'][0]}x{entry['map'][1]} ({entry['backend']})"
+    phases = ", ".join(f"{name} {stats['mean']:.2f}" for name, stats in entry["phases_ms"].items())
+    collections = "/".join(str(count) for count in entry["gc"]["collections"]) if entry.get("gc") else "-"
+    print(f"{label:<45} p50 {frame['p50']:7.2f} ms  p95 {frame['p95']:7.2f}  p99 {frame['p99']:7.2f}  "
+          f"gc {collections}  [{phases}]")
+
+
+def compare(current, baseline, tolerance):
+    """Lista as combinações cujo p95 piorou mais que 'tolerance' (ex: 0.2 = 20%) em relação à base."""
+    previous = {result_key(entry): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        old = previous.get(result_key(entry))
+        if old and entry["frame_ms"]["p95"] > old["frame_ms"]["p95"] * (1 + tolerance):
+            regressions.append((result_key(entry), old["frame_ms"]["p95"], entry["frame_ms"]["p95"]))
+    return regressions
+
+# Explicação da Decisão:
+# - O benchmark roda o game.py de verdade (update, draw e flip), e não só a simulação, para que o
+#   custo do desenho entre na conta; os drivers "dummy" permitem rodá-lo em CI, sem tela.
+# - As fases são medidas envolvendo funções do próprio objeto (camadas do compositor, métodos do
+#   mundo), então o código do jogo não carrega nenhuma instrumentação por causa do benchmark.
+# - Percentis (p95, p99) mostram os "engasgos" que a média esconde; o JSON permite comparar versões.
+# - As coletas do gc são contadas por combinação: uma cena que aloca sem parar aparece com muitas
+#   coletas (e uma fase "gc" cara) mesmo quando o tempo médio do frame ainda parece bom.
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark sem janela do jogo completo (update + draw).")
+    parser.add_argument("--enemies", type=int, nargs="+", default=DEFAULT_ENEMIES, help="Quantidades de inimigos")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="Tamanhos de mapa, ex: 12x9 100x100")
+    parser.add_argument("--backend", choices=["python", "numpy"], default="python", help="Backend dos inimigos")
+    parser.add_argument("--frames", type=int, default=300, help="Frames medidos por combinação")
+    parser.add_argument("--warmup", type=int, default=30, help="Frames descartados no início de cada combinação")
+    parser.add_argument("--out", default="benchmark.json", help="Arquivo JSON de saída")
+    parser.add_argument("--compare", metavar="BASE", default=None, help="JSON anterior para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Piora aceitável do p95 (0.2 = 20%%)")
+    parser.add_argument("--restarts", type=int, default=DEFAULT_RESTARTS, help="Reinícios medidos na cena RESTART (0 = não medir)")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(value) for value in size.lower().split("x")) for size in args.sizes]
+    # load_game() muda a pasta atual para a do jogo: os caminhos dos arquivos são resolvidos antes.
+    out = os.path.abspath(args.out)
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+    report = run_suite(args.enemies, sizes, args.backend, args.frames, args.warmup, restarts=args.restarts)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=1)
+    print(f"Resultados gravados em {out}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for key, old, new in regressions:
+            print(f"REGRESSÃO {key}: p95 {old:.2f} ms -> {new:.2f} ms")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,95 @@
+# chunks.py
+
+# Divisão do mundo em "chunks": blocos quadrados de CHUNK_SIZE x CHUNK_SIZE tiles.
+# Os inimigos ficam agrupados pelo chunk em que estão, o que permite:
+#   - desenhar só os inimigos dos chunks que aparecem na tela (culling);
+#   - atualizar a cada tick só os chunks perto do jogador, e os distantes em um ritmo menor
+#     (a cada FAR_CHUNK_INTERVAL ticks no backend "numpy"; no backend "python", os passos distantes
+#     não são avaliados, só terminados) ou nunca (FAR_CHUNK_INTERVAL = 0: chunks "dormindo").
+import math
+
+from settings import CHUNK_SIZE, ACTIVE_CHUNK_RADIUS, FAR_CHUNK_INTERVAL
+from spatial import TileIndex
+
+
+class ChunkGrid:
+    # Índice de entidades por chunk (reaproveita o TileIndex, com coordenadas de chunk em vez de tile).
+    def __init__(self, width, height, chunk_size=CHUNK_SIZE, active_radius=ACTIVE_CHUNK_RADIUS,
+                 far_interval=FAR_CHUNK_INTERVAL):
+        self.chunk_size = chunk_size
+        self.columns = math.ceil(width / chunk_size) # Quantidade de chunks na horizontal
+        self.rows = math.ceil(height / chunk_size) # Quantidade de chunks na vertical
+        self.active_radius = active_radius # Chunks a até esta distância do jogador são atualizados a cada tick
+        self.far_interval = far_interval # Chunks distantes: a cada N ticks (com dt * N); 0 = não atualizam
+        self.index = TileIndex()
+
+    def chunk_of(self, tile_x, tile_y):
+        """Retorna o chunk (coluna, linha) que contém o tile."""
+        return tile_x // self.chunk_size, tile_y // self.chunk_size
+
+    def clear(self):
+        self.index.clear()
+
+    def add(self, entity, tile_x, tile_y):
+        self.index.add(entity, *self.chunk_of(tile_x, tile_y))
+
+    def remove(self, entity, tile_x, tile_y):
+        self.index.remove(entity, *self.chunk_of(tile_x, tile_y))
+
+    def move(self, entity, old_x, old_y, new_x, new_y):
+        """Só mexe no índice quando a entidade cruza a borda de um chunk."""
+        self.index.move(entity, *self.chunk_of(old_x, old_y), *self.chunk_of(new_x, new_y))
+
+    def in_tiles(self, left, top, right, bottom):
+        """Percorre as entidades dos chunks que tocam o retângulo de tiles [left, right) x [top, bottom)."""
+        first_x, first_y = self.chunk_of(left, top)
+        last_x, last_y = self.chunk_of(right - 1, bottom - 1)
+        buckets = self.index.buckets
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                bucket = buckets.get((chunk_x, chunk_y))
+                if bucket:
+                    yield from bucket
+
+    def all_active(self, center_x, center_y):
+        """True se todos os chunks do mundo estão perto do chunk (center_x, center_y)."""
+        radius = self.active_radius
+        return (center_x - radius <= 0 and center_x + radius >= self.columns - 1
+                and center_y - radius <= 0 and center_y + radius >= self.rows - 1)
+
+    def is_near(self, tile_x, tile_y, center_x, center_y):
+        """True se o tile está em um chunk perto do chunk (center_x, center_y) do jogador."""
+        chunk_x, chunk_y = self.chunk_of(tile_x, tile_y)
+        return abs(chunk_x - center_x) <= self.active_radius and abs(chunk_y - center_y) <= self.active_radius
+
+    def sleeping(self, tile_x, tile_y, center_x, center_y):
+        """True se o tile está em um chunk que não é atualizado (distante, com far_interval = 0)."""
+        return not self.far_interval and not self.is_near(tile_x, tile_y, center_x, center_y)
+
+    def near(self, center_x, center_y):
+        """Percorre as entidades dos chunks perto do chunk (center_x, center_y), atualizados a cada tick."""
+        return self.index.near(center_x, center_y, self.active_radius, self.active_radius)
+
+    def due_mask(self, tile_x, tile_y, center_tile_x, center_tile_y, tick):
+        """
+        Rodízio dos chunks distantes para arrays NumPy de tiles (backend "numpy" dos inimigos): um chunk
+        distante é atualizado nos ticks em que tick % far_interval == (coluna + linha * colunas) % far_interval,
+        com dt * far_interval para não perder tempo simulado.
+        Retorna (máscara das linhas a atualizar, multiplicador de dt de cada linha).
+        """
+        chunk_x = tile_x // self.chunk_size
+        chunk_y = tile_y // self.chunk_size
+        center_x, center_y = self.chunk_of(center_tile_x, center_tile_y)
+        near = (abs(chunk_x - center_x) <= self.active_radius) & (abs(chunk_y - center_y) <= self.active_radius)
+        if not self.far_interval:
+            return near, 1
+        due = near | ((chunk_x + chunk_y * self.columns) % self.far_interval == tick % self.far_interval)
+        return due, 1 + ~near * (self.far_interval - 1)
+
+# Explicação da Decisão:
+# - Reaproveitar o TileIndex com coordenadas de chunk evita uma segunda estrutura de dados: o índice
+#   só é tocado quando um inimigo cruza a borda de um chunk, algo raro com chunks de 8x8 tiles.
+# - O rodízio dos chunks distantes espalha o trabalho entre os ticks, em vez de criar um "pico"
+#   a cada N ticks; o dt multiplicado mantém a velocidade média dos inimigos distantes.
+# - Em mundos pequenos (todos os chunks perto do jogador), World.step usa o caminho antigo,
+#   então a partida padrão se comporta exatamente como antes.
@@ -0,0 +1,262 @@
+# dungeon.py
+
+# Gerador procedural de fases: salas e corredores (BSP) e cavernas (autômato celular), montados com
+# operações vetorizadas do NumPy sobre a grade inteira em vez de laços tile a tile.
+#   - "rooms":  o mapa é dividido recursivamente em retângulos (BSP); cada folha recebe uma sala e as
+#               duas metades de cada divisão são ligadas por um corredor em "L";
+#   - "caves":  ruído aleatório suavizado pelo autômato celular (regra 4-5), que forma cavernas orgânicas;
+#   - "mixed":  a divisão BSP, mas parte das folhas recebe um pedaço de caverna em vez de uma sala.
+# Checagem de conectividade: as regiões de piso são rotuladas e só a região do jogador fica de pé
+# (bolsões isolados viram parede). Assim a chave, a porta e os inimigos, que só nascem em piso,
+# sempre podem ser alcançados a partir do spawn do jogador.
+# O resultado é um TileMap (tilemap.py) com os marcadores do jogador, da chave e da porta: o World
+# usa a fase gerada como qualquer fase desenhada à mão.
+#
+# Uma fase gerada é descrita por uma especificação "dungeon:<estilo>:<largura>x<altura>:<semente>",
+# aceita em qualquer lugar que recebe o caminho de uma fase (World, --level, replays e fotografias):
+#     python simulation.py --ticks 6000 --level dungeon:mixed:200x200:7
+#     python dungeon.py 60x30 --style caves --seed 3      (imprime a fase em texto)
+#     python dungeon.py 200x200 --output levels/gerada.map
+#     python dungeon.py --benchmark 500
+import random
+
+try:
+    import numpy as np
+except ImportError: # Sem NumPy o gerador fica indisponível; as fases em arquivo continuam funcionando
+    np = None
+
+from tilemap import TileMap, FLOOR, WALL, PLAYER_SPAWN, KEY_SPAWN, DOOR_SPAWN
+
+STYLES = ("rooms", "caves", "mixed")
+SPEC_PREFIX = "dungeon:"
+MIN_SIDE = 8 # Menor largura/altura aceita (em tiles)
+
+LEAF_MIN = 8 # Menor lado de uma folha da divisão BSP
+LEAF_MAX = 20 # Folhas com um lado maior que isso sempre são divididas
+ROOM_MIN = 4 # Menor lado de uma sala
+CAVE_SHARE = 0.4 # Fração das folhas que viram caverna no estilo "mixed"
+CAVE_FILL = 0.45 # Fração inicial de paredes do ruído das cavernas
+CAVE_STEPS = 5 # Passos do autômato celular
+
+
+def level_spec(style, width, height, seed):
+    """Especificação de uma fase gerada, no formato aceito por World(level=...)."""
+    return f"{SPEC_PREFIX}{style}:{width}x{height}:{seed}"
+
+
+def is_spec(level):
+    return isinstance(level, str) and level.startswith(SPEC_PREFIX)
+
+
+def parse_spec(spec):
+    """Lê uma especificação; retorna (estilo, largura, altura, semente) ou lança ValueError."""
+    try:
+        style, size, seed = spec[len(SPEC_PREFIX):].split(":")
+        width, height = (int(side) for side in size.split("x"))
+        return style, width, height, int(seed)
+    except ValueError:
+        raise ValueError(f"Especificação de fase inválida: {spec!r} "
+                         f"(esperado {level_spec('<estilo>', '<largura>', '<altura>', '<semente>')}).") from None
+
+
+def from_spec(spec):
+    """Gera a fase descrita pela especificação (a mesma especificação sempre gera a mesma fase)."""
+    style, width, height, seed = parse_spec(spec)
+    return generate(width, height, style, seed)
+
+
+def generate(width, height, style="mixed", seed=None):
+    """
+    Gera uma fase width x height no estilo 'style'; a mesma semente gera a mesma fase.
+    Lança ValueError para estilo ou tamanho inválido e RuntimeError sem o NumPy.
+    """
+    if np is None:
+        raise RuntimeError("O gerador de fases precisa do NumPy instalado (pip install numpy).")
+    if style not in STYLES:
+        raise ValueError(f"Estilo de fase desconhecido: {style!r} (use {', '.join(STYLES)}).")
+    if width < MIN_SIDE or height < MIN_SIDE:
+        raise ValueError(f"A fase precisa ter pelo menos {MIN_SIDE}x{MIN_SIDE} tiles.")
+    rng = random.Random(seed) # Decisões escalares (divisões, salas, spawns)
+    noise = np.random.default_rng(rng.getrandbits(64)) # Ruído das cavernas, gerado de uma vez
+
+    floor = np.zeros((height, width), dtype=bool)
+    if style == "caves":
+        floor[1:-1, 1:-1] = _caves(noise, width - 2, height - 2)
+        spots = None
+    else:
+        caves = _caves(noise, width - 2, height - 2) if style == "mixed" else None
+        spots = _carve_rooms(rng, floor, caves)
+
+    # Checagem de conectividade: fica só a região de piso que contém o jogador
+    labels = regions(floor)
+    if spots is None: # Cavernas: o jogador nasce na maior região
+        sizes = np.bincount(labels[labels >= 0])
+        if not sizes.size:
+            raise ValueError(f"A semente {seed} gerou uma fase sem piso.")
+        floor &= labels == sizes.argmax()
+        spots = []
+    else: # Salas: o jogador, a chave e a porta nascem no centro de folhas diferentes
+        rng.shuffle(spots)
+        player_x, player_y = spots[0]
+        floor &= labels == labels[player_y, player_x]
+    if len(spots) < 3: # Cavernas (ou uma fase pequena demais para três folhas): tiles sorteados da região
+        cells = np.flatnonzero(floor.ravel())
+        extra = [divmod(int(cells[i]), width)[::-1] for i in rng.sample(range(len(cells)), min(3, len(cells)))]
+        spots += [spot for spot in extra if spot not in spots][:3 - len(spots)]
+
+    grid = np.where(floor, FLOOR, WALL).astype(np.uint8)
+    for (tile_x, tile_y), code in zip(spots, (PLAYER_SPAWN, KEY_SPAWN, DOOR_SPAWN)):
+        grid[tile_y, tile_x] = code # Sem lugar para a chave ou a porta, o World sorteia um tile livre
+    return TileMap(width, height, grid.tobytes())
+
+
+def _caves(noise, width, height, fill=CAVE_FILL, steps=CAVE_STEPS):
+    """Cavernas por autômato celular: True onde é piso."""
+    wall = noise.random((height, width)) < fill
+    for _ in range(steps):
+        padded = np.pad(wall, 1, constant_values=True).astype(np.uint8) # Fora da grade conta como parede
+        neighbors = (padded[:-2, :-2] + padded[:-2, 1:-1] + padded[:-2, 2:] + padded[1:-1, :-2] +
+                     padded[1:-1, 2:] + padded[2:, :-2] + padded[2:, 1:-1] + padded[2:, 2:])
+        wall = (neighbors >= 5) | (wall & (neighbors >= 4)) # Regra 4-5: a parede cresce onde há parede em volta
+    return ~wall
+
+
+def _carve_rooms(rng, floor, caves):
+    """
+    Divide o interior da grade (BSP), cava uma sala (ou um pedaço de caverna) por folha e liga as
+    metades de cada divisão com um corredor. Retorna um tile de piso de cada folha (centro da sala).
+    """
+    height, width = floor.shape
+    spots = []
+    corridors = []
+
+    def split(x, y, w, h):
+        """Cava a subárvore do retângulo e retorna um tile de piso dela (para os corredores)."""
+        can_split_x, can_split_y = w >= 2 * LEAF_MIN, h >= 2 * LEAF_MIN
+        if (can_split_x or can_split_y) and (max(w, h) > LEAF_MAX or rng.random() < 0.5):
+            vertical = can_split_x and (not can_split_y or w > h or (w == h and rng.random() < 0.5))
+            if vertical:
+                cut = rng.randint(LEAF_MIN, w - LEAF_MIN)
+                first, second = split(x, y, cut, h), split(x + cut, y, w - cut, h)
+            else:
+                cut = rng.randint(LEAF_MIN, h - LEAF_MIN)
+                first, second = split(x, y, w, cut), split(x, y + cut, w, h - cut)
+            corridors.append((first, second))
+            return rng.choice((first, second))
+        center = (x + w // 2, y + h // 2)
+        if caves is not None and rng.random() < CAVE_SHARE:
+            floor[y:y + h, x:x + w] |= caves[y - 1:y - 1 + h, x - 1:x - 1 + w] # 'caves' não inclui a borda
+            floor[center[1] - 1:center[1] + 2, center[0] - 1:center[0] + 2] = True # O corredor sempre chega em piso
+        else:
+            room_w = rng.randint(min(ROOM_MIN, w - 2), w - 2) # Uma parede de folga entre folhas vizinhas
+            room_h = rng.randint(min(ROOM_MIN, h - 2), h - 2)
+            room_x = x + 1 + rng.randint(0, w - 2 - room_w)
+            room_y = y + 1 + rng.randint(0, h - 2 - room_h)
+            floor[room_y:room_y + room_h, room_x:room_x + room_w] = True
+            center = (room_x + room_w // 2, room_y + room_h // 2)
+        spots.append(center)
+        return center
+
+    split(1, 1, width - 2, height - 2) # A borda do mapa fica sendo parede
+    for (x0, y0), (x1, y1) in corridors: # Corredor em "L": horizontal na linha y0, vertical na coluna x1
+        floor[y0, min(x0, x1):max(x0, x1) + 1] = True
+        floor[min(y0, y1):max(y0, y1) + 1, x1] = True
+    return spots
+
+
+def regions(floor):
+    """
+    Rotula as regiões conectadas (vizinhança de 4) de uma grade booleana de piso.
+    Retorna uma grade de rótulos (o mesmo número em toda a região; -1 nas paredes).
+    Trabalha sobre trechos horizontais de piso em vez de tiles: cada trecho é um nó, e dois trechos
+    estão ligados quando se tocam em linhas vizinhas; a cada rodada a raiz maior de cada ligação passa
+    a apontar para a menor, até todas as ligações terem a mesma raiz dos dois lados.
+    """
+    height, width = floor.shape
+    flat = floor.ravel()
+    if not flat.any():
+        return np.full(floor.shape, -1)
+    starts = floor.copy()
+    starts[:, 1:] &= ~floor[:, :-1] # Um trecho começa onde há piso com parede (ou a borda) à esquerda
+    run = np.cumsum(starts.ravel()) - 1 # Trecho de cada tile de piso
+    touching = (floor[:-1] & floor[1:]).ravel() # Piso com piso logo abaixo
+    upper, lower = run[:-width][touching], run[width:][touching]
+    changes = np.ones(len(upper), dtype=bool)
+    changes[1:] = (upper[1:] != upper[:-1]) | (lower[1:] != lower[:-1]) # Um par de trechos aparece uma vez só
+    upper, lower = upper[changes], lower[changes]
+
+    labels = np.arange(int(run[-1]) + 1) # Cada trecho aponta para a raiz da sua região (no começo, ele mesmo)
+    while True:
+        first, second = labels[upper], labels[lower]
+        apart = first != second
+        if not apart.any():
+            break
+        upper, lower = upper[apart], lower[apart] # Ligações já resolvidas não voltam a ser olhadas
+        first, second = first[apart], second[apart]
+        np.minimum.at(labels, np.maximum(first, second), np.minimum(first, second)) # A raiz maior passa a apontar para a menor
+        while True: # Salto de ponteiros até todo trecho apontar direto para a raiz
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    return np.where(flat, labels[run], -1).reshape(floor.shape)
+
+
+def is_connected(tilemap):
+    """Todo o piso da fase forma uma única região (qualquer tile alcança qualquer outro)?"""
+    labels = regions(tilemap.array() != WALL)
+    return int(labels.max()) == int(labels[labels >= 0].min()) if (labels >= 0).any() else True
+
+# Explicação da Decisão:
+# - Cavar e suavizar a grade com fatias e somas de arrays custa algumas passadas em C sobre o mapa
+#   inteiro; o Python só decide a divisão BSP (uma chamada por folha, não por tile).
+# - A conectividade é garantida por construção (corredores ligam as metades de cada divisão) e
+#   conferida pela rotulação de regiões, que também descarta bolsões de caverna isolados. Sem eles,
+#   o sorteio do World (placement.py) nunca coloca a chave ou a porta onde o jogador não chega.
+# - A rotulação trabalha com trechos horizontais de piso, que são muito menos numerosos que os
+#   tiles, e converge em poucas rodadas (uniões de raízes + salto de ponteiros); não depende do SciPy.
+# - A fase é descrita pela especificação (estilo, tamanho e semente), não pelos bytes: replays,
+#   fotografias e o balance.py a regeram de forma idêntica, como fazem com o caminho de um .map.
+
+
+def benchmark(side=500, repeat=5, seed=1):
+    """Tempo médio (ms) para gerar uma fase side x side em cada estilo, e se ela ficou conectada."""
+    import time
+
+    rows = []
+    for style in STYLES:
+        start = time.perf_counter()
+        for index in range(repeat):
+            tilemap = generate(side, side, style, seed + index)
+        elapsed = (time.perf_counter() - start) / repeat
+        floor_share = float((tilemap.array() != WALL).mean())
+        rows.append((style, elapsed * 1000, floor_share, is_connected(tilemap)))
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from tilemap import save
+
+    parser = argparse.ArgumentParser(description="Gera fases procedurais (salas, corredores e cavernas).")
+    parser.add_argument("size", nargs="?", default="60x30", help="Tamanho LARGURAxALTURA em tiles (padrão: 60x30)")
+    parser.add_argument("--style", choices=STYLES, default="mixed", help="Estilo da fase")
+    parser.add_argument("--seed", type=int, default=None, help="Semente (padrão: aleatória)")
+    parser.add_argument("--output", metavar="MAPA", default=None, help="Grava a fase em um arquivo .map")
+    parser.add_argument("--benchmark", metavar="LADO", type=int, help="Mede a geração de uma fase LADO x LADO")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"{'estilo':>7} {'ms':>8} {'piso':>6} {'conectada':>10}")
+        for style, millis, floor_share, connected in benchmark(args.benchmark):
+            print(f"{style:>7} {millis:>8.1f} {floor_share:>6.0%} {'sim' if connected else 'NÃO':>10}")
+    else:
+        width, height = (int(side) for side in args.size.split("x"))
+        seed = random.getrandbits(32) if args.seed is None else args.seed
+        tilemap = generate(width, height, args.style, seed)
+        if args.output:
+            save(tilemap, args.output)
+            print(f"{args.output}: {width}x{height}, {level_spec(args.style, width, height, seed)}")
+        else:
+            print(tilemap.to_text(), end="")
@@ -0,0 +1,224 @@
+# enemy_engine.py
+
+# Backend opcional "struct-of-arrays" para os inimigos, usando NumPy.
+# Em vez de um tween (tween.py) por Enemy avaliado em Python, todas as posições, alvos,
+# timers, tiles e estados de animação ficam em arrays e avançam juntos, em um único passo por tick.
+# Cada inimigo continua acessível como um objeto Enemy (EnemyView), que é só uma "janela" para uma linha.
+#
+# O NumPy é opcional: se não estiver instalado, o backend padrão do World (simulation.DEFAULT_BACKEND)
+# volta para "python", e pedir "numpy" explicitamente falha logo no construtor do World.
+try:
+    import numpy as np
+except ImportError: # NumPy não instalado: o backend vetorizado fica indisponível
+    np = None
+
+from settings import TILE_SIZE, HITBOX_SIZES
+from entities import Enemy
+from animation import FRAME_DURATION
+
+# Movimentos possíveis e a animação correspondente, na mesma ordem de Enemy.choose_random_move().
+MOVES = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+MOVE_ANIMATIONS = ["walk_down", "walk_up", "walk_right", "walk_left"]
+
+
+def numpy_available():
+    """Retorna True se o backend vetorizado puder ser usado."""
+    return np is not None
+
+
+class EnemyEngine:
+    # Guarda o estado de todos os inimigos em arrays NumPy (uma posição de cada array por inimigo).
+    def __init__(self, world, tiles, speed, animations, animation_speed=FRAME_DURATION, seed=None):
+        if np is None:
+            raise RuntimeError("O backend 'numpy' de inimigos precisa do NumPy instalado (pip install numpy).")
+
+        self.world = world
+        self.animations = animations
+        self.animation_speed = animation_speed
+        # Sem semente explícita, a semente vem do gerador do mundo.
+        self.rng = np.random.default_rng(world.rng.getrandbits(32) if seed is None else seed)
+
+        tiles = np.asarray(tiles, dtype=np.int32).reshape(-1, 2)
+        count = len(tiles)
+        self.count = count
+
+        # Tiles e posições em pixels (centro do tile)
+        self.tile_x = tiles[:, 0].copy()
+        self.tile_y = tiles[:, 1].copy()
+        self.x = self.tile_x * TILE_SIZE + TILE_SIZE / 2
+        self.y = self.tile_y * TILE_SIZE + TILE_SIZE / 2
+        self.target_x = self.x.copy()
+        self.target_y = self.y.copy()
+        self.speed = np.full(count, float(speed))
+        self.moving = np.zeros(count, dtype=bool)
+
+        # Timers de decisão (mesmo intervalo de 1 a 3 segundos do Enemy)
+        self.move_interval = self.rng.uniform(1.0, 3.0, count)
+        self.move_timer = np.zeros(count)
+
+        # Animação: cada nome vira um número (o frame desenhado vem da FrameTable, em animation.py).
+        self.animation_names = list(animations)
+        self.animation_ids = {name: i for i, name in enumerate(self.animation_names)}
+        self.idle_id = self.animation_ids["idle"]
+        self.move_dx = np.array([dx for dx, _ in MOVES], dtype=np.int32)
+        self.move_dy = np.array([dy for _, dy in MOVES], dtype=np.int32)
+        self.move_animation_ids = np.array([self.animation_ids[name] for name in MOVE_ANIMATIONS], dtype=np.int32)
+
+        # Só o instante em que a animação de cada inimigo começou; o frame vem do relógio do mundo.
+        self.animation_id = np.full(count, self.idle_id, dtype=np.int32)
+        self.animation_start = np.full(count, world.animation_clock.time)
+
+        self.hitbox = HITBOX_SIZES["enemy"]
+        self.entities = [] # EnemyViews, um por linha (criados em views())
+
+    def set_animation(self, indices, animation_ids):
+        """
+        Versão em lote de Character.set_animation: só reinicia (marca o instante de início)
+        a animação dos inimigos cuja animação realmente mudou.
+        """
+        changed = self.animation_id[indices] != animation_ids
+        if np.ndim(animation_ids):
+            animation_ids = animation_ids[changed]
+        indices = indices[changed]
+        self.animation_id[indices] = animation_ids
+        self.animation_start[indices] = self.world.animation_clock.time
+
+    def step(self, dt, active=None):
+        """
+        Avança os inimigos em um tick: movimento suave e decisões.
+        'active' (opcional) é uma máscara das linhas a avançar; nesse caso 'dt' pode ser um array
+        com o passo de cada linha (chunks distantes andam menos vezes, com um dt maior).
+        """
+        was_moving = self.moving.copy()
+        per_row = np.ndim(dt) > 0
+
+        # 1. Movimento suave em direção ao alvo (o passo vetorizado já é um lote: não usa o tween.py)
+        walking = np.flatnonzero(was_moving if active is None else was_moving & active)
+        if walking.size:
+            dx = self.target_x[walking] - self.x[walking]
+            dy = self.target_y[walking] - self.y[walking]
+            distance = np.hypot(dx, dy)
+            move_amount = self.speed[walking] * (dt[walking] if per_row else dt)
+
+            arrived = distance <= move_amount
+            done = walking[arrived]
+            self.x[done] = self.target_x[done] # Pula direto para o alvo para evitar overshoot
+            self.y[done] = self.target_y[done]
+            self.moving[done] = False
+            self.set_animation(done, self.idle_id)
+
+            going = ~arrived
+            scale = move_amount[going] / distance[going]
+            self.x[walking[going]] += dx[going] * scale
+            self.y[walking[going]] += dy[going] * scale
+
+        # 2. Timers de quem estava parado; quem "vence" o intervalo escolhe um tile vizinho
+        idle = np.flatnonzero(~was_moving if active is None else ~was_moving & active)
+        if idle.size:
+            self.move_timer[idle] += dt[idle] if per_row else dt
+            due = idle[self.move_timer[idle] >= self.move_interval[idle]]
+            if due.size:
+                self.move_timer[due] = 0.0
+                choice = self.rng.integers(0, len(MOVES), due.size)
+                if self.world.enemy_behavior != "wander":
+                    # A IA (campo de distância compartilhado) substitui o sorteio de quem tem uma indicação.
+                    for k, (tile_x, tile_y) in enumerate(zip(self.tile_x[due].tolist(), self.tile_y[due].tolist())):
+                        direction = self.world.enemy_step(tile_x, tile_y)
+                        if direction:
+                            choice[k] = MOVES.index(direction)
+                new_tile_x = self.tile_x[due] + self.move_dx[choice]
+                new_tile_y = self.tile_y[due] + self.move_dy[choice]
+                valid = self.world.are_walkable(new_tile_x, new_tile_y)
+                self.set_animation(due[~valid], self.idle_id) # Fora do mundo: volta a ficar parado
+
+                # Quem tem um tile válido ainda passa pelo mundo (bloqueio entre inimigos e índice
+                # espacial). Só os inimigos que decidiram agir neste tick entram neste loop.
+                go = []
+                for i, tile_x, tile_y in zip(due[valid].tolist(), new_tile_x[valid].tolist(), new_tile_y[valid].tolist()):
+                    view = self.entities[i]
+                    if not self.world.can_enter(view, tile_x, tile_y):
+                        continue
+                    self.world.on_tile_changed(view, int(self.tile_x[i]), int(self.tile_y[i]), tile_x, tile_y)
+                    self.tile_x[i] = tile_x
+                    self.tile_y[i] = tile_y
+                    go.append(i)
+                blocked = np.setdiff1d(due[valid], go, assume_unique=True)
+                self.set_animation(blocked, self.idle_id)
+
+                go = np.array(go, dtype=np.intp)
+                self.target_x[go] = self.tile_x[go] * TILE_SIZE + TILE_SIZE / 2
+                self.target_y[go] = self.tile_y[go] * TILE_SIZE + TILE_SIZE / 2
+                self.moving[go] = True
+                # A direção sorteada de cada inimigo que andou define sua animação de caminhada
+                directions = choice[np.searchsorted(due, go)]
+                self.set_animation(go, self.move_animation_ids[directions])
+        # A animação não precisa de passo: ela é derivada do relógio compartilhado do mundo.
+
+    def views(self, actor_factory=None):
+        """Cria um EnemyView para cada linha dos arrays (o mundo os coloca no índice espacial)."""
+        self.entities = [EnemyView(self, i, actor_factory) for i in range(self.count)]
+        return self.entities
+
+# Explicação da Decisão:
+# - O custo por tick vira algumas operações de array, independentemente de haver 5 ou 10.000 inimigos;
+#   o interpretador Python não executa mais um método por inimigo.
+# - As regras são as mesmas do Enemy (intervalo de 1 a 3 s, quatro direções, animação idle ao chegar),
+#   para que trocar de backend não mude a jogabilidade.
+# - O gerador do NumPy é semeado pelo gerador do mundo, então a semente da partida também o reproduz.
+
+
+def _column(array_name, cast):
+    """Cria uma property que lê/escreve a linha deste inimigo em um dos arrays do engine."""
+    def fget(self):
+        return cast(getattr(self.engine, array_name)[self.index])
+
+    def fset(self, value):
+        getattr(self.engine, array_name)[self.index] = value
+
+    return property(fget, fset)
+
+
+class EnemyView(Enemy):
+    # Um Enemy cujos atributos moram em uma linha do EnemyEngine, em vez de no próprio objeto.
+    __slots__ = ("engine", "index") # O resto vem dos slots de Character/Enemy ou das colunas abaixo
+    x = _column("x", float)
+    y = _column("y", float)
+    target_x = _column("target_x", float)
+    target_y = _column("target_y", float)
+    speed = _column("speed", float)
+    moving = _column("moving", bool)
+    current_tile_x = _column("tile_x", int)
+    current_tile_y = _column("tile_y", int)
+    move_interval = _column("move_interval", float)
+    move_timer = _column("move_timer", float)
+    animation_start = _column("animation_start", float)
+
+    def __init__(self, engine, index, actor_factory=None):
+        # Não chama Enemy.__init__: o estado já foi criado pelo engine.
+        self.engine = engine
+        self.index = index
+        self.animations = engine.animations
+        self.animation_speed = engine.animation_speed
+        self.hitbox = engine.hitbox
+        self.world = engine.world
+        self.clock = engine.world.animation_clock
+        self.actor = None
+        self.shown_frame = None
+        if actor_factory:
+            self.actor = actor_factory(self.current_image())
+            self.actor.pos = (self.x, self.y)
+            self.shown_frame = (self.current_animation_name, self.current_frame_index)
+
+    @property
+    def current_animation_name(self):
+        return self.engine.animation_names[self.engine.animation_id[self.index]]
+
+    @current_animation_name.setter
+    def current_animation_name(self, name):
+        self.engine.animation_id[self.index] = self.engine.animation_ids[name]
+
+# Explicação da Decisão:
+# - 'EnemyView' herda de 'Enemy', então qualquer código que use 'enemy.x', 'enemy.current_tile_x'
+#   ou 'enemy.draw()' continua funcionando sem saber qual backend está ativo.
+# - A sincronização com o Actor (Character.sync_actor) acontece apenas no desenho,
+#   então a simulação headless não paga nada por ela.
@@ -0,0 +1,360 @@
+# entities.py
+
+# Classes das entidades do jogo (jogador, inimigos, chave e porta).
+# Nenhuma delas depende do PgZero: o Actor (a parte visual) é opcional e só é criado quando
+# uma "fábrica" de Actors é passada no construtor. Assim a mesma lógica roda com ou sem janela.
+# As entidades são registros compactos (__slots__) que podem ser reiniciados no lugar com reset():
+# o World reaproveita as da partida anterior em vez de criar outras (ver pool.py).
+import math
+import random
+
+from settings import TILE_SIZE, GRID_WIDTH, GRID_HEIGHT, HITBOX_SIZES, FIXED_DT, MOVE_EASING
+from animation import FRAME_DURATION, default_clock, frame_table, show_frame
+from scheduler import delay_for, energy_rate_for
+from tween import TweenManager
+
+
+# Dicionários que mapeiam nomes de animações (strings) para listas de nomes de arquivos de imagem.
+# PgZero carrega imagens automaticamente da pasta 'images/' usando seus nomes (sem extensão).
+
+player_animations = {
+    # Animação "parado" (idle)
+    "idle": ["persona_frente_0", "persona_walk_front_0_trans"], # Exemplo: 2 frames para idle (se for respirar/movimento sutil) ainda será implementada
+
+    # Animação de caminhada para CIMA
+    "walk_up": ["persona_walk_up_0","persona_walk_up_1","persona_walk_up_2"],
+
+    # Animação de caminhada para BAIXO (frente)
+    "walk_down": ["persona_walk_front_0_trans", "persona_walk_front_1", "persona_walk_front_3", "persona_frente_0"],
+
+    # Animação de caminhada para ESQUERDA
+    "walk_left": ["persona_walk_left_0", "persona_walk_left_1","persona_walk_left_2"],
+
+    # Animação de caminhada para DIREITA
+    "walk_right": ["persona_walk_rigth_0", "persona_walk_rigth_1", "persona_walk_rigth_2"],
+}
+
+# Animações dos inimigos
+enemy_animations = {
+    "idle": ["enemy_front0", "enemy_front0_trans"],
+    "walk_up": ["enemy_walk_up_0", "enemy_walk_up_0_trans", "enemy_walk_up_1", "enemy_walk_up_2"],
+    "walk_down": ["enemy_front0", "enemy_front0_trans", "enemy_walk_front1", "enemy_walk_front2"],
+    "walk_left": ["enemy_left0", "enemy_left0_trans", "enemy_walk_left_1", "enemy_walk_left2"],
+    "walk_right": ["enemy_right", "enemy_right_0_trans", "enemy_walk_right1", "enemy_walk_right2"],
+}
+
+# Explicação da Decisão:
+# - Ter múltiplos frames para cada direção de movimento ('walk_up', 'walk_down', etc.) e para o estado 'idle'
+#   cumpre diretamente o requisito de "animação de sprite tanto ao se mover quanto ao ficar parado".
+# - O uso de frames de transição (`_trans.png`) deixa as animações mais fluidas.
+# - As animações são apenas nomes de imagens: a simulação headless avança os frames sem carregar nenhuma delas.
+
+
+def tile_center(tile_x, tile_y):
+    """Retorna a posição em pixels (x, y) do centro de um tile da grade."""
+    return tile_x * TILE_SIZE + TILE_SIZE / 2, tile_y * TILE_SIZE + TILE_SIZE / 2
+
+
+# Movimentos de personagens criados sem mundo (ex: em testes rápidos), no relógio padrão.
+default_tweens = TweenManager(default_clock)
+
+
+def overlaps(a, b):
+    """
+    Verifica se as caixas de colisão de duas entidades se sobrepõem.
+    Cada entidade precisa ter 'x', 'y' (centro) e 'hitbox' (largura, altura).
+    Equivale ao 'colliderect' de dois Actors ancorados no centro.
+    """
+    aw, ah = a.hitbox
+    bw, bh = b.hitbox
+    return abs(a.x - b.x) * 2 < aw + bw and abs(a.y - b.y) * 2 < ah + bh
+
+# Explicação da Decisão:
+# - 'overlaps' reproduz a regra do 'colliderect' sem precisar de imagens carregadas,
+#   o que permite checar colisões na simulação headless.
+
+
+class Character:
+    # Classe base para o jogador e inimigos, lidando com movimento e animação de sprite.
+    kind = "character" # Tipo da entidade, usado pelo índice espacial do mundo (ex: "player", "enemy")
+    __slots__ = ("x", "y", "speed", "animations", "current_animation_name", "animation_speed", "hitbox", "world",
+                 "clock", "animation_start", "tweens", "target_x", "target_y", "moving", "actor", "shown_frame",
+                 "current_tile_x", "current_tile_y")
+
+    def __init__(self, *args, **kwargs):
+        self.actor = None
+        self.reset(*args, **kwargs) # Os argumentos são os do reset() de cada classe
+
+    def reset(self, x, y, speed, animations, hitbox, world=None, actor_factory=None):
+        """
+        (Re)inicia o personagem em (x, y). Chamado pelo construtor e pelo World ao reaproveitar uma
+        entidade da partida anterior: o Actor que ela ainda tiver é reaproveitado também.
+        """
+        self.x = float(x) # Posição X, float para movimento suave entre pixels
+        self.y = float(y) # Posição Y, float
+        self.speed = speed # Velocidade de movimento em pixels por segundo
+        self.animations = animations # Dicionário de animações (ex: {"idle": ["img1", "img2"]})
+        self.current_animation_name = "idle" # Nome da animação atual (string, ex: "idle", "walk_right")
+        self.animation_speed = FRAME_DURATION # Tempo em segundos que cada frame fica na tela (ajuste para mais rápido/lento)
+        self.hitbox = hitbox # Tamanho (largura, altura) da caixa de colisão
+        self.world = world # Mundo ao qual o personagem pertence (define quais tiles são válidos)
+        # Relógio de animação compartilhado; o personagem só guarda quando sua animação começou.
+        self.clock = world.animation_clock if world else default_clock
+        self.animation_start = self.clock.time
+        # Movimento suave entre tiles: um tween por passo no gerenciador do mundo (tween.py).
+        self.tweens = world.tweens if world else default_tweens
+        self.target_x = self.x # Centro do tile para onde o personagem está andando
+        self.target_y = self.y
+        self.moving = False # True do começo ao fim de um passo
+
+        # O Actor é o objeto que o PgZero desenha. Só existe quando o jogo roda com janela.
+        self.shown_frame = None # (animação, índice) exibido no Actor, para só trocar a imagem quando mudar
+        if not actor_factory:
+            self.actor = None
+        else:
+            if self.actor is None:
+                self.actor = actor_factory(self.current_image())
+            else: # Reiniciado com o Actor da partida anterior
+                self.actor.image = self.current_image()
+            self.actor.pos = (self.x, self.y) # Define a posição inicial do Actor
+            self.shown_frame = (self.current_animation_name, 0)
+
+    @property
+    def current_frame_index(self):
+        """Índice do frame atual, calculado a partir do relógio compartilhado."""
+        length = frame_table(self.animations).lengths[self.current_animation_name]
+        return self.clock.frame_index(self.animation_start, length, self.animation_speed)
+
+    def current_image(self):
+        """Retorna o nome da imagem do frame atual da animação."""
+        return self.animations[self.current_animation_name][self.current_frame_index]
+
+    def can_enter(self, tile_x, tile_y):
+        """Verifica se o personagem pode entrar no tile (limites do mundo, ou da grade padrão sem mundo)."""
+        if self.world:
+            return self.world.can_enter(self, tile_x, tile_y)
+        return 0 <= tile_x < GRID_WIDTH and 0 <= tile_y < GRID_HEIGHT
+
+    def commit_tile(self, tile_x, tile_y):
+        """Confirma o novo tile do personagem e avisa o mundo (que atualiza o índice espacial)."""
+        old_x, old_y = self.current_tile_x, self.current_tile_y
+        self.current_tile_x = tile_x
+        self.current_tile_y = tile_y
+        if self.world:
+            self.world.on_tile_changed(self, old_x, old_y, tile_x, tile_y)
+
+    def start_step(self, tile_x, tile_y):
+        """
+        Começa um passo até o centro do tile (já validado com can_enter): o tile passa a ser o atual
+        e o deslocamento vira um tween, que chama finish_step() ao chegar.
+        """
+        self.target_x, self.target_y = tile_center(tile_x, tile_y)
+        self.moving = True
+        duration = math.hypot(self.target_x - self.x, self.target_y - self.y) / self.speed
+        self.tweens.move(self, self.target_x, self.target_y, duration, MOVE_EASING, self.finish_step)
+        self.commit_tile(tile_x, tile_y)
+
+    def finish_step(self):
+        """Fim do passo (evento do gerenciador de tweens): o personagem para e volta para a animação "idle"."""
+        self.moving = False
+        self.set_animation("idle")
+        if self.world:
+            self.world.on_step_finished(self)
+
+    def set_animation(self, animation_name):
+        """
+        Muda a animação atual do personagem.
+        Se a animação já for a mesma, não faz nada.
+        Reinicia a animação (primeiro frame) ao mudar, marcando o instante de início no relógio.
+        """
+        if self.current_animation_name != animation_name:
+            self.current_animation_name = animation_name
+            self.animation_start = self.clock.time # Frame 0 a partir de agora
+
+    def sync_actor(self, offset=(0, 0)):
+        """
+        Copia a posição e o frame atual do personagem para o Actor (a imagem só quando o frame muda).
+        'offset' é a posição da câmera: o Actor fica em coordenadas de tela.
+        """
+        if self.actor:
+            frame = (self.current_animation_name, self.current_frame_index)
+            if frame != self.shown_frame:
+                self.shown_frame = frame
+                show_frame(self.actor, *frame_table(self.animations).frame(*frame))
+            self.actor.pos = (self.x - offset[0], self.y - offset[1])
+
+    def draw(self, offset=(0, 0)):
+        """
+        Desenha o Actor do personagem na tela, sincronizando-o antes.
+        """
+        if self.actor:
+            self.sync_actor(offset)
+            self.actor.draw()
+
+# Explicação da Decisão:
+# - A classe 'Character' segue o princípio DRY (Don't Repeat Yourself - Não se Repita).
+#   Lógicas comuns a jogador e inimigos (como animação e posicionamento básico) são centralizadas aqui.
+# - O passo suave é o mesmo para jogador e inimigos (start_step/finish_step): as subclasses só decidem
+#   para onde ir; quem move e avisa a chegada é o gerenciador de tweens do mundo, em lote.
+# - O 'actor' opcional separa "o que o personagem é" (posição, animação) de "como ele é desenhado",
+#   permitindo rodar milhares de ticks por segundo sem janela.
+# - O Actor só é sincronizado na hora de desenhar: a simulação headless não paga nada pela parte visual.
+# - Com __slots__, cada personagem é um registro de tamanho fixo (sem dicionário por instância), e
+#   reset() refaz o estado inicial no mesmo objeto: reiniciar a partida não gera lixo para o coletor.
+
+
+class Player(Character):
+    # Estende Character para o personagem controlável pelo jogador.
+    kind = "player"
+    __slots__ = ()
+
+    def reset(self, start_tile_x, start_tile_y, speed, animations, world=None, actor_factory=None):
+        # Calcula a posição inicial em pixels a partir da célula da grade (centro da célula)
+        x, y = tile_center(start_tile_x, start_tile_y)
+        super().reset(x, y, speed, animations, HITBOX_SIZES["player"], world, actor_factory)
+
+        self.current_tile_x = start_tile_x # Posição X do tile atual do jogador na grade
+        self.current_tile_y = start_tile_y # Posição Y do tile atual do jogador na grade
+
+    def move_to_tile(self, new_tile_x, new_tile_y):
+        """
+        Define um novo tile alvo para o jogador se mover.
+        Verifica os limites do mundo e inicia o movimento suave.
+        """
+        # Verifica se o novo tile está dentro dos limites do mundo
+        if self.can_enter(new_tile_x, new_tile_y):
+            self.start_step(new_tile_x, new_tile_y) # Inicia o movimento suave e atualiza o tile atual do jogador
+
+            # Determina a animação apropriada com base na direção do movimento
+            dx = self.target_x - self.x
+            dy = self.target_y - self.y
+            if dx > 0:
+                self.set_animation("walk_right")
+            elif dx < 0:
+                self.set_animation("walk_left")
+            elif dy > 0:
+                self.set_animation("walk_down")
+            elif dy < 0:
+                self.set_animation("walk_up")
+        else:
+            self.set_animation("idle") # Volta para a animação parada se não puder mover
+
+# Explicação da Decisão:
+# - 'Player' herda de 'Character' para aproveitar a lógica de animação e desenho.
+# - A função 'move_to_tile' é específica do jogador para lidar com o movimento baseado em input.
+# - O movimento suave, requisito do Roguelike, é o tween de start_step(), avaliado pelo mundo a cada tick.
+# - A checagem 'can_enter' impede que o jogador saia do mundo,
+#   garantindo que ele "se move em seu território".
+
+
+class Enemy(Character):
+    # Estende Character para os personagens inimigos.
+    kind = "enemy"
+    __slots__ = ("rng", "move_interval", "energy_rate", "next_tick", "order")
+
+    def reset(self, start_tile_x, start_tile_y, speed, animations, world=None, actor_factory=None):
+        x, y = tile_center(start_tile_x, start_tile_y)
+        super().reset(x, y, speed, animations, HITBOX_SIZES["enemy"], world, actor_factory)
+
+        self.current_tile_x = start_tile_x
+        self.current_tile_y = start_tile_y
+
+        # Gerador do mundo (partidas reproduzíveis pela semente); sem mundo, o 'random' global.
+        self.rng = world.rng if world else random
+        self.move_interval = self.rng.uniform(1.0, 3.0) # Intervalo aleatório para o inimigo escolher um novo movimento (1 a 3 segundos)
+        # Turnos por energia (scheduler.py): parado, o inimigo ganha energia a cada tick e age ao
+        # completar ACTION_COST, ou seja, uma vez a cada 'move_interval' segundos.
+        self.energy_rate = energy_rate_for(self.move_interval, FIXED_DT)
+        self.next_tick = None # Tick da próxima ação, preenchido pelo escalonador do mundo
+        self.order = 0 # Posição na lista de inimigos do mundo: desempata ações no mesmo tick
+
+    def action_delay(self):
+        """Ticks parado até o próximo movimento (a energia recomeça do zero depois de cada passo)."""
+        return delay_for(self.energy_rate)
+
+    def choose_random_move(self):
+        """
+        Seleciona um tile adjacente para o inimigo se mover: o indicado pela IA do mundo
+        (perseguir ou fugir do jogador), ou um aleatório quando não há indicação.
+        """
+        if self.moving: # Se o inimigo já estiver em movimento, não escolha um novo alvo
+            return
+
+        # Possíveis movimentos (para cima, baixo, esquerda, direita)
+        possible_moves = [(0, 1), (0, -1), (1, 0), (-1, 0)] # dy, dx (convenção PgZero)
+        direction = self.world.enemy_step(self.current_tile_x, self.current_tile_y) if self.world else None
+        dx, dy = direction or self.rng.choice(possible_moves) # Sem indicação da IA, escolhe uma direção aleatória
+
+        new_tile_x = self.current_tile_x + dx
+        new_tile_y = self.current_tile_y + dy
+
+        # Verifica se o novo tile está dentro dos limites do mundo
+        if self.can_enter(new_tile_x, new_tile_y):
+            self.start_step(new_tile_x, new_tile_y)
+
+            # Define a animação de caminhada baseada na direção do movimento do inimigo
+            if dx > 0:
+                self.set_animation("walk_right")
+            elif dx < 0:
+                self.set_animation("walk_left")
+            elif dy > 0:
+                self.set_animation("walk_down")
+            elif dy < 0:
+                self.set_animation("walk_up")
+        else:
+            self.set_animation("idle") # Volta para a animação parada se não puder mover para o tile escolhido
+
+# Explicação da Decisão:
+# - 'Enemy' também herda de 'Character' para reuso de código de animação e movimento suave.
+# - O método 'choose_random_move' implementa o requisito de "inimigos se movem em seu território"
+#   de uma forma simples e eficaz para um Roguelike básico, usando aleatoriedade.
+# - O intervalo aleatório garante que os inimigos não se movam a cada tick, mas em intervalos mais naturais,
+#   tornando o comportamento menos previsível; ele vira uma taxa de energia, e o escalonador do mundo
+#   (scheduler.py) acorda só os inimigos cuja vez chegou, em vez de somar um timer por inimigo a cada tick.
+
+
+class Item:
+    # Objeto estático da grade (chave ou porta): posição, imagem atual e caixa de colisão.
+    __slots__ = ("kind", "image", "tile_x", "tile_y", "x", "y", "hitbox", "actor")
+
+    def __init__(self, *args, **kwargs):
+        self.actor = None
+        self.reset(*args, **kwargs)
+
+    def reset(self, kind, image, tile_x, tile_y, hitbox, actor_factory=None):
+        """(Re)inicia o item no tile; como em Character.reset(), um Actor que ele ainda tiver é reaproveitado."""
+        self.kind = kind # "key" ou "door"
+        self.image = image # Nome da imagem atual (ex: "door-closed")
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.x, self.y = tile_center(tile_x, tile_y)
+        self.hitbox = hitbox
+
+        if not actor_factory:
+            self.actor = None
+        elif self.actor is None:
+            self.actor = actor_factory(image, (self.x, self.y))
+        else:
+            self.actor.image = image
+            self.actor.pos = (self.x, self.y)
+
+    def sync_actor(self, offset=(0, 0)):
+        """Itens não se movem: só a câmera muda a posição do Actor na tela."""
+        if self.actor:
+            self.actor.pos = (self.x - offset[0], self.y - offset[1])
+
+    def set_image(self, image):
+        """Troca a imagem do item (ex: porta fechada -> aberta)."""
+        self.image = image
+        if self.actor:
+            self.actor.image = image
+
+    def draw(self, offset=(0, 0)):
+        """Desenha o Actor do item, se houver um."""
+        if self.actor:
+            self.sync_actor(offset)
+            self.actor.draw()
+
+# Explicação da Decisão:
+# - Antes a chave e a porta eram Actors diretamente, o que exigia o PgZero para existir.
+#   'Item' guarda apenas o estado lógico e delega o desenho ao Actor quando ele existe.
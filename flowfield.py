@@ -0,0 +1,211 @@
+# flowfield.py
+
+# Campos de distância ("mapas de Dijkstra") compartilhados pela IA.
+# Em vez de cada inimigo calcular um caminho até o jogador, o mundo calcula UMA vez o custo de
+# cada tile até o alvo; um inimigo decide para onde andar olhando só os 4 vizinhos do seu tile (O(1)).
+#   - "chase": distância até o tile do jogador (refeito só quando o jogador muda de tile);
+#   - "flee": derivado do chase, leva para longe do jogador sem ficar preso em cantos;
+#   - "key" / "door": distância até a chave ou a porta (útil para jogadores automáticos).
+#
+# Benchmark (custo por tick em função da quantidade de inimigos):
+#     python flowfield.py
+import heapq
+from collections import deque
+
+from settings import FLOW_FIELD_RADIUS
+
+# Vizinhos na mesma ordem de Enemy.choose_random_move(), para desempates estáveis.
+NEIGHBOURS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+FLEE_COEFFICIENT = -1.2 # Multiplica o campo de perseguição; abaixo de -1 prefere rotas de fuga longas a cantos próximos
+
+
+class DistanceField:
+    # Custo de cada tile alcançado até o alvo mais próximo; tiles fora do alcance não aparecem.
+    def __init__(self, sources, is_walkable, max_cost=FLOW_FIELD_RADIUS, domain=None):
+        """
+        'sources' é uma lista de ((x, y), custo inicial): o alvo tem custo 0 no caso comum.
+        Cada passo entre tiles vizinhos custa 1; a busca para em 'max_cost' (ou nos tiles de 'domain').
+        """
+        self.distance = {} # (x, y) -> custo até o alvo
+        if len({cost for _, cost in sources}) == 1:
+            self._breadth_first(sources, is_walkable, max_cost, domain)
+        else:
+            self._dijkstra(sources, is_walkable, max_cost, domain)
+
+    def _breadth_first(self, sources, is_walkable, max_cost, domain):
+        """Todas as fontes com o mesmo custo (ex: um único alvo): uma busca em largura basta."""
+        distance = self.distance
+        queue = deque()
+        for tile, cost in sources:
+            distance[tile] = cost
+            queue.append(tile)
+        while queue:
+            x, y = queue.popleft()
+            next_cost = distance[(x, y)] + 1
+            if next_cost > max_cost:
+                continue
+            for dx, dy in NEIGHBOURS:
+                tile = (x + dx, y + dy)
+                if tile in distance or (domain is not None and tile not in domain) or not is_walkable(*tile):
+                    continue
+                distance[tile] = next_cost
+                queue.append(tile)
+
+    def _dijkstra(self, sources, is_walkable, max_cost, domain):
+        """Fontes com custos diferentes (ex: o campo de fuga): Dijkstra com fila de prioridade."""
+        distance = self.distance
+        heap = []
+        for tile, cost in sources:
+            if cost < distance.get(tile, float("inf")):
+                distance[tile] = cost
+                heapq.heappush(heap, (cost, tile))
+
+        while heap:
+            cost, (x, y) = heapq.heappop(heap)
+            if cost > distance[(x, y)]:
+                continue # Entrada antiga: o tile já foi alcançado por um caminho mais barato
+            next_cost = cost + 1
+            if next_cost > max_cost:
+                continue
+            for dx, dy in NEIGHBOURS:
+                tile = (x + dx, y + dy)
+                if next_cost < distance.get(tile, float("inf")):
+                    if domain is not None and tile not in domain:
+                        continue
+                    if not is_walkable(*tile):
+                        continue
+                    distance[tile] = next_cost
+                    heapq.heappush(heap, (next_cost, tile))
+
+    def __len__(self):
+        return len(self.distance)
+
+    def get(self, tile_x, tile_y):
+        """Custo do tile até o alvo, ou None se ele estiver fora do alcance do campo."""
+        return self.distance.get((tile_x, tile_y))
+
+    def step(self, tile_x, tile_y):
+        """
+        Direção (dx, dy) para o vizinho mais barato, ou None se o tile está fora do campo
+        ou se nenhum vizinho é melhor (o alvo já foi alcançado). Só lê 5 valores: O(1).
+        """
+        distance = self.distance
+        best = distance.get((tile_x, tile_y))
+        if best is None:
+            return None
+        best_move = None
+        for dx, dy in NEIGHBOURS:
+            cost = distance.get((tile_x + dx, tile_y + dy))
+            if cost is not None and cost < best:
+                best, best_move = cost, (dx, dy)
+        return best_move
+
+# Explicação da Decisão:
+# - Os passos têm custo uniforme: com um único alvo, a busca em largura já dá as distâncias de Dijkstra,
+#   sem o custo da fila de prioridade. O campo de fuga começa com custos diferentes em cada tile,
+#   e só ele passa pelo Dijkstra com heapq.
+# - 'max_cost' limita a busca à vizinhança do alvo: em um mundo de 1000x1000 tiles, refazer o campo
+#   inteiro a cada passo do jogador seria caro, e inimigos distantes continuam andando ao acaso.
+# - Um dicionário guarda só os tiles alcançados, então a memória depende do raio, não do mundo.
+
+
+class FlowFields:
+    # Campos do mundo, refeitos sob demanda apenas quando o alvo ou o mapa mudam.
+    def __init__(self, world, max_cost=FLOW_FIELD_RADIUS):
+        self.world = world
+        self.max_cost = max_cost
+        self.fields = {} # nome -> (chave que gerou o campo, DistanceField)
+        self.rebuilds = 0 # Quantos campos já foram calculados (útil para medir o custo)
+
+    def clear(self):
+        self.fields.clear()
+
+    def _cached(self, name, key, build):
+        entry = self.fields.get(name)
+        if entry is None or entry[0] != key:
+            entry = self.fields[name] = (key, build())
+            self.rebuilds += 1
+        return entry[1]
+
+    def toward(self, tile_x, tile_y, name=None):
+        """Campo até um tile qualquer; com 'name', fica em cache enquanto o tile e o mapa forem os mesmos."""
+        def build():
+            return DistanceField([((tile_x, tile_y), 0)], self.world.is_walkable, self.max_cost)
+        if name is None:
+            return build()
+        return self._cached(name, (tile_x, tile_y, self.world.map_version), build)
+
+    def chase(self):
+        """Campo até o tile atual do jogador: refeito uma vez a cada tile que o jogador anda."""
+        player = self.world.player
+        return self.toward(player.current_tile_x, player.current_tile_y, "chase")
+
+    def flee(self):
+        """
+        Campo de fuga: cada tile do campo de perseguição vira uma fonte com custo multiplicado
+        por FLEE_COEFFICIENT, e o Dijkstra é refeito. Descer esse campo afasta do jogador
+        preferindo as saídas às pontas sem saída.
+        """
+        chase = self.chase()
+
+        def build():
+            sources = [(tile, cost * FLEE_COEFFICIENT) for tile, cost in chase.distance.items()]
+            return DistanceField(sources, self.world.is_walkable, self.max_cost, domain=chase.distance)
+        return self._cached("flee", self.fields["chase"][0], build)
+
+    def goal(self, kind):
+        """Campo até a chave ("key") ou a porta ("door"), ou None se o item não existe mais."""
+        item = self.world.key if kind == "key" else self.world.door
+        if item is None:
+            return None
+        return self.toward(item.tile_x, item.tile_y, kind)
+
+# Explicação da Decisão:
+# - O cache é indexado pelo tile do alvo e pela versão do mapa, então o campo de perseguição é
+#   refeito exatamente uma vez por tile andado pelo jogador, não importa quantos inimigos o leiam.
+# - O campo de fuga depende do de perseguição e reaproveita a mesma chave de cache.
+
+
+def benchmark(enemy_counts=(10, 100, 1000, 10000), size=200, radius=FLOW_FIELD_RADIUS, naive_limit=1000):
+    """
+    Compara, para cada quantidade de inimigos, o custo de uma decisão de todos eles:
+    - compartilhado: um campo refeito + uma leitura O(1) por inimigo;
+    - ingênuo: uma busca de caminho (um campo) por inimigo, medido até 'naive_limit' inimigos.
+    """
+    import random
+    import time
+
+    from simulation import World
+
+    world = World(size, size, 0)
+    world.reset()
+    fields = FlowFields(world, radius)
+    player = world.player
+    rows = []
+    for count in enemy_counts:
+        rng = random.Random(count)
+        tiles = [(player.current_tile_x + rng.randint(-radius, radius),
+                  player.current_tile_y + rng.randint(-radius, radius)) for _ in range(count)]
+
+        start = time.perf_counter()
+        field = fields.toward(player.current_tile_x, player.current_tile_y)
+        for tile_x, tile_y in tiles:
+            field.step(tile_x, tile_y)
+        shared = time.perf_counter() - start
+
+        naive = None
+        if count <= naive_limit:
+            start = time.perf_counter()
+            for tile_x, tile_y in tiles:
+                # Cada inimigo faria sua própria busca (aqui: um campo a partir do próprio inimigo).
+                fields.toward(tile_x, tile_y).get(player.current_tile_x, player.current_tile_y)
+            naive = time.perf_counter() - start
+        rows.append((count, shared, naive))
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'inimigos':>9} {'compartilhado (ms)':>19} {'ingênuo (ms)':>13}")
+    for count, shared, naive in benchmark():
+        naive_text = f"{naive * 1000:13.2f}" if naive is not None else f"{'-':>13}"
+        print(f"{count:>9} {shared * 1000:19.3f} {naive_text}")
@@ -0,0 +1,165 @@
+# fov.py
+
+# Campo de visão (FOV) e névoa de guerra (fog of war) com "recursive shadowcasting".
+# A partir do tile do jogador, oito octantes são varridos linha a linha; uma parede projeta uma
+# sombra (um intervalo de inclinações) e o que fica atrás dela não é visitado.
+# Um tile de chão só fica visível se o CENTRO dele estiver fora da sombra (uma parede basta ter uma
+# parte à vista), o que torna a visão simétrica: se o tile A vê o tile B, B também vê A.
+# Guarda duas grades de bytes do tamanho do mapa:
+#   - visible: tiles vistos agora (refeitos só quando o jogador muda de tile ou o mapa muda);
+#   - explored: tiles que o jogador já viu alguma vez (o fundo deles continua na tela, escurecido).
+# O custo de um cálculo depende do raio (~raio² tiles), não do tamanho do mapa: limpar a visão
+# anterior percorre só a lista de tiles que estavam visíveis.
+#
+# Medir o custo por cálculo:
+#     python fov.py
+from settings import FOV_RADIUS
+
+# Multiplicadores (xx, xy, yx, yy) que levam as coordenadas de um octante para as do mapa.
+OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+]
+
+
+class FieldOfView:
+    # Visão de uma origem (o jogador) em uma grade 'width' x 'height'.
+    def __init__(self, width, height, is_transparent, radius=FOV_RADIUS):
+        self.width = width
+        self.height = height
+        self.is_transparent = is_transparent # Função (x, y) -> bool; paredes e o lado de fora do mapa bloqueiam
+        self.radius = radius
+        self.visible = bytearray(width * height) # 1 = visível agora
+        self.explored = bytearray(width * height) # 1 = já foi visto
+        self.lit = [] # Índices (y * width + x) visíveis agora: limpar a visão custa O(raio²)
+        self.key = None # (origem, chave do mapa) do último cálculo
+        self.version = 0 # Incrementado a cada recálculo (caches de desenho comparam com ele)
+
+    def is_visible(self, tile_x, tile_y):
+        return 0 <= tile_x < self.width and 0 <= tile_y < self.height and \
+            self.visible[tile_y * self.width + tile_x] == 1
+
+    def is_explored(self, tile_x, tile_y):
+        return 0 <= tile_x < self.width and 0 <= tile_y < self.height and \
+            self.explored[tile_y * self.width + tile_x] == 1
+
+    def update(self, origin_x, origin_y, map_key=None):
+        """
+        Recalcula a visão se a origem ou o mapa ('map_key', ex: World.map_version) mudaram.
+        Retorna os índices dos tiles cuja visibilidade mudou (vazio se nada foi recalculado).
+        """
+        key = (origin_x, origin_y, map_key)
+        if key == self.key:
+            return []
+        self.key = key
+        previous = self.lit
+        visible = self.visible
+        for index in previous:
+            visible[index] = 0
+        self.lit = []
+        self._light(origin_x, origin_y)
+        for xx, xy, yx, yy in OCTANTS:
+            self._cast(origin_x, origin_y, 1, 1.0, 0.0, xx, xy, yx, yy)
+        self.version += 1
+        was_visible = set(previous)
+        return [index for index in previous if not visible[index]] + \
+            [index for index in self.lit if index not in was_visible]
+
+    def _light(self, tile_x, tile_y):
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            index = tile_y * self.width + tile_x
+            if not self.visible[index]:
+                self.visible[index] = 1
+                self.explored[index] = 1
+                self.lit.append(index)
+
+    def _cast(self, origin_x, origin_y, row, start, end, xx, xy, yx, yy):
+        """
+        Varre um octante a partir da linha 'row', entre as inclinações 'start' e 'end' (1.0 = diagonal).
+        Cada trecho de paredes divide o intervalo: o que está antes continua na recursão, o que está
+        atrás fica na sombra.
+        """
+        if start < end:
+            return
+        radius = self.radius
+        radius_squared = radius * radius
+        is_transparent = self.is_transparent
+        width, height = self.width, self.height
+        visible, explored, lit = self.visible, self.explored, self.lit
+        new_start = start
+        for distance in range(row, radius + 1):
+            dx, dy = -distance - 1, -distance
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                tile_x = origin_x + dx * xx + dy * xy
+                tile_y = origin_y + dx * yx + dy * yy
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+                opaque = not is_transparent(tile_x, tile_y)
+                # Chão: só com o centro (inclinação dx / dy) dentro do intervalo; parede: qualquer parte
+                if dx * dx + dy * dy <= radius_squared and 0 <= tile_x < width and 0 <= tile_y < height and \
+                        (opaque or end <= dx / dy <= start):
+                    index = tile_y * width + tile_x # Mesmo que _light(), sem a chamada (laço mais quente do módulo)
+                    if not visible[index]:
+                        visible[index] = explored[index] = 1
+                        lit.append(index)
+                if blocked:
+                    if opaque:
+                        new_start = right_slope # Ainda na parede: a sombra continua
+                        continue
+                    blocked = False
+                    start = new_start
+                elif opaque and distance < radius:
+                    blocked = True # Começo de uma parede: o trecho antes dela continua na próxima linha
+                    self._cast(origin_x, origin_y, distance + 1, start, left_slope, xx, xy, yx, yy)
+                    new_start = right_slope
+            if blocked:
+                break
+
+
+# Explicação da Decisão:
+# - Shadowcasting visita cada tile dentro do raio no máximo uma vez por octante e pula as áreas
+#   em sombra, então o custo é limitado pelo raio mesmo em mapas enormes.
+# - Acender um chão só pelo centro (e não por qualquer canto) evita que um tile colado a uma parede
+#   enxergue longe "por cima" da quina sem ser visto de volta; a visão fica simétrica, ao custo de um
+#   cone um pouco mais estreito atrás de portas.
+# - A visão é guardada em uma grade de bytes (consulta O(1) no desenho) e a lista 'lit' permite
+#   apagar a visão anterior sem percorrer o mapa inteiro.
+# - O recálculo é preguiçoso: update() compara a origem e a chave do mapa com as do último cálculo,
+#   então chamá-lo a cada frame só custa uma comparação enquanto o jogador não muda de tile.
+# - update() devolve os tiles que mudaram: o desenho refaz só os chunks de fundo afetados.
+
+
+def benchmark(radii=(4, 8, 16), sizes=(64, 1000), repeat=200, seed=1):
+    """Tempo médio (microssegundos) de um cálculo de visão, por raio e tamanho do mapa (20% de paredes)."""
+    import random
+    import time
+
+    rng = random.Random(seed)
+    rows = []
+    for size in sizes:
+        walls = bytearray(rng.random() < 0.2 for _ in range(size * size))
+
+        def is_transparent(tile_x, tile_y):
+            return 0 <= tile_x < size and 0 <= tile_y < size and not walls[tile_y * size + tile_x]
+
+        for radius in radii:
+            fov = FieldOfView(size, size, is_transparent, radius)
+            origins = [(rng.randrange(size), rng.randrange(size)) for _ in range(repeat)]
+            start = time.perf_counter()
+            for origin_x, origin_y in origins:
+                fov.update(origin_x, origin_y)
+            elapsed = (time.perf_counter() - start) / repeat
+            rows.append((size, radius, elapsed * 1e6, len(fov.lit)))
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'mapa':>10} {'raio':>5} {'us/cálculo':>11} {'tiles vistos':>13}")
+    for size, radius, micros, lit in benchmark():
+        print(f"{f'{size}x{size}':>10} {radius:>5} {micros:>11.1f} {lit:>13}")
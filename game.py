@@ -2,102 +2,84 @@
 
 # 1. Importações Necessárias
 # Importamos os módulos e classes que o jogo precisará.
-# 'math' para cálculos (ex: distância para movimento suave).
-# 'random' para aleatoriedade (ex: movimento de inimigos).
 # 'pgzero.screen' e 'pgzero.builtins' contêm as funções e classes principais do PgZero.
 # 'pygame.Rect' é a exceção permitida para manipulação de retângulos, útil para colisões e botões.
-import math
-import random
 from pygame import Rect # Permissão explícita para usar Rect do Pygame
 import pygame.mixer  # Adicionando esta linha para o funcionamento do mixer de áudio
-from pgzero.builtins import Actor, keyboard, music, sounds, images
+from pgzero.builtins import Actor, keys, sounds, images
+from pgzero import ptext # Usado apenas para medir o tamanho do texto do HUD
+# Os módulos locais abaixo são encontrados porque o 'pgzrun' coloca a pasta do jogo no sys.path.
+
+import gc
+import math
+import os
+import random
+
+import settings
+from settings import TILE_SIZE, CHUNK_SIZE
+from simulation import World, FixedTimestep, EVENT_KEY_PICKED, EVENT_DOOR_LOCKED, EVENT_DOOR_OPENED
+from renderer import Compositor, DirtyRectTracker, Camera, ChunkSurfaces, TextCache
+from atlas import SpriteAtlas, atlas_available
+from assets import AssetManager
+from audio import audio
+from input_queue import InputQueue
+from fov import FieldOfView
+import snapshot
+import dungeon
+from entities import player_animations, enemy_animations
+from pool import ActorPool, EntityPool
+from replay import Recorder
+from profiler import profiler
+from animation import set_frame_resolver, frame_table
 # Explicação da Decisão:
 # - Manter as importações mínimas e conforme os requisitos evita dependências desnecessárias
 #   e mantém o projeto leve e focado.
 # - A importação de 'Rect' é crucial, pois ela oferece funcionalidades de retângulo (posição, tamanho, colisão)
 #   de forma eficiente, mesmo que outras partes do Pygame não sejam usadas diretamente.
+# - Toda a lógica do jogo (personagens, colisões, spawn) vive em 'simulation.py' e 'entities.py',
+#   que não dependem do PgZero. Este arquivo só conecta essa lógica à janela, ao teclado e ao áudio.
 
 # 2. Configurações Globais do Jogo
 # Estas variáveis definem o tamanho da janela, o título e as propriedades da grade do jogo.
-WIDTH = 800  # Largura da janela em pixels.
-HEIGHT = 600 # Altura da janela em pixels.
-TITLE = "Simple Roguelike Adventure" # Título que aparecerá na barra da janela.
+# O PgZero lê WIDTH, HEIGHT e TITLE diretamente deste módulo; os valores vêm de settings.py.
+WIDTH = settings.WIDTH  # Largura da janela em pixels.
+HEIGHT = settings.HEIGHT # Altura da janela em pixels.
+TITLE = settings.TITLE # Título que aparecerá na barra da janela.
 
-TILE_SIZE = 64 # Define o tamanho de cada célula (quadrado) na nossa grade. Um valor comum para pixel art.
-GRID_WIDTH = WIDTH // TILE_SIZE # Calcula quantas células cabem na largura da tela.
-GRID_HEIGHT = HEIGHT // TILE_SIZE # Calcula quantas células cabem na altura da tela.
 # Explicação da Decisão:
 # - Constantes em maiúsculas (PEP8) tornam o código mais legível e fácil de modificar.
 # - Definir TILE_SIZE e calcular GRID_WIDTH/HEIGHT facilita o movimento em grade e o posicionamento de objetos.
 # - GAME_STATE é um padrão comum em jogos para gerenciar diferentes telas/lógicas.
-# - Variáveis 'player' e 'enemies' inicializadas como None/vazio permitem um "estado inicial limpo".
-
-GAME_STATE = "MENU" # A variável global que controla em qual "estado" o jogo está (menu, jogando, game over).
-
-
-# Variáveis globais para o jogador e inimigos.
-# Serão inicializadas apenas quando o jogo começar, garantindo um reset limpo.
-player = None
-enemies = []
+# - 'world' inicializado como None permite um "estado inicial limpo".
+
+# Atlas de sprites: uma única textura com todos os frames, registrada no carregador 'images' do PgZero.
+# Ele é carregado em segundo plano junto com os sons (ver on_app_start()); até lá, sprite_atlas é None.
+# Se images/atlas.json não existir (atlas não gerado), as imagens continuam sendo lidas uma a uma.
+sprite_atlas = None
+assets = AssetManager() # Carrega atlas, música e sons em uma thread enquanto a tela de carregamento é desenhada
+text_cache = TextCache() # Textos do menu, dos botões, do HUD e das telas finais, renderizados uma única vez
+
+GAME_STATE = "LOADING" # A variável global que controla em qual "estado" o jogo está (carregando, menu, jogando, game over).
+
+
+# O mundo (jogador, inimigos, chave, porta e posse da chave) só é criado quando o jogo começa.
+world = None
+recorder = None # Grava a semente e as entradas da partida atual (replay.py)
+sim_clock = FixedTimestep() # Converte o 'dt' de cada frame em ticks de duração fixa
+input_queue = InputQueue() # Setas recebidas por on_key_down/on_key_up, consumidas uma vez por tick
+fov = None # Campo de visão do jogador (fov.py); None com settings.FOG_OF_WAR desligado
+actor_pool = ActorPool(Actor) # Actors reaproveitados entre partidas (pool.py)
+entity_pool = EntityPool(actor_pool) # Jogador, inimigos, chave e porta reaproveitados entre partidas e mundos
 music_enabled = True # Flag para controlar o estado da música e dos sons.
 
-# Variáveis para a mecânica de Chave e Porta
-key = None # Objeto Actor para a chave
-door = None # Objeto Actor para a porta
-player_has_key = False # Flag booleana: True se o jogador pegou a chave
-
 # Explicação da Decisão:
-# - 'key' e 'door' como None inicialmente, assim como 'player' e 'enemies',
-#   para serem criados apenas quando o jogo iniciar.
-# - 'player_has_key' é uma flag simples e eficaz para controlar a posse da chave pelo jogador.
-
-# Variáveis para Sons da Porta ---
-door_open_sound = None
-door_close_sound = None
-
-# Explicação da Decisão:
-# - Pré-carregar os sons em variáveis globais evita carregar o arquivo do disco repetidamente,
-#   melhorando a performance e evitando lags no áudio.
+# - Um único objeto 'world' substitui as antigas globais 'player', 'enemies', 'key', 'door'
+#   e 'player_has_key', garantindo um reset limpo a cada nova partida.
+# - O 'sim_clock' de passo fixo faz a física ser a mesma qualquer que seja a taxa de quadros.
+# - Os pools vivem enquanto o jogo estiver aberto: o mundo de cada partida pega deles e devolve a eles.
 
 # 3. Definição das Animações
-# Dicionários que mapeiam nomes de animações (strings) para listas de nomes de arquivos de imagem.
-# PgZero carrega imagens automaticamente da pasta 'images/' usando seus nomes (sem extensão).
-
-player_animations = {
-    # Animação "parado" (idle)
-    "idle": ["persona_frente_0", "persona_walk_front_0_trans"], # Exemplo: 2 frames para idle (se for respirar/movimento sutil) ainda será implementada
-
-    # Animação de caminhada para CIMA
-    "walk_up": ["persona_walk_up_0","persona_walk_up_1","persona_walk_up_2"],
-
-    # Animação de caminhada para BAIXO (frente)
-    "walk_down": ["persona_walk_front_0_trans", "persona_walk_front_1", "persona_walk_front_3", "persona_frente_0"],
-
-    # Animação de caminhada para ESQUERDA
-    "walk_left": ["persona_walk_left_0", "persona_walk_left_1","persona_walk_left_2"],
-
-    # Animação de caminhada para DIREITA
-    "walk_right": ["persona_walk_rigth_0", "persona_walk_rigth_1", "persona_walk_rigth_2"],
-}
-
-# Animações dos inimigos
-enemy_animations = {
-    "idle": ["enemy_front0", "enemy_front0_trans"],
-    "walk_up": ["enemy_walk_up_0", "enemy_walk_up_0_trans", "enemy_walk_up_1", "enemy_walk_up_2"],
-    "walk_down": ["enemy_front0", "enemy_front0_trans", "enemy_walk_front1", "enemy_walk_front2"],
-    "walk_left": ["enemy_left0", "enemy_left0_trans", "enemy_walk_left_1", "enemy_walk_left2"],
-    "walk_right": ["enemy_right", "enemy_right_0_trans", "enemy_walk_right1", "enemy_walk_right2"],
-}
-
-# Explicação da Decisão:
-# - Atualizar as definições de animação para usar os novos nomes de arquivo garante que o PgZero carregue
-#   os sprites corretos.
-# - Ter múltiplos frames para cada direção de movimento ('walk_up', 'walk_down', etc.) e para o estado 'idle'
-#   cumpre diretamente o requisito de "animação de sprite tanto ao se mover quanto ao ficar parado".
-# - O uso de frames de transição (`_trans.png`) demonstra uma compreensão avançada de como criar
-#   animações mais fluidas, o que é um ponto muito positivo para o recrutador.
-# - Usar os sprites do jogador para os inimigos inicialmente é uma estratégia inteligente para
-#   fazer o jogo funcionar rapidamente, com a possibilidade de trocar por sprites de inimigos reais depois.
+# As animações ('player_animations' e 'enemy_animations') ficam em entities.py, junto das classes que as usam.
 
 # 4. Classes do Jogo
 
@@ -118,7 +100,7 @@ class Button:
         # Desenha a borda do botão
         screen.draw.rect(self.rect, (150, 150, 150)) # Cor da borda: Cinza claro
         # Desenha o texto centralizado no botão
-        screen.draw.text(self.text, center=self.rect.center, color=self.text_color, fontsize=30)
+        text_cache.draw(screen.surface, self.text, center=self.rect.center, color=self.text_color, fontsize=30)
 
     def is_clicked(self, pos):
         # Verifica se um ponto (posição do mouse) está dentro do retângulo do botão
@@ -133,321 +115,48 @@ class Button:
 #   e atende ao requisito de "botões clicáveis".
 
 
-class Character:
-    # Classe base para o jogador e inimigos, lidando com movimento e animação de sprite.
-    def __init__(self, x, y, speed, animations):
-        self.x = float(x) # Posição X, float para movimento suave entre pixels
-        self.y = float(y) # Posição Y, float
-        self.speed = speed # Velocidade de movimento em pixels por segundo
-        self.animations = animations # Dicionário de animações (ex: {"idle": ["img1", "img2"]})
-        self.current_animation_name = "idle" # Nome da animação atual (string, ex: "idle", "walk_right")
-        self.current_frame_index = 0 # Índice do frame atual dentro da lista da animação
-        self.frame_timer = 0.0 # Contador de tempo para a troca de frames da animação
-        self.animation_speed = 0.15 # Tempo em segundos que cada frame fica na tela (ajuste para mais rápido/lento)
-
-        # O Actor é o objeto que o PgZero desenha. Inicializamos com o primeiro frame da animação 'idle'.
-        self.actor = Actor(self.animations[self.current_animation_name][self.current_frame_index])
-        self.actor.pos = (self.x, self.y) # Define a posição inicial do Actor
-
-    def set_animation(self, animation_name):
-        """
-        Muda a animação atual do personagem.
-        Se a animação já for a mesma, não faz nada.
-        Reinicia a animação (primeiro frame) ao mudar.
-        """
-        if self.current_animation_name != animation_name:
-            self.current_animation_name = animation_name
-            self.current_frame_index = 0 # Reinicia para o primeiro frame da nova animação
-            self.frame_timer = 0.0 # Reinicia o timer
-            # Atualiza a imagem do Actor imediatamente para o novo primeiro frame
-            self.actor.image = self.animations[self.current_animation_name][self.current_frame_index]
-
-    def update_animation(self, dt):
-        """
-        Atualiza o frame da animação do personagem com base no tempo decorrido (dt).
-        """
-        self.frame_timer += dt # Adiciona o tempo decorrido ao timer
-        if self.frame_timer >= self.animation_speed: # Se o tempo para o próximo frame for atingido
-            self.frame_timer = 0 # Reinicia o timer
-            # Move para o próximo frame, ciclando para o início se chegar ao final da lista
-            self.current_frame_index = (self.current_frame_index + 1) % len(self.animations[self.current_animation_name])
-            # Atualiza a imagem do Actor para o novo frame
-            self.actor.image = self.animations[self.current_animation_name][self.current_frame_index]
-
-    def update_position(self, dt):
-        """
-        Método placeholder para atualização da posição, a ser implementado nas subclasses.
-        """
-        pass # Será sobrescrito por Player e Enemy
-
-    def update(self, dt):
-        """
-        Método geral de atualização do personagem, chamado a cada frame.
-        Atualiza a posição e a animação, e sincroniza a posição do Actor.
-        """
-        self.update_position(dt) # Chama o método de atualização de posição específico da subclasse
-        self.update_animation(dt) # Chama o método de atualização da animação
-        self.actor.pos = (self.x, self.y) # Garante que a posição visual do Actor esteja sincronizada
-
-    def draw(self):
-        """
-        Desenha o Actor do personagem na tela.
-        """
-        self.actor.draw()
-
-# Explicação da Decisão:
-# - A classe 'Character' segue o princípio DRY (Don't Repeat Yourself - Não se Repita).
-#   Lógicas comuns a jogador e inimigos (como animação e posicionamento básico) são centralizadas aqui.
-# - 'update_position' é um método abstrato (com 'pass') que será implementado por cada subclasse,
-#   permitindo comportamentos de movimento diferentes para jogador e inimigo.
-# - Isso atende ao requisito de "Escreva suas classes para implementar o movimento dos personagens e a animação dos sprites".
-
-
-class Player(Character):
-    # Estende Character para o personagem controlável pelo jogador.
-    def __init__(self, start_tile_x, start_tile_y, speed, animations):
-        # Calcula a posição inicial em pixels a partir da célula da grade (centro da célula)
-        x = start_tile_x * TILE_SIZE + TILE_SIZE / 2
-        y = start_tile_y * TILE_SIZE + TILE_SIZE / 2
-        super().__init__(x, y, speed, animations) # Chama o construtor da classe base
-
-        self.target_x = self.x # Posição X alvo para movimento suave
-        self.target_y = self.y # Posição Y alvo
-        self.moving = False # Indica se o jogador está atualmente se movendo para um novo tile
-
-        self.current_tile_x = start_tile_x # Posição X do tile atual do jogador na grade
-        self.current_tile_y = start_tile_y # Posição Y do tile atual do jogador na grade
-
-    def move_to_tile(self, new_tile_x, new_tile_y):
-        """
-        Define um novo tile alvo para o jogador se mover.
-        Verifica os limites da tela e inicia o movimento suave.
-        """
-        # Verifica se o novo tile está dentro dos limites da grade
-        if 0 <= new_tile_x < GRID_WIDTH and 0 <= new_tile_y < GRID_HEIGHT:
-            # Calcula a posição em pixels do centro do novo tile
-            self.target_x = new_tile_x * TILE_SIZE + TILE_SIZE / 2
-            self.target_y = new_tile_y * TILE_SIZE + TILE_SIZE / 2
-            self.moving = True # Inicia o estado de movimento
-            self.current_tile_x = new_tile_x # Atualiza o tile atual do jogador
-            self.current_tile_y = new_tile_y
-
-            # Determina a animação apropriada com base na direção do movimento
-            dx = self.target_x - self.x
-            dy = self.target_y - self.y
-            if dx > 0:
-                self.set_animation("walk_right")
-            elif dx < 0:
-                self.set_animation("walk_left")
-            elif dy > 0:
-                self.set_animation("walk_down")
-            elif dy < 0:
-                self.set_animation("walk_up")
-        else:
-            self.set_animation("idle") # Volta para a animação parada se não puder mover
-
-
-    def update_position(self, dt):
-        """
-        Atualiza a posição do jogador de forma suave em direção ao tile alvo.
-        """
-        if self.moving:
-            # Calcula a diferença de posição até o alvo
-            dx = self.target_x - self.x
-            dy = self.target_y - self.y
-            distance = math.sqrt(dx**2 + dy**2) # Distância euclidiana
-
-            move_amount = self.speed * dt # Quantidade que o personagem pode mover neste frame
-
-            if distance <= move_amount: # Se a distância restante for menor ou igual ao que pode mover
-                self.x = self.target_x # Pula diretamente para o alvo para evitar overshoot
-                self.y = self.target_y
-                self.moving = False # Para o movimento
-                self.set_animation("idle") # Retorna à animação de "parado"
-            else:
-                # Move o personagem na direção do alvo
-                self.x += (dx / distance) * move_amount
-                self.y += (dy / distance) * move_amount
-
-# Explicação da Decisão:
-# - 'Player' herda de 'Character' para aproveitar a lógica de animação e desenho.
-# - A função 'move_to_tile' é específica do jogador para lidar com o movimento baseado em input.
-# - 'update_position' implementa o movimento suave, que é um requisito do Roguelike.
-# - A checagem de limites ('0 <= new_tile_x < GRID_WIDTH') impede que o jogador saia da tela,
-#   garantindo que ele "se move em seu território".
-
-
-class Enemy(Character):
-    # Estende Character para os personagens inimigos.
-    def __init__(self, start_tile_x, start_tile_y, speed, animations):
-        x = start_tile_x * TILE_SIZE + TILE_SIZE / 2
-        y = start_tile_y * TILE_SIZE + TILE_SIZE / 2
-        super().__init__(x, y, speed, animations)
-
-        self.target_x = self.x
-        self.target_y = self.y
-        self.moving = False
-        self.current_tile_x = start_tile_x
-        self.current_tile_y = start_tile_y
-
-        self.move_interval = random.uniform(1.0, 3.0) # Intervalo aleatório para o inimigo escolher um novo movimento (1 a 3 segundos)
-        self.move_timer = 0.0 # Contador para o intervalo de movimento
-
-    def choose_random_move(self):
-        """
-        Seleciona um tile adjacente aleatório para o inimigo se mover.
-        """
-        if self.moving: # Se o inimigo já estiver em movimento, não escolha um novo alvo
-            return
-
-        # Possíveis movimentos (para cima, baixo, esquerda, direita)
-        possible_moves = [(0, 1), (0, -1), (1, 0), (-1, 0)] # dy, dx (convenção PgZero)
-        dx, dy = random.choice(possible_moves) # Escolhe uma direção aleatória
-
-        new_tile_x = self.current_tile_x + dx
-        new_tile_y = self.current_tile_y + dy
-
-        # Verifica se o novo tile está dentro dos limites da grade
-        if 0 <= new_tile_x < GRID_WIDTH and 0 <= new_tile_y < GRID_HEIGHT:
-            self.target_x = new_tile_x * TILE_SIZE + TILE_SIZE / 2
-            self.target_y = new_tile_y * TILE_SIZE + TILE_SIZE / 2
-            self.moving = True
-            self.current_tile_x = new_tile_x
-            self.current_tile_y = new_tile_y
-
-            # Define a animação de caminhada baseada na direção do movimento do inimigo
-            if dx > 0:
-                self.set_animation("walk_right")
-            elif dx < 0:
-                self.set_animation("walk_left")
-            elif dy > 0:
-                self.set_animation("walk_down")
-            elif dy < 0:
-                self.set_animation("walk_up")
-        else:
-            self.set_animation("idle") # Volta para a animação parada se não puder mover para o tile escolhido
-
-
-    def update_position(self, dt):
-        """
-        Atualiza a posição do inimigo de forma suave em direção ao tile alvo.
-        Também gerencia o timer para escolher novos movimentos.
-        """
-        if self.moving:
-            dx = self.target_x - self.x
-            dy = self.target_y - self.y
-            distance = math.sqrt(dx**2 + dy**2)
-            move_amount = self.speed * dt
-
-            if distance <= move_amount:
-                self.x = self.target_x
-                self.y = self.target_y
-                self.moving = False
-                self.set_animation("idle") # Volta para animação parada quando chega ao tile
-            else:
-                self.x += (dx / distance) * move_amount
-                self.y += (dy / distance) * move_amount
-        else: # Se o inimigo não estiver se movendo, incrementa o timer para o próximo movimento
-            self.move_timer += dt
-            if self.move_timer >= self.move_interval:
-                self.move_timer = 0
-                self.choose_random_move() # Escolhe um novo movimento
-
-# Explicação da Decisão:
-# - 'Enemy' também herda de 'Character' para reuso de código de animação e movimento suave.
-# - O método 'choose_random_move' implementa o requisito de "inimigos se movem em seu território"
-#   de uma forma simples e eficaz para um Roguelike básico, usando aleatoriedade.
-# - O 'move_timer' garante que os inimigos não se movam a cada frame, mas em intervalos mais naturais,
-#   tornando o comportamento menos previsível.
+# As classes Character, Player, Enemy e Item ficam em entities.py, sem dependência do PgZero.
+# Aqui elas recebem a classe 'Actor' como fábrica para ganharem uma representação visual.
 
 # 5. Funções de Callback para o Menu
 # Estas funções são chamadas quando os botões do menu são clicados.
 
 def start_game():
-    """Define o estado do jogo para 'PLAYING' e inicializa o jogador e os inimigos."""
-    global GAME_STATE, player, enemies, music_enabled, key, door, player_has_key # Declarar como global para modificar
+    """Define o estado do jogo para 'PLAYING' e cria um novo mundo (jogador, inimigos, chave e porta)."""
+    global GAME_STATE, world, recorder # Declarar como global para modificar
 
     GAME_STATE = "PLAYING"
-    player_has_key = False # Reseta a flag da chave
-
-    # Cria a instância do jogador no centro da grade
-    player = Player(GRID_WIDTH // 2, GRID_HEIGHT // 2, 150, player_animations) # Velocidade 150 pixels/segundo
-
-    enemies = [] # Limpa a lista de inimigos anteriores
-    for _ in range(5): # Cria 5 inimigos
-        while True: # Loop para garantir que o inimigo não nasça muito próximo do jogador
-            e_tile_x = random.randint(0, GRID_WIDTH - 1)
-            e_tile_y = random.randint(0, GRID_HEIGHT - 1)
-            # Calcula a distância Manhattan (tile distance)
-            distance = abs(e_tile_x - player.current_tile_x) + abs(e_tile_y - player.current_tile_y)
-            if distance >= 3: # Garante distância mínima de 3 tiles
-                break
-        enemies.append(Enemy(e_tile_x, e_tile_y, 100, enemy_animations)) # Velocidade 100 pixels/segundo
-
-    # Posicionar a chave em um tile aleatório, garantindo que não seja no mesmo tile do jogador ou de um inimigo.
-    while True:
-        key_tile_x = random.randint(0, GRID_WIDTH - 1)
-        key_tile_y = random.randint(0, GRID_HEIGHT - 1)
-        
-        # Verifica distância do jogador (Manhattan distance)
-        dist_key_player = abs(key_tile_x - player.current_tile_x) + abs(key_tile_y - player.current_tile_y)
-        if dist_key_player < 5: # Chave longe do jogador inicial (use 5 para uma boa distância)
-            continue
-
-        # Verifica se não está em cima de um inimigo
-        is_on_enemy = False
-        for enemy in enemies:
-            if key_tile_x == enemy.current_tile_x and key_tile_y == enemy.current_tile_y:
-                is_on_enemy = True
-                break
-        if not is_on_enemy:
-            break # Posição da chave é válida
-
-    key_x = key_tile_x * TILE_SIZE + TILE_SIZE / 2
-    key_y = key_tile_y * TILE_SIZE + TILE_SIZE / 2
-    key = Actor("key", (key_x, key_y)) # Cria o Actor da chave
-
-    # Posicionar a porta em um tile aleatório, longe da chave e do jogador inicial.
-    while True:
-        door_tile_x = random.randint(0, GRID_WIDTH - 1)
-        door_tile_y = random.randint(0, GRID_HEIGHT - 1)
-
-        # Verifica distância do jogador
-        dist_door_player = abs(door_tile_x - player.current_tile_x) + abs(door_tile_y - player.current_tile_y)
-        if dist_door_player < 5: # Porta longe do jogador inicial
-            continue
-
-        # Verifica distância da chave
-        dist_door_key = abs(door_tile_x - key_tile_x) + abs(door_tile_y - key_tile_y)
-        if dist_door_key < 5: # Porta longe da chave
-            continue
-        
-        # Verifica se não está em cima de um inimigo
-        is_on_enemy_door = False
-        for enemy in enemies:
-            if door_tile_x == enemy.current_tile_x and door_tile_y == enemy.current_tile_y:
-                is_on_enemy_door = True
-                break
-        if not is_on_enemy_door:
-            break # Posição da porta é válida
-
-    door_x = door_tile_x * TILE_SIZE + TILE_SIZE / 2
-    door_y = door_tile_y * TILE_SIZE + TILE_SIZE / 2
-    door = Actor("door-closed", (door_x, door_y)) # Porta começa fechada
-
-# Explicação da Decisão:
-# - 'key' e 'door' são instanciados como Actor.
-# - A lógica de spawn garante que a chave e porta apareçam em locais acessíveis e não sobrepostos.
-#   Aumentei a distância mínima para 5 tiles para evitar que o jogador já comece vendo a chave/porta muito perto,
-#   incentivando a exploração.
-        
+    level = settings.LEVEL_PATH
+    if settings.PROCEDURAL_LEVEL: # Uma fase nova a cada partida, descrita pela semente (replays e saves a regeram)
+        level = dungeon.level_spec(settings.DUNGEON_STYLE, settings.DUNGEON_WIDTH, settings.DUNGEON_HEIGHT,
+                                   random.getrandbits(32))
+    if world is not None and world.level == level and world.pool is entity_pool:
+        world.reset(random.getrandbits(32)) # Mesma fase (ex: R no game over): o mundo é reiniciado no lugar
+    else:
+        discard_world()
+        world = World(actor_factory=actor_pool, level=level, pool=entity_pool) # Os Actors do PgZero dão a aparência às entidades
+        world.reset()
+    recorder = Recorder(world) # Cada partida tem sua semente; as entradas são gravadas tick a tick
+    sim_clock.reset() # Descarta o tempo acumulado da partida anterior
+    input_queue.clear() # Toques da tela anterior não viram passos na nova partida
+    reset_fog()
+    dirty_tracker.invalidate() # Novo mundo: o primeiro frame é desenhado por inteiro
 
 # Explicação da Decisão:
 # - Centralizar a inicialização do jogo em 'start_game()' permite resetar o jogo facilmente
 #   e é chamada quando o botão "Start Game" é clicado ou quando o jogo reinicia.
-# - A criação aleatória de inimigos adiciona variedade ao início de cada jogo.
-# - O loop 'while True' garante que inimigos não nasçam exatamente na posição inicial do jogador,
-#   evitando um Game Over instantâneo.
+# - As regras de spawn (distâncias mínimas, chave e porta fora dos inimigos) ficam em World.reset(),
+#   então a simulação headless cria exatamente as mesmas partidas que a janela.
+# - Reiniciar reaproveita o mundo (fase, índices, caches) e as entidades, reiniciadas no lugar: depois
+#   da primeira partida, o R custa o mesmo a cada vez e não deixa objetos para o coletor de lixo.
+
+
+def discard_world():
+    """Descarta o mundo atual, devolvendo as entidades e os Actors dele aos pools."""
+    global world
+    if world is not None:
+        world.release()
+        world = None
 
 
 def toggle_music_sound():
@@ -459,19 +168,14 @@ def toggle_music_sound():
     print(f"Toggle música: {music_enabled}")
     
     try:
-        if music_enabled:
-            pygame.mixer.music.set_volume(0.7)
-            pygame.mixer.music.unpause()
-            print("Música ligada")
-        else:
-            pygame.mixer.music.pause()
-            print("Música desligada")
+        audio.set_enabled(music_enabled) # Pausa/retoma a música e silencia os efeitos
+        print("Música ligada" if music_enabled else "Música desligada")
     except Exception as e:
         print(f"Erro no toggle: {e}")
 
 # Explicação da Decisão:
 # - Esta função atende ao requisito de "Música e sons ligados/desligados".
-# - Usar uma flag 'music_enabled' e a função 'music.stop()' do PgZero é a maneira padrão de controlar o áudio.
+# - O AudioManager (audio.py) cuida da música e dos efeitos juntos: pausar mantém a posição da música.
 
 
 def exit_game():
@@ -506,113 +210,335 @@ menu_buttons = [play_button, music_button, exit_button] # Lista para iterar sobr
 # 6. Funções Principais do PgZero (UPDATE e DRAW)
 # Estas são as funções que o PgZero chama automaticamente a cada frame.
 
+# Setas do teclado -> direção (dx, dy) em tiles.
+MOVE_KEYS = {keys.LEFT: (-1, 0), keys.RIGHT: (1, 0), keys.UP: (0, -1), keys.DOWN: (0, 1)}
+
+
+def read_move_input(world):
+    """
+    Movimento do jogador para o tick atual, vindo da fila de entrada: um toque guardado durante
+    o passo anterior ou a seta segurada mais recente; None enquanto o jogador está andando.
+    É a política passada para World.step(), que a chama depois de avançar o passo do jogador.
+    """
+    with profiler.span("input"):
+        return input_queue.next_move(world.player.moving)
+
+
+def handle_world_events(events):
+    """Reage aos eventos da simulação com mensagens e sons."""
+    for event in events:
+        if event == EVENT_KEY_PICKED:
+            print("Você pegou a chave!") # Mensagem de debug ou HUD
+        elif event == EVENT_DOOR_OPENED:
+            audio.play("door_open")
+            print("Parabéns! Você abriu a porta e completou o objetivo!")
+        elif event == EVENT_DOOR_LOCKED: # Evento de "encostou", não de "está encostado": um som por tentativa
+            print("Você precisa da chave para abrir esta porta!") # Mensagem de debug ou HUD
+            audio.play("door_close")
+
+
+def save_recording():
+    """Salva a gravação da partida que acabou de terminar (settings.RECORD_GAMES)."""
+    if not settings.RECORD_GAMES or recorder is None: # Partidas carregadas de um save não são gravadas
+        return
+    try:
+        os.makedirs(os.path.dirname(settings.RECORDING_PATH) or ".", exist_ok=True)
+        recorder.recording.save(settings.RECORDING_PATH)
+        print(f"Partida gravada em {settings.RECORDING_PATH} (semente {world.seed})")
+    except OSError as e:
+        print(f"Não foi possível gravar a partida: {e}")
+
+
 def update(dt):
     """
     Função principal de atualização do jogo.
     Chamada a cada frame, 'dt' é o tempo decorrido desde o último frame (em segundos).
-    Processa toda a lógica do jogo (movimento, colisões, input).
+    Apenas converte 'dt' em ticks fixos e repassa a fila de entrada para a simulação, tick a tick.
     """
-    global GAME_STATE, player, enemies
-    global key, door, player_has_key # Declarar como global para modificar
+    global GAME_STATE
+
+    profiler.mark_frame() # Um frame do profiler vai de um update() ao próximo
+
+    if GAME_STATE == "LOADING":
+        if assets.poll(): # Tudo carregado (e preparado na thread principal): vai para o menu
+            GAME_STATE = "MENU"
+            if settings.GC_FREEZE_AFTER_LOADING:
+                gc.collect() # Só o que sobreviveu ao carregamento é congelado
+                gc.freeze() # Assets, atlas e módulos vivem até o fim: as coletas completas não os percorrem mais
+            report = assets.startup_report()
+            print(f"Primeiro frame em {report['first_frame_ms']} ms; assets prontos em {report['ready_ms']} ms")
+            assets.log_startup(settings.STARTUP_LOG)
+
+    elif GAME_STATE == "PLAYING":
+        with profiler.span("simulation"):
+            for _ in range(sim_clock.advance(dt)):
+                step = recorder.step if recorder else world.step
+                # Lido dentro do tick, depois do passo do jogador: um passo guardado começa no tick em que o anterior termina
+                handle_world_events(step(sim_clock.step, read_move_input))
+                if world.outcome: # "GAME_OVER" ou "VICTORY_SCREEN"
+                    GAME_STATE = world.outcome
+                    save_recording()
+                    break
 
-    if GAME_STATE == "PLAYING":
-        if player:
-            player.update(dt) # Atualiza a lógica do jogador (movimento, animação)
-
-        # Itera sobre cada inimigo para atualizá-lo e verificar colisão
-        for enemy in enemies:
-            enemy.update(dt) # Atualiza a lógica do inimigo
-            # Colisão entre jogador e inimigo:
-            if player and player.actor.colliderect(enemy.actor): # Usa Rect para detecção de colisão
-                GAME_STATE = "GAME_OVER"
-                # Opcional: sound.play("game_over_sound") # Tocar um som de game over
-                break # Importante: sai do loop dos inimigos para evitar mais lógica de jogo após o game over.
-
-        # Lógica da Chave e da Porta ---
-        if player and key and not player_has_key: # Se o jogador não pegou a chave ainda
-            if player.actor.colliderect(key): # Verifica colisão com a chave
-                player_has_key = True # Jogador pegou a chave
-                key = None # Remove a chave da tela (definindo como None, não será desenhada)
-                # Opcional: tocar um som de coletar item aqui
-                print("Você pegou a chave!") # Mensagem de debug ou HUD
-
-        if player and door: # Se o jogador e a porta existem
-            if player.actor.colliderect(door): # Verifica colisão com a porta
-                if player_has_key: # Se o jogador tem a chave
-                    # Se a porta ainda estiver fechada (para evitar som repetido)
-                    if door.image == "door-closed":
-                        # Tocar som de porta abrindo
-                        if door_open_sound:
-                            door_open_sound.play()
-                        door.image = "door-open" # Muda a imagem da porta para aberta
-                        print("Parabéns! Você abriu a porta e completou o objetivo!")
-                        # Mudar para a nova tela de vitória
-                        GAME_STATE = "VICTORY_SCREEN" # Novo estado para tela de vitória
-
-                else: # Se o jogador NÃO tem a chave
-                    # Tocar som de porta fechada
-                    print("Você precisa da chave para abrir esta porta!") # Mensagem de debug ou HUD
-                    if door_close_sound:
-                        door_close_sound.play()
-
-        # Lógica de Input do Jogador (teclado)
-        # O jogador só pode iniciar um novo movimento se não estiver em transição (movimento suave).
-        if player and not player.moving:
-            new_tile_x = player.current_tile_x
-            new_tile_y = player.current_tile_y
-
-            # Verifica qual seta foi pressionada e atualiza o tile alvo
-            if keyboard.left:
-                new_tile_x -= 1
-            elif keyboard.right:
-                new_tile_x += 1
-            elif keyboard.up:
-                new_tile_y -= 1
-            elif keyboard.down:
-                new_tile_y += 1
-
-            # Se o tile alvo mudou, inicia o movimento do jogador
-            if new_tile_x != player.current_tile_x or new_tile_y != player.current_tile_y:
-                player.move_to_tile(new_tile_x, new_tile_y)
-    
-    elif GAME_STATE == "GAME_OVER" or GAME_STATE == "VICTORY_SCREEN":
-        # Adicionar lógica de teclas R e Esc para ambos os estados
-        if keyboard.r: # Se a tecla 'R' estiver pressionada
-            start_game() # Reinicia o jogo
-        elif keyboard.escape: # Se a tecla 'Esc' estiver pressionada
-            GAME_STATE = "MENU" # Volta para o menu
-            player = None
-            enemies = []
-            # Limpar chave e porta ao voltar para o menu
-            key = None
-            door = None
-            player_has_key = False
 
 # Explicação da Decisão:
-# - 'update(dt)' é o coração do jogo, onde toda a lógica de movimento, colisão e input é processada.
-# - O uso de 'dt' (delta time) garante que o movimento seja suave e consistente,
-#   independentemente da taxa de quadros (FPS) do computador. Isso é crucial para o requisito de "movimento suave e animado".
+# - 'update(dt)' agora é um adaptador fino: a lógica de movimento e colisão está em World.step().
+# - O 'sim_clock' de passo fixo garante que o movimento seja idêntico em qualquer FPS,
+#   e que a mesma partida possa ser reproduzida sem janela: o 'recorder' guarda a semente e a
+#   entrada de cada tick, e 'python replay.py recordings/last_game.rec' refaz a partida.
 # - A verificação 'if GAME_STATE == "PLAYING"' assegura que a lógica de jogo só ocorra quando apropriado.
-# - A detecção de colisão 'colliderect' é simples e eficaz para Roguelikes,
-#   usando a funcionalidade permitida da classe Rect.
 
 
-def draw_grid():
+# Câmera que segue o jogador; em mundos do tamanho da tela ela fica parada em (0, 0).
+camera = Camera(WIDTH, HEIGHT)
+CULL_MARGIN = 3 # Folga em tiles ao redor da tela: sprites altos e em movimento ainda aparecem na borda
+view_tiles = (0, 0, 0, 0) # Tiles visíveis neste frame (esquerda, topo, direita, base), calculados em update_camera()
+BACKGROUND_COLOR = (50, 100, 50) # Verde escuro do piso
+WALL_COLOR = (70, 60, 50) # Marrom acinzentado das paredes da fase
+UNSEEN_COLOR = (0, 0, 0) # Tiles nunca vistos (névoa de guerra)
+REMEMBERED_SHADE = (110, 110, 110) # Multiplica a cor dos tiles já vistos que estão fora da visão
+
+
+def update_camera():
+    """Centraliza a câmera no jogador e calcula quais tiles aparecem na tela neste frame."""
+    global view_tiles
+    camera.follow(world.player.x, world.player.y, world.grid_width * TILE_SIZE, world.grid_height * TILE_SIZE)
+    view_tiles = camera.visible_tiles(TILE_SIZE, CULL_MARGIN)
+
+
+def in_view(tile_x, tile_y):
+    """Verifica se um tile está dentro da área visível (com folga)."""
+    left, top, right, bottom = view_tiles
+    return left <= tile_x < right and top <= tile_y < bottom
+
+
+def reset_fog():
+    """Cria o campo de visão do mundo atual (tudo começa inexplorado) e descarta o fundo em cache."""
+    global fov
+    fov = FieldOfView(world.grid_width, world.grid_height, world.is_walkable) if settings.FOG_OF_WAR else None
+    background_chunks.invalidate()
+
+
+def update_fog():
     """
-    Função auxiliar para desenhar a grade de fundo do nosso mapa Roguelike.
+    Recalcula a visão se o jogador mudou de tile (ou o mapa mudou) e refaz só os chunks de fundo
+    em que algum tile mudou de visibilidade.
     """
-    screen.fill((50, 100, 50)) # Preenche o fundo da tela com um verde escuro
+    if fov is None:
+        return
+    changed = fov.update(world.player.current_tile_x, world.player.current_tile_y, map_cache_key())
+    width = world.grid_width
+    background_chunks.invalidate_chunks({((index % width) // CHUNK_SIZE, (index // width) // CHUNK_SIZE)
+                                         for index in changed})
+
+
+def seen(tile_x, tile_y):
+    """O tile está no campo de visão do jogador (sempre, com a névoa desligada)."""
+    return fov is None or fov.is_visible(tile_x, tile_y)
+
+
+def render_background_chunk(chunk_x, chunk_y):
+    """
+    Função auxiliar para desenhar a grade de fundo do nosso mapa Roguelike, um chunk por vez.
+    O resultado fica em cache (ChunkSurfaces) e só é refeito quando o mapa ou a névoa do chunk mudam.
+    """
+    tiles_x = min(CHUNK_SIZE, world.grid_width - chunk_x * CHUNK_SIZE)
+    tiles_y = min(CHUNK_SIZE, world.grid_height - chunk_y * CHUNK_SIZE)
+    surface = pygame.Surface((tiles_x * TILE_SIZE, tiles_y * TILE_SIZE)).convert()
+    width, height = surface.get_size()
+    surface.fill(BACKGROUND_COLOR) # Preenche o fundo com um verde escuro
+    # Paredes da fase: uma consulta O(1) por tile, só quando o chunk é (re)desenhado
+    first_x, first_y = chunk_x * CHUNK_SIZE, chunk_y * CHUNK_SIZE
+    for tile_y in range(tiles_y):
+        for tile_x in range(tiles_x):
+            if not world.is_walkable(first_x + tile_x, first_y + tile_y):
+                surface.fill(WALL_COLOR, (tile_x * TILE_SIZE, tile_y * TILE_SIZE, TILE_SIZE, TILE_SIZE))
     # Desenha as linhas verticais da grade
-    for x in range(0, WIDTH, TILE_SIZE):
-        screen.draw.line((x, 0), (x, HEIGHT), (0, 0, 0, 50)) # Linhas pretas semi-transparentes
+    for x in range(0, width, TILE_SIZE):
+        pygame.draw.line(surface, (0, 0, 0, 50), (x, 0), (x, height)) # Linhas pretas semi-transparentes
     # Desenha as linhas horizontais da grade
-    for y in range(0, HEIGHT, TILE_SIZE):
-        screen.draw.line((0, y), (WIDTH, y), (0, 0, 0, 50))
+    for y in range(0, height, TILE_SIZE):
+        pygame.draw.line(surface, (0, 0, 0, 50), (0, y), (width, y))
+    # Névoa de guerra: preto onde nunca foi visto, escurecido onde foi visto mas está fora da visão
+    if fov is not None:
+        for tile_y in range(tiles_y):
+            for tile_x in range(tiles_x):
+                if fov.is_visible(first_x + tile_x, first_y + tile_y):
+                    continue
+                rect = (tile_x * TILE_SIZE, tile_y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                if fov.is_explored(first_x + tile_x, first_y + tile_y):
+                    surface.fill(REMEMBERED_SHADE, rect, special_flags=pygame.BLEND_MULT)
+                else:
+                    surface.fill(UNSEEN_COLOR, rect)
+    return surface
+
+
+background_chunks = ChunkSurfaces(CHUNK_SIZE * TILE_SIZE, render_background_chunk)
+
+
+def draw_background(surface):
+    """Copia para a tela os chunks de fundo visíveis."""
+    if world.grid_width * TILE_SIZE < camera.view_width or world.grid_height * TILE_SIZE < camera.view_height:
+        surface.fill(BACKGROUND_COLOR if fov is None else UNSEEN_COLOR) # O mundo não cobre a tela inteira: completa a borda
+    background_chunks.draw(surface, camera, math.ceil(world.grid_width / CHUNK_SIZE),
+                           math.ceil(world.grid_height / CHUNK_SIZE), map_cache_key())
+
+
+def draw_items(surface):
+    """Desenha a chave (se ainda não foi coletada) e a porta, se estiverem na área visível e à vista do jogador."""
+    for item in (world.key, world.door):
+        if item and in_view(item.tile_x, item.tile_y) and seen(item.tile_x, item.tile_y):
+            item.draw(camera.offset)
+
+
+def visible_enemies():
+    """Inimigos dos chunks que aparecem na tela e à vista do jogador; os demais chunks nem são visitados."""
+    enemies = world.enemy_chunks.in_tiles(*view_tiles)
+    if fov is None:
+        return enemies
+    return [enemy for enemy in enemies if fov.is_visible(enemy.current_tile_x, enemy.current_tile_y)]
+
+
+def draw_actors(surface):
+    """Desenha o jogador e os inimigos visíveis."""
+    offset = camera.offset
+    world.player.draw(offset)
+    for enemy in visible_enemies():
+        enemy.draw(offset)
+
+
+HUD_POS = (10, 10) # Canto superior esquerdo do texto do HUD
+HUD_FONTSIZE = 30
+
+
+def hud_text():
+    """Retorna o texto e a cor do HUD que indica se o jogador já tem a chave."""
+    if world.player_has_key:
+        return "CHAVE: PEGA!", "yellow"
+    return "CHAVE: FALTA", "white"
+
+
+def draw_hud(surface):
+    """HUD que indica se o jogador já tem a chave."""
+    text, color = hud_text()
+    text_cache.draw(surface, text, HUD_POS, color=color, fontsize=HUD_FONTSIZE) # Re-renderizado só quando a chave é pega
+
+
+def map_cache_key():
+    """Chave de cache do fundo: muda quando o mundo troca de tamanho, de fase ou de mapa."""
+    return (world.grid_width, world.grid_height, world.level, world.map_version)
+
+
+# Camadas da cena PLAYING, de trás para frente.
+playing_layers = Compositor()
+playing_layers.add_layer("background", draw_background) # Chunks em cache, copiados conforme a câmera
+playing_layers.add_layer("items", draw_items)
+playing_layers.add_layer("actors", draw_actors)
+playing_layers.add_layer("hud", draw_hud)
+
+# Modo opcional de "retângulos sujos" (settings.DIRTY_RECTS): só as regiões que mudaram são redesenhadas.
+dirty_tracker = DirtyRectTracker()
+hud_rects = {} # Texto do HUD -> retângulo ocupado na tela (medido uma única vez por texto)
+last_drawn_state = None # Cena desenhada no frame anterior; trocar de cena exige um redesenho completo
+last_view_key = None # Câmera e mapa do frame anterior; se mudarem, o fundo inteiro se deslocou
+
+
+def actor_rect(actor):
+    """Retângulo (em pixels inteiros) ocupado pelo Actor, com 1 pixel de folga para arredondamentos."""
+    return Rect(int(actor.left), int(actor.top), int(actor.width) + 1, int(actor.height) + 1)
+
+
+def track_dirty_regions():
+    """Registra onde estão (e como estão) todos os elementos da cena PLAYING neste frame."""
+    offset = camera.offset
+    for entity in [world.player, world.key, world.door, *visible_enemies()]:
+        if entity and entity.actor:
+            entity.sync_actor(offset) # Inimigos do backend NumPy só atualizam o Actor na hora de desenhar
+            dirty_tracker.track(id(entity), actor_rect(entity.actor), entity.actor.image)
+
+    text, color = hud_text()
+    if text not in hud_rects:
+        hud_rects[text] = ptext.getsurf(text, fontsize=HUD_FONTSIZE).get_rect(topleft=HUD_POS)
+    dirty_tracker.track("hud", hud_rects[text], text)
+
+
+def draw_playing_dirty():
+    """Desenha a cena PLAYING redesenhando apenas as regiões sujas, sem limpar a tela."""
+    global last_view_key
+    surface = screen.surface
+    view_key = (camera.offset, map_cache_key(), fov and fov.version)
+    if view_key != last_view_key: # A câmera andou, o mapa ou a névoa mudaram: a tela inteira mudou
+        dirty_tracker.invalidate()
+        last_view_key = view_key
+    track_dirty_regions()
+    playing_layers.draw_regions(surface, dirty_tracker.collect(surface.get_rect()))
 
 # Explicação da Decisão:
-# - Uma função separada para 'draw_grid' mantém o código de desenho organizado.
-# - A grade visual é essencial para reforçar a mecânica de movimento baseada em tiles do Roguelike,
-#   ajudando o jogador a entender o espaço do jogo.
+# - Uma função por camada mantém o código de desenho organizado, e o compositor define a ordem
+#   (fundo, itens, atores, HUD) em um único lugar.
+# - A grade visual é essencial para reforçar a mecânica de movimento baseada em tiles do Roguelike;
+#   como ela não muda, cada chunk é desenhado uma vez e reaproveitado enquanto o mapa for o mesmo.
+# - Só o que está na área visível é desenhado: os inimigos vêm dos chunks da tela (world.enemy_chunks),
+#   então o custo de desenho depende do que aparece, não do tamanho do mundo.
+# - A névoa de guerra entra no próprio fundo em cache: a visão só é recalculada quando o jogador muda
+#   de tile, e então só os chunks com tiles que mudaram de visibilidade são redesenhados.
+
+
+PROFILER_GRAPH = Rect(WIDTH - 250, 15, 240, 80) # Área do gráfico de tempo de frame (um pixel por frame)
+FRAME_BUDGET = 1 / 60 # Tempo de um frame a 60 FPS; a linha amarela do gráfico
+
+
+def draw_profiler_overlay():
+    """Overlay do profiler (F3): FPS, gráfico do tempo de frame, os trechos mais caros, o gc e os canais de áudio."""
+    if not profiler.enabled:
+        return
+    graph = PROFILER_GRAPH
+    top_spans = profiler.top_spans()
+    screen.draw.filled_rect(Rect(graph.x - 5, graph.y - 5, graph.width + 10, graph.height + 75 + 20 * len(top_spans)),
+                            (0, 0, 0))
+
+    # Uma barra por frame: verde dentro do orçamento de 60 FPS, vermelha acima dele.
+    scale = graph.height / (2 * FRAME_BUDGET) # O topo do gráfico equivale a dois frames (33 ms)
+    for i, frame_time in enumerate(profiler.frame_times()[-graph.width:]):
+        height = min(graph.height, int(frame_time * scale))
+        color = (0, 200, 0) if frame_time <= FRAME_BUDGET else (220, 0, 0)
+        pygame.draw.line(screen.surface, color, (graph.x + i, graph.bottom), (graph.x + i, graph.bottom - height))
+    budget_y = graph.bottom - int(FRAME_BUDGET * scale)
+    pygame.draw.line(screen.surface, (255, 255, 0), (graph.x, budget_y), (graph.right, budget_y))
+
+    screen.draw.text(f"FPS {profiler.fps():.0f}", (graph.x, graph.bottom + 5), color="white", fontsize=22)
+    for i, (name, seconds) in enumerate(top_spans):
+        screen.draw.text(f"{name}: {seconds * 1000:.2f} ms", (graph.x, graph.bottom + 25 + 20 * i),
+                         color="white", fontsize=20)
+    # Coletas do gc desde que o profiler foi ligado, por geração, e a pausa mais longa.
+    gc_stats = profiler.gc.stats()
+    screen.draw.text("GC {}/{}/{}  máx {:.2f} ms".format(*gc_stats["collections"], gc_stats["pause_max_ms"]),
+                     (graph.x, graph.bottom + 25 + 20 * len(top_spans)), color="white", fontsize=20)
+    # Canais de efeitos tocando agora e quantos disparos as regras do AudioManager roubaram, ignoraram ou descartaram.
+    audio_stats = audio.stats
+    screen.draw.text(f"Áudio {audio.active_voices()}/{audio.channel_count}  roubos {audio_stats['stolen']}  "
+                     f"cooldown {audio_stats['debounced']}  descartes {audio_stats['dropped']}",
+                     (graph.x, graph.bottom + 45 + 20 * len(top_spans)), color="white", fontsize=20)
+
+# Explicação da Decisão:
+# - O overlay lê o mesmo buffer circular que o arquivo de trace (F4), então o que aparece na tela
+#   e o que é analisado depois no Chrome/Perfetto são os mesmos números.
+# - Desligado, ele custa apenas um 'if'; ligado, força o redesenho completo no modo DIRTY_RECTS,
+#   porque o painel fica por cima de tudo.
+
+
+LOADING_BAR = Rect(WIDTH / 2 - 150, HEIGHT / 2 + 20, 300, 20) # Barra de progresso da tela de carregamento
+
+
+def draw_loading():
+    """Tela de carregamento: título e barra de progresso (só formas e texto, nada que precise de assets)."""
+    screen.fill((30, 30, 30))
+    screen.draw.text(TITLE, center=(WIDTH / 2, 100), color="white", fontsize=70)
+    screen.draw.rect(LOADING_BAR, (150, 150, 150))
+    filled = Rect(LOADING_BAR.x, LOADING_BAR.y, int(LOADING_BAR.width * assets.progress), LOADING_BAR.height)
+    screen.draw.filled_rect(filled, (80, 160, 80))
+    screen.draw.text(f"Carregando... {assets.progress:.0%}", center=(WIDTH / 2, HEIGHT / 2 - 10),
+                     color="white", fontsize=30)
 
 
 def draw():
@@ -620,11 +546,32 @@ def draw():
     Função principal de desenho do jogo.
     Chamada a cada frame para renderizar todos os elementos visuais.
     """
+    global last_drawn_state
+
+    assets.mark_first_frame() # Só o primeiro chamado conta: mede o tempo até a primeira imagem na tela
+
+    if GAME_STATE == "PLAYING":
+        update_camera()
+        update_fog()
+
+    if GAME_STATE == "PLAYING" and settings.DIRTY_RECTS:
+        if last_drawn_state != GAME_STATE or profiler.enabled:
+            dirty_tracker.invalidate() # Vindo de outra cena (ou com o overlay): a tela inteira precisa ser redesenhada
+        last_drawn_state = GAME_STATE
+        with profiler.span("draw_dirty"):
+            draw_playing_dirty()
+        draw_profiler_overlay()
+        return
+    last_drawn_state = GAME_STATE
+
     screen.clear() # Limpa a tela a cada novo frame antes de desenhar.
 
-    if GAME_STATE == "MENU":
+    if GAME_STATE == "LOADING":
+        draw_loading()
+
+    elif GAME_STATE == "MENU":
         screen.fill((30, 30, 30)) # Fundo escuro para o menu
-        screen.draw.text(TITLE, center=(WIDTH / 2, 100), color="white", fontsize=70)
+        text_cache.draw(screen.surface, TITLE, center=(WIDTH / 2, 100), color="white", fontsize=70)
 
         # Atualiza o texto do botão de música ANTES de desenhar para refletir o estado atual
         if music_enabled:
@@ -636,41 +583,27 @@ def draw():
             button.draw() # Desenha cada botão do menu
 
     elif GAME_STATE == "PLAYING":
-        draw_grid() # Desenha a grade de fundo
-
-        if player: # Desenha o jogador apenas se ele existir (ou seja, se o jogo estiver em andamento)
-            player.draw()
-        for enemy in enemies: # Desenha cada inimigo
-            enemy.draw()
-        
-        # Desenhar Chave e Porta ---
-        if key: # Só desenha a chave se ela existir (não foi coletada)
-            key.draw()
-        if door: # Desenha a porta (sempre existe no jogo)
-            door.draw()
-
-        # Opcional: HUD para indicar se tem a chave
-        if player_has_key:
-            screen.draw.text("CHAVE: PEGA!", (10, 10), color="yellow", fontsize=30)
-        else:
-            screen.draw.text("CHAVE: FALTA", (10, 10), color="white", fontsize=30)
+        playing_layers.draw(screen.surface) # Fundo em cache, itens, atores e HUD
 
     elif GAME_STATE == "GAME_OVER":
         screen.fill((50, 0, 0)) # Fundo vermelho escuro para indicar Game Over
-        screen.draw.text("GAME OVER", center=(WIDTH / 2, HEIGHT / 2 - 50), color="white", fontsize=80)
-        screen.draw.text("Press R to Restart or Esc to Menu", center=(WIDTH / 2, HEIGHT / 2 + 50), color="white", fontsize=30)
+        text_cache.draw(screen.surface, "GAME OVER", center=(WIDTH / 2, HEIGHT / 2 - 50), color="white", fontsize=80)
+        text_cache.draw(screen.surface, "Press R to Restart or Esc to Menu", center=(WIDTH / 2, HEIGHT / 2 + 50), color="white", fontsize=30)
 
     # Tela de Vitória ---
     elif GAME_STATE == "VICTORY_SCREEN":
         screen.fill((0, 50, 0)) # Fundo verde para vitória
-        screen.draw.text("OBJETIVO CONCLUÍDO!", center=(WIDTH / 2, HEIGHT / 2 - 50), color="white", fontsize=80)
-        screen.draw.text("Parabéns! Pressione R para Reiniciar ou Esc para o Menu.", center=(WIDTH / 2, HEIGHT / 2 + 50), color="white", fontsize=30)
+        text_cache.draw(screen.surface, "OBJETIVO CONCLUÍDO!", center=(WIDTH / 2, HEIGHT / 2 - 50), color="white", fontsize=80)
+        text_cache.draw(screen.surface, "Parabéns! Pressione R para Reiniciar ou Esc para o Menu.", center=(WIDTH / 2, HEIGHT / 2 + 50), color="white", fontsize=30)
+
+    draw_profiler_overlay()
 
 # Explicação da Decisão:
 # - 'draw()' é responsável por apresentar visualmente o estado atual do jogo.
 # - Utiliza 'GAME_STATE' para decidir qual "tela" deve ser mostrada (menu, jogo, game over),
 #   garantindo que apenas os elementos relevantes sejam desenhados em cada estado.
 # - A ordem de desenho é importante (fundo primeiro, depois objetos, depois texto/HUD).
+# - No modo DIRTY_RECTS a tela não é limpa: as regiões que não mudaram continuam com os pixels do frame anterior.
 
 
 # 7. Funções de Input do Usuário
@@ -685,8 +618,7 @@ def on_mouse_down(pos):
         for button in menu_buttons:
             if button.is_clicked(pos): # Verifica se o clique foi em um botão
                 button.on_click_function() # Chama a função associada ao botão
-                if music_enabled: # Toca um som de clique apenas se a música/sons estiverem ligados
-                    sounds.button_click.play()
+                audio.play("button_click") # Só toca se a música/sons estiverem ligados
     elif GAME_STATE == "GAME_OVER":
         # Poderíamos adicionar botões de "Reiniciar" ou "Menu" aqui também, mas por simplicidade usamos teclas.
         pass
@@ -700,48 +632,110 @@ def on_mouse_down(pos):
 def on_key_down(key):
     """
     Manipula eventos de pressionamento de tecla.
-    'key' é o código da tecla pressionada (ex: keyboard.left, keyboard.r).
+    'key' é o código da tecla pressionada (ex: keys.LEFT, keys.R).
     """
-    # Função simplificada - a lógica principal está no update()
-    pass
+    global GAME_STATE
+
+    if key in MOVE_KEYS: # Setas vão para a fila com o instante do evento, em qualquer tela
+        input_queue.key_down(MOVE_KEYS[key])
+    elif GAME_STATE in ("GAME_OVER", "VICTORY_SCREEN") and key == keys.R:
+        start_game() # Reinicia o jogo (uma vez por pressionamento, mesmo com a tecla segurada)
+    elif GAME_STATE in ("GAME_OVER", "VICTORY_SCREEN") and key == keys.ESCAPE:
+        GAME_STATE = "MENU" # Volta para o menu
+        discard_world() # Jogador, inimigos, chave e porta voltam para os pools
+    elif key == keys.F5 and GAME_STATE == "PLAYING": # Quick-save: fotografia binária do mundo
+        snapshot.save(world, settings.QUICKSAVE_PATH)
+        print(f"Jogo salvo em {settings.QUICKSAVE_PATH}")
+    elif key == keys.F9 and GAME_STATE != "LOADING": # Quick-load: volta ao instante do último quick-save
+        quick_load()
+    elif key == keys.F3: # Liga/desliga o profiler e seu overlay
+        profiler.toggle()
+        print(f"Profiler {'ligado' if profiler.enabled else 'desligado'}")
+    elif key == keys.F4 and profiler.enabled: # Grava os últimos frames para o Chrome/Perfetto
+        frames = profiler.dump_trace(settings.PROFILER_TRACE_PATH)
+        print(f"Trace de {frames} frames gravado em {settings.PROFILER_TRACE_PATH}")
+
+
+
+def quick_load():
+    """Restaura o último quick-save (no mundo atual, se tiver a mesma configuração) e volta para a partida."""
+    global GAME_STATE, world, recorder
+    try:
+        loaded = snapshot.load(settings.QUICKSAVE_PATH, world, actor_factory=actor_pool, pool=entity_pool)
+    except (OSError, ValueError) as e:
+        print(f"Não foi possível carregar {settings.QUICKSAVE_PATH}: {e}")
+        return
+    if loaded is not world: # Configuração diferente: o mundo anterior foi substituído
+        discard_world()
+        world = loaded
+    GAME_STATE = world.outcome or "PLAYING"
+    # A gravação refaz a partida a partir da semente: depois de um quick-load ela não vale mais.
+    recorder = None
+    sim_clock.reset()
+    input_queue.clear()
+    reset_fog() # A fotografia não guarda a névoa: o que foi explorado volta a ser só o que se vê agora
+    dirty_tracker.invalidate()
+    print(f"Jogo carregado de {settings.QUICKSAVE_PATH} (tick {world.tick_count})")
+
+
+def on_key_up(key):
+    """Manipula a soltura de teclas: a seta deixa de estar segurada na fila de entrada."""
+    if key in MOVE_KEYS:
+        input_queue.key_up(MOVE_KEYS[key])
 
 # Explicação da Decisão:
-# - 'on_key_down' é o hook do PgZero para entradas de teclado.
+# - 'on_key_down'/'on_key_up' são os hooks do PgZero para entradas de teclado: cada toque chega uma
+#   vez, com seu instante, mesmo que aconteça no meio de um passo ou de um frame lento.
 # - Oferecer opções de reinício/retorno ao menu após Game Over melhora a jogabilidade e a experiência do usuário.
 
 
 # 8. Função de Inicialização do Aplicativo
 # Esta função é chamada uma vez quando o PgZero inicia o jogo.
 
+def install_sprite_atlas(atlas):
+    """Acabamento do atlas (thread principal): converte a textura, registra os frames e compila as animações."""
+    global sprite_atlas
+    if atlas:
+        atlas.convert()
+        atlas.install(images)
+        sprite_atlas = atlas
+    # As tabelas de animação guardam as imagens já resolvidas (Surfaces do atlas), e não apenas os nomes.
+    set_frame_resolver(images.load)
+    frame_table(player_animations) # Compiladas agora, e não no meio da primeira partida
+    frame_table(enemy_animations)
+
+
+def store_sound(name):
+    """Cria o acabamento que registra um efeito carregado no AudioManager com o nome 'name'."""
+    def finish(sound):
+        audio.add(name, sound)
+    return finish
+
+
+def start_music(_):
+    """Acabamento da música (thread principal): começa a tocar em loop (pausada se o som estiver desligado)."""
+    audio.play_music()
+    print("✅ MÚSICA INICIADA COM SUCESSO!")
+
+
 def on_app_start():
     """
-    Função chamada automaticamente uma vez no início da aplicação PgZero.
+    Função chamada uma vez no início da aplicação PgZero.
+    Só registra os assets e inicia a thread de carregamento: o primeiro frame (tela de
+    carregamento) é desenhado sem esperar nenhum arquivo.
     """
-    print("=== INICIALIZANDO MÚSICA E SONS COM PYGAME.MIXER ===")
-    try:
-        # Inicializar o mixer do pygame
-        pygame.mixer.init()
-        print("Pygame mixer inicializado")
-        
-        # Carregar e tocar a música
-        pygame.mixer.music.load("music/rpg_through_the_white_gates.wav")
-        pygame.mixer.music.set_volume(0.7)
-        pygame.mixer.music.play(-1)  # -1 = loop infinito
-        
-        # Carregar os sons da porta
-        global door_open_sound, door_close_sound
-        door_open_sound = pygame.mixer.Sound("sounds/door-open-close.ogg")
-        door_close_sound = pygame.mixer.Sound("sounds/door-close.ogg")
-        
-        print("✅ MÚSICA E SONS INICIADOS COM SUCESSO!")
-        
-    except Exception as e:
-        print(f"❌ ERRO ao iniciar música/sons: {e}")
-        print("Continuando sem áudio...")
-    
     global music_enabled
     music_enabled = True
 
+    assets.add("atlas", lambda: SpriteAtlas(convert=False) if atlas_available() else None, install_sprite_atlas)
+    # O mixer vem antes dos sons: a thread carrega as tarefas na ordem em que foram registradas.
+    assets.add("mixer", audio.init)
+    assets.add("door_open_sound", lambda: pygame.mixer.Sound("sounds/door-open-close.ogg"), store_sound("door_open"))
+    assets.add("door_close_sound", lambda: pygame.mixer.Sound("sounds/door-close.ogg"), store_sound("door_close"))
+    assets.add("button_click", lambda: sounds.load("button_click"), store_sound("button_click"))
+    assets.add("music", lambda: audio.load_music("music/rpg_through_the_white_gates.wav"), start_music)
+    assets.start()
+
 # REMOVI essa função on_music_end() - pois ela está causando o loop infinito
 # def on_music_end():  # 
 #     if music_enabled:
@@ -750,7 +744,9 @@ def on_app_start():
 
 # Explicação da Decisão:
 # - 'on_app_start' é o lugar perfeito para inicializações que só precisam acontecer uma vez.
-# - Iniciar a música aqui garante que ela toque desde o momento em que o jogo é aberto,
-#   cumprindo o requisito de "Música de fundo".
+# - Ler e decodificar arquivos acontece na thread do AssetManager; a janela mostra a tela de
+#   carregamento desde o primeiro frame, e o menu aparece quando tudo está pronto.
+# - Cada asset é uma tarefa separada: um arquivo faltando (ex: a música) não impede os outros de carregar.
+# - Iniciar a música no acabamento garante que ela toque desde o menu, cumprindo o requisito de "Música de fundo".
 
 on_app_start()
\ No newline at end of file
@@ -0,0 +1,78 @@
+# input_queue.py
+
+# Fila de entrada orientada a eventos para o movimento do jogador.
+# As teclas chegam pelos eventos (on_key_down/on_key_up do PgZero), com o instante em que aconteceram,
+# e a simulação pede UM movimento por tick (next_move):
+#   - um toque feito durante um passo fica guardado (buffer) e vira o próximo passo, em vez de se perder;
+#   - com uma tecla segurada, o jogador continua andando nela (a tecla pressionada por último vence).
+# Não depende do PgZero: a simulação sem janela usa a mesma fila (ver policy()).
+import time
+from collections import deque
+
+from settings import MOVE_BUFFER_SIZE, MOVE_BUFFER_WINDOW
+
+
+class InputQueue:
+    # Toques guardados (direção, instante) e teclas de direção seguradas, em ordem de pressionamento.
+    def __init__(self, buffer_size=MOVE_BUFFER_SIZE, buffer_window=MOVE_BUFFER_WINDOW, clock=time.perf_counter):
+        self.buffer_window = buffer_window
+        self.clock = clock # Relógio dos instantes; na simulação sem janela, o tempo de jogo
+        self.buffered = deque(maxlen=buffer_size) # O deque com 'maxlen' descarta o toque mais antigo
+        self.held = [] # Direções seguradas; a última é a mais recente
+        self.latency = None # Segundos entre o toque e o tick que o usou (último toque consumido)
+
+    def clear(self):
+        """
+        Esquece os toques guardados (ex: ao começar uma partida). As teclas seguradas continuam:
+        elas refletem o teclado, e só mudam com key_up().
+        """
+        self.buffered.clear()
+
+    def key_down(self, direction, timestamp=None):
+        """Registra o pressionamento de uma direção (dx, dy)."""
+        now = self.clock() if timestamp is None else timestamp
+        if direction in self.held:
+            self.held.remove(direction)
+        self.held.append(direction)
+        if self.buffered.maxlen:
+            self.buffered.append((direction, now))
+
+    def key_up(self, direction):
+        """Registra a soltura de uma direção."""
+        if direction in self.held:
+            self.held.remove(direction)
+
+    def next_move(self, moving, now=None):
+        """
+        Movimento para este tick: None enquanto o jogador está no meio de um passo (os toques
+        esperam no buffer); depois, o toque guardado mais antigo ainda válido ou, sem toques,
+        a tecla segurada mais recente.
+        """
+        if moving:
+            return None
+        now = self.clock() if now is None else now
+        buffered = self.buffered
+        while buffered:
+            direction, pressed = buffered.popleft()
+            if now - pressed <= self.buffer_window:
+                self.latency = now - pressed
+                return direction
+        if self.held:
+            return self.held[-1]
+        return None
+
+    def policy(self, world):
+        """
+        Mesmo contrato das políticas de simulation.run_headless(): policy(world) -> (dx, dy) ou None.
+        Passada como 'move' para World.step() (ex: world.step(dt, queue.policy)), é consultada depois
+        do passo do jogador, como no jogo.
+        """
+        return self.next_move(world.player.moving)
+
+# Explicação da Decisão:
+# - Ler o teclado só quando o jogador está parado perdia os toques feitos durante um passo; guardar
+#   o evento com o instante permite executá-lo no primeiro tick livre, sem depender da taxa de quadros.
+# - O movimento é pedido por tick, e não por frame: em um frame lento com vários ticks, o passo
+#   guardado começa no tick exato em que o anterior termina.
+# - A janela de validade evita que um toque antigo (ex: durante um engasgo longo) mova o jogador
+#   muito depois de o usuário ter desistido dele; MOVE_BUFFER_SIZE = 0 desliga o buffer.
@@ -0,0 +1,84 @@
+# placement.py
+
+# Serviço de posicionamento (spawn) de entidades na grade.
+# Mantém um mapa de ocupação (um byte por tile) e sorteia tiles livres que respeitem
+# restrições de distância, como "Manhattan >= 5 do jogador e da chave".
+# Sempre termina: depois de algumas tentativas aleatórias, faz uma varredura completa da grade
+# e, se nenhum tile servir, lança PlacementError com uma mensagem clara.
+import random
+
+SAMPLE_ATTEMPTS = 32 # Tentativas aleatórias antes de partir para a varredura da grade
+
+
+class PlacementError(Exception):
+    """Não existe nenhum tile livre que satisfaça as restrições pedidas."""
+
+
+class Placer:
+    # Sorteia tiles livres em uma grade 'width' x 'height'.
+    def __init__(self, width, height, is_walkable=None, rng=random):
+        self.width = width
+        self.height = height
+        self.is_walkable = is_walkable # Função (x, y) -> bool; None = todos os tiles são caminháveis
+        self.rng = rng
+        self.occupied = bytearray(width * height) # 1 = tile já usado por alguma entidade
+
+    def occupy(self, tile_x, tile_y):
+        """Marca o tile como ocupado (ex: o tile inicial do jogador)."""
+        self.occupied[tile_y * self.width + tile_x] = 1
+
+    def is_free(self, tile_x, tile_y):
+        """Um tile é livre se não está ocupado e é caminhável."""
+        if self.occupied[tile_y * self.width + tile_x]:
+            return False
+        return self.is_walkable is None or self.is_walkable(tile_x, tile_y)
+
+    @staticmethod
+    def satisfies(tile_x, tile_y, far_from):
+        """Verifica as restrições de distância: far_from é uma lista de ((x, y), distância mínima)."""
+        for (other_x, other_y), min_distance in far_from:
+            if abs(tile_x - other_x) + abs(tile_y - other_y) < min_distance:
+                return False
+        return True
+
+    def place(self, far_from=(), occupy=True, attempts=SAMPLE_ATTEMPTS):
+        """
+        Retorna um tile (x, y) livre e que respeite 'far_from', marcando-o como ocupado.
+        1. Sorteio: até 'attempts' tiles aleatórios (caso comum: resolve em 1 ou 2 tentativas).
+        2. Varredura: percorre a grade a partir de um ponto aleatório até achar um tile válido.
+        Lança PlacementError se não houver nenhum.
+        """
+        width, height = self.width, self.height
+        randrange = self.rng.randrange
+        for _ in range(attempts):
+            tile_x = randrange(width)
+            tile_y = randrange(height)
+            if self.is_free(tile_x, tile_y) and self.satisfies(tile_x, tile_y, far_from):
+                return self._take(tile_x, tile_y, occupy)
+
+        # Grade densa ou restrições apertadas: varredura completa, começando em um tile aleatório
+        # para não favorecer sempre o canto superior esquerdo.
+        total = width * height
+        start = randrange(total)
+        for offset in range(total):
+            index = (start + offset) % total
+            tile_x, tile_y = index % width, index // width
+            if self.is_free(tile_x, tile_y) and self.satisfies(tile_x, tile_y, far_from):
+                return self._take(tile_x, tile_y, occupy)
+
+        raise PlacementError(
+            f"Nenhum tile livre em uma grade {width}x{height} satisfaz as distâncias mínimas "
+            f"{[(point, distance) for point, distance in far_from]}."
+        )
+
+    def _take(self, tile_x, tile_y, occupy):
+        if occupy:
+            self.occupy(tile_x, tile_y)
+        return tile_x, tile_y
+
+# Explicação da Decisão:
+# - O mapa de ocupação em 'bytearray' responde "esse tile está livre?" em O(1), em vez de percorrer
+#   a lista de inimigos a cada tentativa, como os antigos loops 'while True' de start_game().
+# - Em grades grandes e pouco ocupadas, o sorteio quase sempre acerta de primeira, então o tempo de
+#   início da fase não cresce com o tamanho do mapa. A varredura só acontece em casos extremos e,
+#   mesmo assim, é limitada ao tamanho da grade: o jogo nunca fica preso tentando para sempre.
@@ -0,0 +1,87 @@
+# pool.py
+
+# Pools de objetos reaproveitados entre partidas: entidades (jogador, inimigos, chave e porta) e os
+# Actors do PgZero que as desenham.
+# Reiniciar a partida (tecla R) não joga fora e recria tudo: World.reset() devolve as entidades da
+# partida anterior ao pool e pega de volta as mesmas, reiniciadas no lugar (Character.reset()).
+# Depois da primeira partida, um reinício não aloca entidades nem Actors novos, então o custo não
+# cresce com as partidas jogadas e o coletor de lixo não encontra uma montanha de objetos soltos.
+#
+# Uso:
+#     actors = ActorPool(Actor)
+#     entities = EntityPool(actors)
+#     world = World(actor_factory=actors, pool=entities)   (o mundo pega e devolve as entidades sozinho)
+
+
+class ActorPool:
+    # Fábrica de Actors com a mesma assinatura da classe Actor (imagem e posição opcional),
+    # que devolve um Actor já existente quando há algum livre.
+    def __init__(self, factory):
+        self.factory = factory # Ex: a classe Actor do PgZero
+        self.free = [] # Actors devolvidos, prontos para outra entidade
+        self.created = 0 # Actors criados pela fábrica (estatística: deve parar de crescer)
+        self.reused = 0 # Actors entregues a partir do pool
+
+    def __call__(self, image, pos=None):
+        if self.free:
+            actor = self.free.pop()
+            actor.image = image # Mesma imagem do cache do PgZero (ou do atlas): não abre arquivo
+            self.reused += 1
+        else:
+            actor = self.factory(image)
+            self.created += 1
+        if pos is not None:
+            actor.pos = pos
+        return actor
+
+    def release(self, actor):
+        """Devolve um Actor que não é mais desenhado por ninguém."""
+        self.free.append(actor)
+
+
+class EntityPool:
+    # Entidades de partidas anteriores, separadas por classe, esperando para serem reiniciadas no lugar.
+    def __init__(self, actors=None):
+        self.actors = actors # ActorPool que recebe os Actors das entidades devolvidas (ou None)
+        self.free = {} # classe -> entidades livres
+        self.created = 0 # Entidades que o pool não tinha e precisaram ser criadas
+        self.reused = 0 # Entidades reiniciadas a partir do pool
+
+    def acquire(self, cls):
+        """Uma entidade livre da classe 'cls' (a ser reiniciada com reset()), ou None se não houver."""
+        free = self.free.get(cls)
+        if free:
+            self.reused += 1
+            return free.pop()
+        self.created += 1
+        return None
+
+    def release(self, entities, reuse=True):
+        """
+        Devolve as entidades de uma partida encerrada; os Actors delas voltam para o ActorPool.
+        Com reuse=False (ex: os EnemyView do backend "numpy", que morrem com o engine), só os Actors são guardados.
+        """
+        actors = self.actors
+        for entity in entities:
+            if entity.actor is not None and actors is not None:
+                actors.release(entity.actor)
+                entity.actor = None
+            if reuse:
+                self.free.setdefault(type(entity), []).append(entity)
+
+    def stats(self):
+        """Contadores do pool (entidades e Actors criados e reaproveitados)."""
+        actors = self.actors
+        return {
+            "entities_created": self.created, "entities_reused": self.reused,
+            "actors_created": actors.created if actors else 0, "actors_reused": actors.reused if actors else 0,
+        }
+
+# Explicação da Decisão:
+# - Reiniciar no lugar (reset()) em vez de recriar mantém o número de objetos vivos estável entre
+#   partidas: sem a avalanche de objetos descartados de uma vez, não há coleta de lixo longa logo
+#   depois do R.
+# - O ActorPool tem a mesma assinatura da classe Actor, então entra como 'actor_factory' sem que as
+#   entidades saibam que há um pool; só o World sabe quando uma partida acabou e devolve tudo.
+# - Os contadores 'created'/'reused' tornam o efeito verificável: depois da primeira partida (com a
+#   mesma quantidade de inimigos), 'created' não cresce mais.
@@ -0,0 +1,193 @@
+# profiler.py
+
+# Profiler de frames embutido: "spans" (trechos) com nome e tempo, guardados em um buffer circular
+# com os últimos PROFILER_FRAMES frames. Serve para:
+#   - o overlay do jogo (F3): FPS, gráfico do tempo de frame e os trechos mais caros;
+#   - um arquivo de trace (F4) que abre no Chrome (chrome://tracing) ou no Perfetto (ui.perfetto.dev).
+#
+# Uso no código:
+#     with profiler.span("enemy_update"):
+#         ...
+# Desligado (o padrão), span() devolve sempre o mesmo objeto vazio: o custo é uma chamada de método.
+# Ligado, cada coleta do coletor de lixo (gc) também vira um span ("gc_gen0", "gc_gen1", "gc_gen2"),
+# e o GcMonitor conta quantas coletas houve e quanto tempo elas pararam o jogo.
+import gc
+import json
+import time
+from collections import deque
+
+from settings import PROFILER_FRAMES
+
+
+class _NullSpan:
+    # Span usado com o profiler desligado: não mede nada.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    # Um trecho medido: guarda o início ao entrar e registra (nome, início, fim) ao sair.
+    __slots__ = ("spans", "name", "start")
+
+    def __init__(self, spans, name):
+        self.spans = spans
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.spans.append((self.name, self.start, time.perf_counter()))
+        return False
+
+
+class GcMonitor:
+    # Pausas do coletor de lixo, medidas pelos gc.callbacks: coletas por geração, objetos liberados e tempo parado.
+    def __init__(self, on_pause=None):
+        self.on_pause = on_pause # Função (geração, início, fim) chamada ao fim de cada coleta, ou None
+        self.running = False
+        self.pause_start = None
+        self.reset()
+
+    def reset(self):
+        """Zera os contadores (ex: depois do aquecimento de um benchmark)."""
+        self.collections = [0, 0, 0] # Coletas por geração (0 = objetos novos, 2 = coleta completa)
+        self.collected = 0 # Objetos inalcançáveis liberados pelas coletas
+        self.pause_total = 0.0 # Segundos parados em coletas
+        self.pause_max = 0.0 # A coleta mais longa, em segundos
+
+    def start(self):
+        """Zera os contadores e começa a medir."""
+        self.reset()
+        if not self.running:
+            gc.callbacks.append(self._callback)
+            self.running = True
+
+    def stop(self):
+        if self.running:
+            gc.callbacks.remove(self._callback)
+            self.running = False
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self.pause_start = time.perf_counter()
+            return
+        if self.pause_start is None: # Começou a medir no meio de uma coleta
+            return
+        start, end = self.pause_start, time.perf_counter()
+        self.pause_start = None
+        generation = info["generation"]
+        self.collections[generation] += 1
+        self.collected += info["collected"]
+        self.pause_total += end - start
+        self.pause_max = max(self.pause_max, end - start)
+        if self.on_pause:
+            self.on_pause(generation, start, end)
+
+    def stats(self):
+        """Resumo das coletas desde start()/reset(), com tempos em milissegundos."""
+        return {
+            "collections": list(self.collections), "collected": self.collected,
+            "pause_total_ms": self.pause_total * 1000, "pause_max_ms": self.pause_max * 1000,
+        }
+
+
+class Profiler:
+    # Buffer circular de frames; cada frame é (início, fim, [(nome, início, fim), ...]).
+    def __init__(self, capacity=PROFILER_FRAMES):
+        self.enabled = False
+        self.frames = deque(maxlen=capacity) # O deque com 'maxlen' descarta sozinho os frames mais antigos
+        self.spans = [] # Spans do frame em andamento
+        self.frame_start = None
+        self.gc = GcMonitor(self._gc_span) # Só mede com o profiler ligado
+
+    def toggle(self):
+        """Liga/desliga o profiler; ao ligar, começa com o buffer vazio."""
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.spans = []
+        self.frame_start = None
+        if self.enabled:
+            self.gc.start()
+        else:
+            self.gc.stop()
+
+    def _gc_span(self, generation, start, end):
+        """Cada coleta entra no frame em andamento como um span, no overlay e no trace."""
+        self.spans.append((f"gc_gen{generation}", start, end))
+
+    def span(self, name):
+        """Context manager que mede o trecho 'name' (não faz nada com o profiler desligado)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self.spans, name)
+
+    def mark_frame(self):
+        """
+        Fecha o frame anterior e abre um novo. Chamado uma vez por frame, sempre no mesmo ponto
+        (início do update), então a duração do frame inclui o desenho, o flip e a espera do relógio.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frames.append((self.frame_start, now, self.spans))
+        self.frame_start = now
+        self.spans = []
+
+    def frame_times(self):
+        """Duração, em segundos, de cada frame do buffer (do mais antigo para o mais recente)."""
+        return [end - start for start, end, _ in self.frames]
+
+    def fps(self):
+        """Média de frames por segundo no buffer."""
+        times = self.frame_times()
+        return len(times) / sum(times) if times and sum(times) else 0.0
+
+    def top_spans(self, count=5, last=60):
+        """Os 'count' trechos com mais tempo médio por frame (em segundos) nos últimos 'last' frames."""
+        frames = list(self.frames)[-last:]
+        totals = {}
+        for _, _, spans in frames:
+            for name, start, end in spans:
+                totals[name] = totals.get(name, 0.0) + end - start
+        ranking = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [(name, total / len(frames)) for name, total in ranking]
+
+    def trace_events(self):
+        """Eventos no formato "Trace Event" do Chrome: um evento completo ("X") por frame e por span."""
+        events = []
+        for index, (start, end, spans) in enumerate(self.frames):
+            events.append({"name": f"frame {index}", "ph": "X", "ts": start * 1e6, "dur": (end - start) * 1e6,
+                           "pid": 0, "tid": 0})
+            for name, span_start, span_end in spans:
+                events.append({"name": name, "ph": "X", "ts": span_start * 1e6,
+                               "dur": (span_end - span_start) * 1e6, "pid": 0, "tid": 0})
+        return events
+
+    def dump_trace(self, path):
+        """Grava o buffer em um arquivo JSON que o Chrome/Perfetto abrem diretamente."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+        return len(self.frames)
+
+
+# Profiler único do jogo, compartilhado pela simulação, pelo compositor e pelo game.py.
+profiler = Profiler()
+
+# Explicação da Decisão:
+# - Com o profiler desligado, span() só testa uma flag e devolve um objeto já existente: nenhuma
+#   alocação e nenhuma leitura de relógio, então os spans podem ficar no código para sempre.
+# - O buffer circular guarda só os últimos frames: ligar o profiler durante horas não consome
+#   memória sem limite, e o trace gravado mostra exatamente os segundos antes do engasgo.
+# - O formato "Trace Event" do Chrome é lido pelo chrome://tracing e pelo Perfetto, que mostram
+#   os spans aninhados em uma linha do tempo, sem precisarmos escrever um visualizador.
+# - As coletas do gc acontecem no meio de qualquer trecho; como spans próprios, um engasgo causado
+#   por elas aparece com nome no trace, e os contadores dizem se a pressão de alocação está estável.
@@ -0,0 +1,261 @@
+# renderer.py
+
+# Compositor de camadas para o desenho do jogo, câmera e cache do fundo por chunks.
+# Cada camada é desenhada na ordem em que foi adicionada (ex: fundo, itens, atores, HUD).
+# O fundo é renderizado por chunks em superfícies fora da tela (offscreen, ChunkSurfaces) e depois
+# apenas copiado (blit) a cada frame; um chunk só é refeito quando a chave do mapa muda ou quando
+# ele é invalidado (ex: tiles que mudaram de visibilidade na névoa de guerra).
+import pygame
+from pgzero import ptext
+
+from profiler import profiler
+from settings import TEXT_CACHE_SIZE
+
+
+class Layer:
+    # Uma camada do compositor: um nome (usado no profiler) e a função que a desenha.
+    def __init__(self, name, draw_function):
+        self.name = name
+        self.span_name = f"draw_{name}" # Nome do trecho no profiler
+        self.draw_function = draw_function # draw_function(surface): desenha a camada na superfície
+        self.visible = True
+
+    def draw(self, target):
+        self.draw_function(target)
+
+
+class Compositor:
+    # Lista ordenada de camadas, desenhadas de trás para frente.
+    def __init__(self):
+        self.layers = []
+
+    def add_layer(self, name, draw_function):
+        """Adiciona uma camada no topo da pilha e a retorna."""
+        layer = Layer(name, draw_function)
+        self.layers.append(layer)
+        return layer
+
+    def draw(self, target):
+        """Desenha todas as camadas visíveis no alvo (normalmente screen.surface)."""
+        for layer in self.layers:
+            if layer.visible:
+                with profiler.span(layer.span_name):
+                    layer.draw(target)
+
+    def draw_regions(self, target, rects):
+        """
+        Redesenha apenas as regiões 'rects' do alvo.
+        O recorte (clip) do Pygame faz com que fundo, sprites e texto só toquem nos pixels dessas regiões.
+        """
+        for rect in rects:
+            target.set_clip(rect)
+            for layer in self.layers:
+                if layer.visible:
+                    layer.draw(target)
+        target.set_clip(None)
+
+# Explicação da Decisão:
+# - O fundo nunca é redesenhado tile a tile a cada frame: a camada "background" só copia (blit) os
+#   chunks já renderizados pelo ChunkSurfaces (abaixo), que guarda cada chunk em cache e o refaz
+#   quando o mapa (ou a névoa de guerra) muda.
+# - Fundo, itens, atores e HUD usam a mesma interface, então a ordem de desenho fica declarada em
+#   um só lugar, e cada camada vira um trecho com nome no profiler.
+
+
+def merge_rects(rects):
+    """Junta retângulos que se sobrepõem, para não redesenhar a mesma área duas vezes."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect.union_ip(merged.pop(i)) # Absorve o vizinho e recomeça a busca
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectTracker:
+    # Guarda, para cada elemento desenhado, o retângulo e o "estado visual" (ex: nome da imagem) do frame anterior.
+    # Um elemento que não se moveu nem mudou de aparência não gera região suja.
+    def __init__(self, full_redraw_ratio=0.5):
+        self.previous = {} # chave -> (retângulo, estado) do último frame desenhado
+        self.current = {} # chave -> (retângulo, estado) do frame atual
+        self.full_redraw = True # O primeiro frame sempre é desenhado por inteiro
+        self.full_redraw_ratio = full_redraw_ratio # Acima desta fração da tela, redesenhar tudo é mais barato
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo frame (ex: troca de cena ou de mapa)."""
+        self.full_redraw = True
+
+    def track(self, key, rect, state=None):
+        """Registra onde um elemento está neste frame e como ele se parece."""
+        self.current[key] = (pygame.Rect(rect), state)
+
+    def collect(self, screen_rect):
+        """
+        Compara o frame atual com o anterior e retorna a lista de regiões a redesenhar.
+        Cada elemento que mudou suja a área antiga (para apagá-lo) e a nova (para desenhá-lo).
+        """
+        previous, current = self.previous, self.current
+        self.previous, self.current = current, {}
+        screen_rect = pygame.Rect(screen_rect)
+
+        if self.full_redraw:
+            self.full_redraw = False
+            return [screen_rect]
+
+        dirty = []
+        for key, old in previous.items():
+            new = current.get(key)
+            if new != old:
+                dirty.append(old[0])
+                if new:
+                    dirty.append(new[0])
+        for key, new in current.items():
+            if key not in previous:
+                dirty.append(new[0])
+
+        dirty = [rect.clip(screen_rect) for rect in merge_rects(dirty)]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > screen_rect.width * screen_rect.height * self.full_redraw_ratio:
+            return [screen_rect]
+        return dirty
+
+# Explicação da Decisão:
+# - Em vez de limpar e repintar os 800x600 pixels a cada frame, só as áreas por onde algo passou
+#   são refeitas. Com poucos sprites de 64x64 se movendo, isso é uma pequena fração da tela.
+# - O "estado" junto do retângulo (nome do frame, texto do HUD) faz com que uma animação parada
+#   no lugar ou um texto que mudou também sejam redesenhados.
+# - Quando a área suja passa de metade da tela, voltamos ao redesenho completo, que nesse caso é mais barato.
+
+
+class Camera:
+    # Janela de visualização sobre o mundo: 'x' e 'y' são o canto superior esquerdo da tela, em pixels do mundo.
+    def __init__(self, view_width, view_height):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self):
+        return self.x, self.y
+
+    def follow(self, target_x, target_y, world_width, world_height):
+        """
+        Centraliza a câmera no alvo (ex: o jogador), sem mostrar nada além das bordas do mundo.
+        Se o mundo for menor que a tela, a câmera fica parada no canto (0, 0).
+        A posição é arredondada para pixels inteiros, para os sprites não "tremerem".
+        """
+        self.x = int(max(0, min(target_x - self.view_width / 2, world_width - self.view_width)))
+        self.y = int(max(0, min(target_y - self.view_height / 2, world_height - self.view_height)))
+
+    def visible_tiles(self, tile_size, margin=0):
+        """Retângulo de tiles [esquerda, direita) x [topo, base) que aparece na tela, com 'margin' tiles de folga."""
+        left = self.x // tile_size - margin
+        top = self.y // tile_size - margin
+        right = (self.x + self.view_width - 1) // tile_size + 1 + margin
+        bottom = (self.y + self.view_height - 1) // tile_size + 1 + margin
+        return left, top, right, bottom
+
+
+class ChunkSurfaces:
+    # Cache de superfícies do fundo, uma por chunk do mapa, desenhadas sob demanda e reaproveitadas.
+    def __init__(self, chunk_pixels, render_chunk, max_chunks=64):
+        self.chunk_pixels = chunk_pixels # Lado de um chunk em pixels
+        self.render_chunk = render_chunk # render_chunk(chunk_x, chunk_y) -> Surface com o fundo do chunk
+        self.max_chunks = max_chunks # Limite de superfícies guardadas (as menos usadas são descartadas)
+        self.surfaces = {} # (chunk_x, chunk_y) -> Surface, da menos para a mais recentemente usada
+        self.key = None
+
+    def invalidate(self):
+        self.surfaces.clear()
+
+    def invalidate_chunks(self, chunks):
+        """Descarta só as superfícies dos chunks (chunk_x, chunk_y) informados (ex: a névoa mudou neles)."""
+        for chunk in chunks:
+            self.surfaces.pop(chunk, None)
+
+    def get(self, chunk_x, chunk_y):
+        """Retorna a superfície do chunk, renderizando-a se necessário."""
+        surface = self.surfaces.pop((chunk_x, chunk_y), None)
+        if surface is None:
+            surface = self.render_chunk(chunk_x, chunk_y)
+            if len(self.surfaces) >= self.max_chunks:
+                del self.surfaces[next(iter(self.surfaces))] # Descarta o chunk usado há mais tempo
+        self.surfaces[(chunk_x, chunk_y)] = surface
+        return surface
+
+    def draw(self, target, camera, columns, rows, key=None):
+        """
+        Copia para o alvo só os chunks que aparecem na tela.
+        'key' identifica o mapa: quando muda, todas as superfícies são refeitas.
+        """
+        if key != self.key:
+            self.invalidate()
+            self.key = key
+        size = self.chunk_pixels
+        first_x, first_y = camera.x // size, camera.y // size
+        last_x = min(columns - 1, (camera.x + camera.view_width - 1) // size)
+        last_y = min(rows - 1, (camera.y + camera.view_height - 1) // size)
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                target.blit(self.get(chunk_x, chunk_y), (chunk_x * size - camera.x, chunk_y * size - camera.y))
+
+# Explicação da Decisão:
+# - Com mundos maiores que a tela, uma única superfície com o fundo inteiro ocuparia memória demais
+#   (um mundo de 1000x1000 tiles teria 64.000x64.000 pixels). Em chunks, só os visíveis existem.
+# - O custo de desenho passa a depender do tamanho da tela (poucos chunks visíveis), e não do mundo.
+# - A câmera trabalha em pixels inteiros: o fundo e os sprites se deslocam juntos, sem frestas.
+
+
+class TextCache:
+    # Superfícies de texto já renderizadas, indexadas por (texto, fonte, tamanho, cor), com descarte LRU.
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = {} # chave -> Surface, da menos para a mais recentemente usada
+        self.hits = 0
+        self.misses = 0 # Cada falta é uma renderização de glifos
+
+    def get(self, text, fontsize, color, fontname=None):
+        """Superfície com o texto, renderizada só na primeira vez (mesma aparência de screen.draw.text)."""
+        key = (text, fontname, fontsize, color)
+        surface = self.surfaces.pop(key, None)
+        if surface is None:
+            self.misses += 1
+            with profiler.span("text_render"): # Só aparece no profiler nos frames em que algum texto mudou
+                surface = ptext.getsurf(text, fontname, fontsize, color=color, cache=False)
+                if pygame.display.get_surface() is not None:
+                    surface = surface.convert_alpha() # Mesmo formato de pixel da tela: o blit fica mais barato
+            if len(self.surfaces) >= self.max_entries:
+                del self.surfaces[next(iter(self.surfaces))] # Descarta o texto usado há mais tempo
+        else:
+            self.hits += 1
+        self.surfaces[key] = surface
+        return surface
+
+    def draw(self, target, text, pos=None, center=None, fontsize=30, color="white", fontname=None):
+        """
+        Desenha o texto com o canto superior esquerdo em 'pos' ou centrado em 'center',
+        arredondando a posição como o ptext do PgZero. Retorna o retângulo ocupado.
+        """
+        surface = self.get(text, fontsize, color, fontname)
+        width, height = surface.get_size()
+        if center is not None:
+            x, y = center[0] - 0.5 * width, center[1] - 0.5 * height
+        else:
+            x, y = pos
+        return target.blit(surface, (int(round(x)), int(round(y))))
+
+# Explicação da Decisão:
+# - screen.draw.text resolve dezenas de opções e monta uma chave grande a cada chamada, mesmo quando o
+#   ptext já tem a superfície; para textos que mudam raramente (título, botões, HUD, telas finais),
+#   guardar a superfície pronta reduz o desenho a um blit.
+# - A renderização continua sendo a do ptext, então o texto fica idêntico ao de antes, pixel a pixel.
+# - O limite de entradas com descarte LRU impede que textos que mudam sempre (ex: contadores) façam o
+#   cache crescer sem fim; textos usados a cada frame nunca são os mais antigos, e ficam.
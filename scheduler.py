@@ -0,0 +1,90 @@
+# scheduler.py
+
+# Escalonador de turnos por energia: uma fila de prioridade (heap) com as entidades paradas,
+# ordenada pelo tick em que cada uma vai agir de novo.
+# Cada entidade acumula energia a cada tick (energy_rate, em energia por tick) e age quando chega a
+# ACTION_COST; o escalonador não soma energia tick a tick: ele calcula de uma vez em que tick a
+# energia vai bastar e só "acorda" a entidade nesse tick. Quanto maior a energia por tick, mais
+# frequentes os turnos (velocidade no estilo roguelike).
+# Entidades "dormindo" saem da fila guardando quantos ticks faltavam, e não custam nada até wake().
+#
+# Contrato das entidades: atributos 'energy_rate' (energia por tick), 'order' (inteiro único e estável,
+# que desempata ações no mesmo tick) e 'next_tick' (preenchido pelo escalonador; None fora da fila).
+#
+# Uso:
+#     scheduler.schedule(enemy, delay_for(enemy.energy_rate))
+#     for enemy in scheduler.pop_due(tick):
+#         enemy.choose_random_move()
+import heapq
+import math
+
+ACTION_COST = 100 # Energia gasta por uma ação (um passo)
+
+
+def delay_for(energy_rate, energy=0.0, cost=ACTION_COST):
+    """Ticks até 'energy' chegar a 'cost' ganhando 'energy_rate' por tick (no mínimo 1)."""
+    return max(1, math.ceil((cost - energy) / energy_rate))
+
+
+def energy_rate_for(interval, dt):
+    """Energia por tick de quem age uma vez a cada 'interval' segundos, com ticks de 'dt' segundos."""
+    return ACTION_COST * dt / interval
+
+
+class Scheduler:
+    # Heap de (tick da próxima ação, ordem, contador, entidade); entradas antigas são ignoradas ao sair.
+    def __init__(self):
+        self.queue = []
+        self.sleeping = {} # entidade -> ticks que faltavam para agir quando ela dormiu
+        self.tick = 0 # Tick atual: schedule() conta o atraso a partir dele
+        self.pushes = 0 # Contador de inserções: só evita comparar entidades dentro das tuplas do heap
+
+    def clear(self, tick=0):
+        self.queue = []
+        self.sleeping = {}
+        self.tick = tick
+
+    def schedule(self, entity, delay):
+        """Agenda a próxima ação da entidade para daqui a 'delay' ticks (substitui um agendamento anterior)."""
+        self.schedule_at(entity, self.tick + delay)
+
+    def schedule_at(self, entity, tick):
+        """Agenda a próxima ação da entidade para o tick 'tick' (ex: ao restaurar uma fotografia)."""
+        entity.next_tick = tick
+        self.pushes += 1
+        heapq.heappush(self.queue, (tick, entity.order, self.pushes, entity))
+
+    def sleep(self, entity):
+        """Faz a entidade dormir: ela sai da fila e guarda quantos ticks faltavam para agir."""
+        remaining = 0 if entity.next_tick is None else max(0, entity.next_tick - self.tick)
+        entity.next_tick = None
+        self.sleeping[entity] = remaining
+
+    def wake(self, entity):
+        """Acorda a entidade: ela volta para a fila com o tempo que faltava (ou age no próximo tick)."""
+        self.schedule(entity, max(1, self.sleeping.pop(entity)))
+
+    def pop_due(self, tick):
+        """
+        Avança até 'tick' e retorna as entidades que agem nele, na ordem (tick, ordem).
+        O custo depende só de quantas ações vencem, não de quantas entidades existem.
+        """
+        self.tick = tick
+        queue = self.queue
+        due = []
+        while queue and queue[0][0] <= tick:
+            when, _, _, entity = heapq.heappop(queue)
+            if entity.next_tick == when: # Senão é uma entrada antiga (reagendada ou dormindo)
+                entity.next_tick = None
+                due.append(entity)
+        return due
+
+# Explicação da Decisão:
+# - Um timer por entidade, somado a cada tick, custa o mesmo para quem vai agir agora e para quem só
+#   age daqui a 3 segundos; com o heap, cada tick só olha o topo da fila e paga apenas pelas ações que vencem.
+# - A remoção preguiçosa (a entrada antiga fica no heap e é ignorada pelo 'next_tick') torna reagendar
+#   O(log n), sem procurar a entidade dentro do heap.
+# - O desempate pelo 'order' da entidade (e não pela ordem de inserção) faz a fila depender só do estado
+#   das entidades: uma fotografia (snapshot.py) reconstrói exatamente a mesma ordem de ações.
+# - Energia por tick em vez de "intervalo": efeitos de velocidade (lentidão, pressa) e ações de custos
+#   diferentes entram na mesma conta, como nos roguelikes clássicos.
@@ -0,0 +1,107 @@
+# settings.py
+
+# Configurações compartilhadas entre o jogo (game.py) e a simulação headless (simulation.py).
+# Este módulo NÃO importa nada do PgZero nem do Pygame, para que a lógica do jogo possa ser
+# importada e executada em máquinas sem tela (CI, servidores, benchmarks).
+
+# 1. Janela e Grade
+WIDTH = 800  # Largura da janela em pixels.
+HEIGHT = 600 # Altura da janela em pixels.
+TITLE = "Simple Roguelike Adventure" # Título que aparecerá na barra da janela.
+
+TILE_SIZE = 64 # Tamanho de cada célula (quadrado) da grade.
+GRID_WIDTH = WIDTH // TILE_SIZE # Quantas células cabem na largura da tela.
+GRID_HEIGHT = HEIGHT // TILE_SIZE # Quantas células cabem na altura da tela.
+
+# Tamanho do mundo em tiles. Pode ser bem maior que a tela: a câmera segue o jogador.
+WORLD_WIDTH = GRID_WIDTH
+WORLD_HEIGHT = GRID_HEIGHT
+
+# 2. Passo Fixo da Simulação
+FIXED_DT = 1.0 / 60.0 # Duração de um "tick" da simulação em segundos (60 ticks por segundo).
+MAX_TICKS_PER_FRAME = 5 # Limite de ticks por frame para evitar a "espiral da morte" em máquinas lentas.
+
+# 3. Desenho
+DIRTY_RECTS = False # Se True, a cena PLAYING redesenha só as regiões que mudaram (máquinas de baixo consumo).
+TEXT_CACHE_SIZE = 64 # Textos renderizados guardados pelo TextCache (os usados há mais tempo são descartados).
+
+# Chunks: blocos de CHUNK_SIZE x CHUNK_SIZE tiles usados para desenhar e atualizar só o que importa.
+CHUNK_SIZE = 8
+ACTIVE_CHUNK_RADIUS = 2 # Chunks a até esta distância (em chunks) do jogador são atualizados a cada tick.
+FAR_CHUNK_INTERVAL = 4 # Chunks mais distantes são atualizados a cada N ticks; 0 = ficam "dormindo".
+
+# 4. Regras de Jogo
+PLAYER_SPEED = 150 # Velocidade do jogador em pixels/segundo.
+ENEMY_SPEED = 100 # Velocidade dos inimigos em pixels/segundo.
+MOVE_EASING = "linear" # Curva do passo entre tiles (tween.py): "linear", "smoothstep" ou "ease_out".
+ENEMY_COUNT = 5 # Quantidade de inimigos criados em start_game().
+ENEMY_MIN_DISTANCE = 3 # Distância Manhattan mínima entre um inimigo e o jogador no spawn.
+ITEM_MIN_DISTANCE = 5 # Distância Manhattan mínima da chave/porta até o jogador (e da porta até a chave).
+ENEMY_BLOCKING = True # Inimigos não entram em um tile já ocupado por outro inimigo.
+ENEMY_BACKEND = "python" # "python" (um objeto por inimigo) ou "numpy" (arrays em enemy_engine.py, para milhares de inimigos).
+ENEMY_BEHAVIOR = "wander" # "wander" (passeio aleatório), "chase" (persegue o jogador) ou "flee" (foge dele).
+FLOW_FIELD_RADIUS = 24 # Alcance, em passos, dos campos de distância da IA (flowfield.py); além dele os inimigos passeiam.
+
+# 5. Caixas de Colisão (largura, altura) em pixels, centradas na posição da entidade.
+# Correspondem ao tamanho do primeiro frame de cada sprite, que era o que o Actor usava para colisão.
+HITBOX_SIZES = {
+    "player": (71, 144),
+    "enemy": (57, 127),
+    "key": (33, 32),
+    "door": (65, 98),
+}
+
+# Explicação da Decisão:
+# - Separar as constantes em um módulo próprio permite que game.py (PgZero) e simulation.py (headless)
+#   usem exatamente os mesmos valores, sem que a simulação precise abrir uma janela.
+# - As caixas de colisão fixas tornam a colisão determinística: antes ela dependia do tamanho do frame
+#   de animação exibido no momento, ou seja, de quando o desenho acontecia.
+
+# 6. Gravação de Partidas (replay.py)
+RECORD_GAMES = True # Grava semente e entradas de cada partida da janela, para reproduzi-la com replay.py.
+RECORDING_PATH = "recordings/last_game.rec" # Arquivo sobrescrito ao fim de cada partida.
+
+# 7. Profiler (profiler.py)
+PROFILER_FRAMES = 240 # Frames guardados no buffer circular do profiler (4 segundos a 60 FPS).
+PROFILER_TRACE_PATH = "profile_trace.json" # Arquivo de trace (Chrome/Perfetto) gravado com F4.
+
+# 8. Inicialização (assets.py)
+STARTUP_LOG = "startup_times.jsonl" # Tempo até o primeiro frame e até os assets ficarem prontos, uma linha por execução.
+
+# 9. Áudio (audio.py)
+AUDIO_CHANNELS = 8 # Canais do mixer reservados para efeitos sonoros (vozes simultâneas no máximo).
+MUSIC_VOLUME = 0.7
+# Regras de cada efeito: 'cooldown' (segundos mínimos entre dois disparos), 'priority' (quem toca
+# por último em um mixer lotado) e 'max_voices' (cópias do mesmo som tocando ao mesmo tempo).
+SOUND_EFFECTS = {
+    "door_open": {"cooldown": 0.5, "priority": 3, "max_voices": 1},
+    "door_close": {"cooldown": 0.4, "priority": 1, "max_voices": 1},
+    "button_click": {"cooldown": 0.05, "priority": 2, "max_voices": 2},
+}
+
+# 10. Entrada (input_queue.py)
+MOVE_BUFFER_SIZE = 1 # Toques de direção guardados durante um passo do jogador (0 = sem buffer, só teclas seguradas).
+MOVE_BUFFER_WINDOW = 0.5 # Segundos que um toque guardado continua válido (um passo do jogador leva ~0,43 s).
+
+# 11. Balanceamento (balance.py)
+BALANCE_MAX_SECONDS = 120 # Tempo de jogo máximo de uma partida automática; depois disso, ela conta como "timeout".
+BALANCE_RESULTS_PATH = "balance_results.jsonl" # Uma linha por partida, gravada assim que ela termina.
+
+# 12. Quick-save (snapshot.py)
+QUICKSAVE_PATH = "saves/quicksave.sav" # Fotografia binária do mundo gravada com F5 e carregada com F9.
+
+# 13. Fases (tilemap.py)
+LEVEL_PATH = None # Fase da janela (paredes e spawns), ex: "levels/level1.map", gerada de levels/level1.txt; None = campo aberto de WORLD_WIDTH x WORLD_HEIGHT, como antes das fases.
+
+# 14. Campo de visão (fov.py)
+FOG_OF_WAR = False # Se True, a cena PLAYING só mostra o que o jogador vê; o que já foi visto fica escurecido (opcional, como DIRTY_RECTS).
+FOV_RADIUS = 6 # Alcance da visão do jogador, em tiles.
+
+# 15. Fases procedurais (dungeon.py)
+PROCEDURAL_LEVEL = False # Se True, cada partida da janela (inclusive ao reiniciar com R) gera uma fase nova em vez de usar LEVEL_PATH.
+DUNGEON_STYLE = "mixed" # "rooms" (salas e corredores), "caves" (cavernas) ou "mixed" (os dois).
+DUNGEON_WIDTH = 80 # Tamanho da fase gerada, em tiles.
+DUNGEON_HEIGHT = 60
+
+# 16. Pools e coleta de lixo (pool.py, profiler.py)
+GC_FREEZE_AFTER_LOADING = True # Se True, o que está vivo ao fim do carregamento (assets, atlas, módulos) sai das coletas completas do gc (gc.freeze()).
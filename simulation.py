@@ -0,0 +1,583 @@
+# simulation.py
+
+# Núcleo headless do jogo: o mundo (World) e o relógio de passo fixo (FixedTimestep).
+# Nada aqui depende do PgZero, de 'screen' ou de 'keyboard'. O game.py apenas traduz o teclado
+# em uma direção de movimento, chama World.step() e desenha o resultado.
+#
+# Uso sem janela (ex: em uma máquina de CI):
+#     python simulation.py --ticks 100000 --enemies 50
+#     python simulation.py --ticks 600 --enemies 10000 --width 400 --height 400 --backend numpy
+#     python simulation.py --ticks 6000 --seed 42 --record partida.rec   (depois: python replay.py partida.rec)
+#     python simulation.py --ticks 6000 --level levels/level1.map
+#     python simulation.py --ticks 6000 --level dungeon:mixed:200x200:7   (fase gerada, ver dungeon.py)
+import hashlib
+import random
+import struct
+import time
+
+from settings import (
+    WORLD_WIDTH, WORLD_HEIGHT, FIXED_DT, MAX_TICKS_PER_FRAME, HITBOX_SIZES,
+    PLAYER_SPEED, ENEMY_SPEED, ENEMY_COUNT, ENEMY_MIN_DISTANCE, ITEM_MIN_DISTANCE, ENEMY_BACKEND,
+    ENEMY_BLOCKING, ENEMY_BEHAVIOR,
+)
+from entities import Player, Enemy, Item, overlaps, player_animations, enemy_animations
+from enemy_engine import EnemyEngine, numpy_available
+from spatial import TileIndex, reach
+from animation import AnimationClock
+from tween import TweenManager
+from pool import EntityPool
+from placement import Placer
+from tilemap import load as load_tilemap, PLAYER_SPAWN, ENEMY_SPAWN, KEY_SPAWN, DOOR_SPAWN
+import dungeon
+from chunks import ChunkGrid
+from flowfield import FlowFields
+from scheduler import Scheduler
+from profiler import profiler
+
+# 1. Eventos
+# World.step() devolve uma lista de eventos (strings) que aconteceram naquele tick.
+# O game.py usa esses eventos para tocar sons e mudar de tela, sem que a simulação conheça o áudio.
+EVENT_PLAYER_CAUGHT = "player_caught" # Um inimigo encostou no jogador
+EVENT_KEY_PICKED = "key_picked" # O jogador pegou a chave
+EVENT_DOOR_LOCKED = "door_locked" # O jogador encostou na porta sem a chave (uma vez por encostada)
+EVENT_DOOR_OPENED = "door_opened" # O jogador abriu a porta com a chave
+
+# Resultado da partida, no mesmo vocabulário do GAME_STATE do game.py.
+OUTCOME_GAME_OVER = "GAME_OVER"
+OUTCOME_VICTORY = "VICTORY_SCREEN"
+
+
+class FixedTimestep:
+    # Converte o 'dt' variável de cada frame em um número inteiro de ticks de duração fixa.
+    def __init__(self, step=FIXED_DT, max_ticks=MAX_TICKS_PER_FRAME):
+        self.step = step # Duração de cada tick em segundos
+        self.max_ticks = max_ticks # Máximo de ticks simulados em um único frame
+        self.accumulator = 0.0 # Tempo acumulado que ainda não virou tick
+
+    def advance(self, frame_dt):
+        """
+        Acumula o tempo do frame e retorna quantos ticks devem ser simulados agora.
+        Se o frame demorou demais (ex: janela arrastada), o excesso é descartado.
+        """
+        self.accumulator += frame_dt
+        ticks = 0
+        while self.accumulator >= self.step and ticks < self.max_ticks:
+            self.accumulator -= self.step
+            ticks += 1
+        if ticks == self.max_ticks and self.accumulator >= self.step:
+            self.accumulator = 0.0 # Descarta o atraso em vez de tentar recuperá-lo
+        return ticks
+
+    def reset(self):
+        """Zera o tempo acumulado (ex: ao iniciar uma nova partida)."""
+        self.accumulator = 0.0
+
+# Explicação da Decisão:
+# - Com passo fixo, o jogador percorre exatamente a mesma trajetória a 30, 60 ou 144 FPS,
+#   e uma simulação headless reproduz fielmente o que acontece na janela.
+# - O limite 'max_ticks' evita a "espiral da morte": se um frame atrasa, não tentamos recuperar
+#   segundos inteiros de simulação de uma vez, o que atrasaria ainda mais o próximo frame.
+
+
+# Backend padrão dos inimigos: o de settings.ENEMY_BACKEND, ou "python" se ele pedir o NumPy e o NumPy
+# não estiver instalado (o jogo abre do mesmo jeito). Um World criado explicitamente com "numpy" falha.
+DEFAULT_BACKEND = ENEMY_BACKEND if ENEMY_BACKEND != "numpy" or numpy_available() else "python"
+if DEFAULT_BACKEND != ENEMY_BACKEND:
+    print("NumPy não instalado: usando o backend 'python' de inimigos (settings.ENEMY_BACKEND pede 'numpy').")
+
+
+def load_level(level):
+    """Abre a fase: um arquivo .map (tilemap.py) ou uma especificação de fase gerada (dungeon.py)."""
+    if dungeon.is_spec(level):
+        return dungeon.from_spec(level)
+    return load_tilemap(level)
+
+
+class World:
+    # Dono de todo o estado de uma partida: jogador, inimigos, chave, porta e a posse da chave.
+    def __init__(self, grid_width=WORLD_WIDTH, grid_height=WORLD_HEIGHT, enemy_count=ENEMY_COUNT,
+                 actor_factory=None, enemy_backend=DEFAULT_BACKEND, enemy_blocking=ENEMY_BLOCKING,
+                 enemy_behavior=ENEMY_BEHAVIOR, seed=None, player_speed=PLAYER_SPEED, enemy_speed=ENEMY_SPEED,
+                 enemy_min_distance=ENEMY_MIN_DISTANCE, item_min_distance=ITEM_MIN_DISTANCE, level=None, pool=None):
+        if enemy_backend == "numpy" and not numpy_available(): # Antes de carregar a fase: falha sem trabalho perdido
+            raise RuntimeError("O backend 'numpy' de inimigos precisa do NumPy instalado (pip install numpy).")
+        # Fase opcional (arquivo .map, ver tilemap.py, ou "dungeon:...", ver dungeon.py): paredes e
+        # marcadores de spawn; o tamanho do mundo passa a ser o da fase. Sem fase, o mundo é um campo aberto de grid_width x grid_height.
+        self.level = level
+        self.tilemap = load_level(level) if level else None
+        if self.tilemap:
+            grid_width, grid_height = self.tilemap.width, self.tilemap.height
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.enemy_count = enemy_count
+        self.actor_factory = actor_factory # Ex: a classe Actor do PgZero (ou um pool.ActorPool); None para rodar sem janela
+        # Entidades reaproveitadas entre partidas (pool.py); um pool compartilhado entre mundos (ex: o do
+        # game.py) também reaproveita as entidades de um World descartado, depois de release().
+        self.pool = pool if pool is not None else EntityPool()
+        self.enemy_backend = enemy_backend # "python" ou "numpy"
+        self.enemy_blocking = enemy_blocking # Se True, um inimigo não entra em um tile já ocupado por outro
+        self.enemy_behavior = enemy_behavior # "wander", "chase" ou "flee"
+        # Regras de balanceamento (padrão: settings.py); o balance.py varia estes valores.
+        self.player_speed = player_speed
+        self.enemy_speed = enemy_speed
+        self.enemy_min_distance = enemy_min_distance
+        self.item_min_distance = item_min_distance
+        self.flow_fields = FlowFields(self) # Campos de distância compartilhados pela IA (perseguir, fugir, chave, porta)
+        self.tile_index = TileIndex() # Índice espacial: tile -> entidades naquele tile
+        self.enemy_chunks = ChunkGrid(grid_width, grid_height) # Inimigos agrupados por chunk (culling e ritmo de atualização)
+        self.animation_clock = AnimationClock() # Relógio único que move todas as animações
+        self.tweens = TweenManager(self.animation_clock) # Passos suaves entre tiles, avaliados pelo mesmo relógio
+        # Backend "python": inimigos parados esperam a vez no escalonador; só os em movimento são visitados a cada tick.
+        self.scheduler = Scheduler()
+        self.moving_enemies = {} # Inimigos em movimento (dicionário usado como conjunto ordenado)
+        self.awake_center = None # Chunk do jogador na última checagem de quem deve acordar
+        self.map_version = 0 # Incrementado sempre que o mapa (terreno) muda; invalida caches de desenho
+        # Gerador de números aleatórios da sessão: toda a aleatoriedade da simulação passa por ele.
+        # Sem semente explícita, ela vem do 'random' global, para que random.seed() continue valendo.
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+
+        self.player = None
+        self.enemies = []
+        self.enemy_engine = None # EnemyEngine quando o backend é "numpy"
+        self.key = None # Item da chave (None depois de coletada)
+        self.door = None # Item da porta
+        self.spawned = [] # Entidades que o mundo pegou do pool nesta partida (devolvidas em release())
+        self.player_has_key = False # Flag booleana: True se o jogador pegou a chave
+        self.outcome = None # None enquanto a partida está em andamento
+        self.touching_door = False # O jogador estava encostado na porta no tick anterior
+        self.tick_count = 0 # Quantos ticks já foram simulados nesta partida
+        self.last_move = None # Direção usada no último tick (já decidida, quando 'move' é uma política); o Recorder grava esta
+
+    def is_walkable(self, tile_x, tile_y):
+        """Verifica se um tile está dentro dos limites do mundo e, com uma fase carregada, se não é parede."""
+        if self.tilemap:
+            return self.tilemap.is_walkable(tile_x, tile_y) # Um acesso à grade de bytes, O(1)
+        return 0 <= tile_x < self.grid_width and 0 <= tile_y < self.grid_height
+
+    def are_walkable(self, tile_x, tile_y):
+        """Versão de is_walkable para arrays NumPy de tiles; retorna um array de booleanos."""
+        if self.tilemap:
+            return self.tilemap.are_walkable(tile_x, tile_y)
+        return (tile_x >= 0) & (tile_x < self.grid_width) & (tile_y >= 0) & (tile_y < self.grid_height)
+
+    def can_enter(self, entity, tile_x, tile_y):
+        """
+        Verifica se a entidade pode entrar no tile: ele precisa ser caminhável e,
+        com o bloqueio ligado, inimigos não entram em tiles já ocupados por outro inimigo.
+        """
+        if not self.is_walkable(tile_x, tile_y):
+            return False
+        if self.enemy_blocking and entity.kind == "enemy":
+            return not self._tile_has_enemy(tile_x, tile_y)
+        return True
+
+    def enemy_step(self, tile_x, tile_y):
+        """
+        Direção (dx, dy) que a IA manda um inimigo no tile seguir, ou None para andar ao acaso.
+        Todos os inimigos leem o mesmo campo de distância, calculado uma vez por tile do jogador.
+        """
+        if self.enemy_behavior == "chase":
+            return self.flow_fields.chase().step(tile_x, tile_y)
+        if self.enemy_behavior == "flee":
+            return self.flow_fields.flee().step(tile_x, tile_y)
+        return None
+
+    def on_tile_changed(self, entity, old_x, old_y, new_x, new_y):
+        """Chamado pelas entidades ao confirmar um novo tile; mantém o índice espacial atualizado."""
+        self.tile_index.move(entity, old_x, old_y, new_x, new_y)
+        if entity.kind == "enemy":
+            self.enemy_chunks.move(entity, old_x, old_y, new_x, new_y)
+
+    def on_step_finished(self, entity):
+        """Chamado quando o tween do passo de um personagem termina (Character.finish_step)."""
+        if entity in self.moving_enemies:
+            self._stop_moving(entity)
+
+    def touching(self, entity, kind):
+        """
+        Percorre as entidades do tipo 'kind' cuja caixa de colisão encosta na da entidade.
+        Só olha os baldes do índice espacial próximos ao tile da entidade.
+        """
+        radius_x, radius_y = reach(entity.hitbox, HITBOX_SIZES[kind])
+        tile_x, tile_y = entity.current_tile_x, entity.current_tile_y
+        for other in self.tile_index.near(tile_x, tile_y, radius_x, radius_y):
+            if other.kind == kind and overlaps(entity, other):
+                yield other
+
+    def _spawn_tiles(self, placer, marker, count, far_from):
+        """
+        Tiles de 'count' entidades: primeiro os marcadores 'marker' da fase (em ordem sorteada),
+        depois o sorteio do Placer com as restrições 'far_from' para as que sobrarem.
+        """
+        tiles = []
+        if self.tilemap:
+            markers = [tile for tile in self.tilemap.markers(marker) if placer.is_free(*tile)]
+            self.rng.shuffle(markers)
+            for tile in markers[:count]:
+                placer.occupy(*tile)
+                tiles.append(tile)
+        while len(tiles) < count:
+            tiles.append(placer.place(far_from))
+        return tiles
+
+    def release(self):
+        """
+        Devolve ao pool as entidades (e os Actors) da partida atual. Chamado por reset() antes de
+        criar a próxima partida, ou por quem vai descartar o mundo (ex: game.start_game()).
+        Os índices, os tweens e o escalonador também são esvaziados: nada no mundo continua apontando
+        para as entidades devolvidas (nem um mundo descartado segura as que o pool já entregou a outro).
+        """
+        if self.enemy_engine: # Os EnemyView morrem com o engine: só os Actors deles são reaproveitados
+            self.pool.release(self.enemies, reuse=False)
+        self.pool.release(self.spawned)
+        self.tile_index.clear()
+        self.enemy_chunks.clear()
+        self.tweens.clear()
+        self.scheduler.clear()
+        self.moving_enemies = {}
+        self.spawned = []
+        self.player = None
+        self.enemies = []
+        self.enemy_engine = None
+        self.key = None
+        self.door = None
+
+    def _spawn(self, cls, *args):
+        """Uma entidade da classe 'cls' reiniciada com 'args': a do pool, se houver, ou uma nova."""
+        entity = self.pool.acquire(cls)
+        if entity is None:
+            entity = cls(*args)
+        else:
+            entity.reset(*args)
+        self.spawned.append(entity)
+        return entity
+
+    def spawn_item(self, kind, image, tile_x, tile_y):
+        """Cria a chave ou a porta no tile (reaproveitando um Item do pool) e a coloca no índice espacial."""
+        item = self._spawn(Item, kind, image, tile_x, tile_y, HITBOX_SIZES[kind], self.actor_factory)
+        self.tile_index.add(item, tile_x, tile_y)
+        return item
+
+    def reset(self, seed=None):
+        """
+        Recria o jogador no centro da grade e sorteia inimigos, chave e porta.
+        As entidades da partida anterior são reiniciadas no lugar (pool.py), não recriadas.
+        Com uma fase carregada, os marcadores dela definem onde cada um nasce (o que faltar é sorteado).
+        Substitui a antiga lógica de spawn de start_game().
+        Cada partida tem sua própria semente ('seed'): a informada, ou a próxima do gerador do mundo
+        na segunda partida em diante. A mesma semente e as mesmas entradas reproduzem a partida.
+        Lança placement.PlacementError se a grade não comportar todas as entidades.
+        """
+        if seed is not None:
+            self.seed = seed
+        elif self.player is not None: # Não é a primeira partida deste mundo: sorteia a próxima semente
+            self.seed = self.rng.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.release()
+        self.player_has_key = False
+        self.outcome = None
+        self.touching_door = False
+        self.tick_count = 0
+        self.animation_clock.time = 0.0 # Como num World novo: tweens e animações da partida contam do zero (o replay parte daí)
+        self.flow_fields.clear()
+        self.awake_center = None
+
+        # Mapa de ocupação: cada tile recebe no máximo uma entidade, e o sorteio sempre termina.
+        placer = Placer(self.grid_width, self.grid_height, self.is_walkable, self.rng)
+
+        # Cria a instância do jogador no marcador da fase ou no centro da grade (se o centro for parede, sorteia)
+        player_tile = (self.grid_width // 2, self.grid_height // 2)
+        if self.tilemap:
+            markers = self.tilemap.markers(PLAYER_SPAWN)
+            if markers:
+                player_tile = markers[0]
+            elif not self.is_walkable(*player_tile):
+                player_tile = placer.place(occupy=False)
+        self.player = self._spawn(Player, *player_tile, self.player_speed, player_animations, self, self.actor_factory)
+        player = self.player
+        self.tile_index.add(player, player.current_tile_x, player.current_tile_y)
+        placer.occupy(*player_tile)
+
+        # Inimigos não nascem muito próximos do jogador (distância Manhattan, em tiles)
+        enemy_tiles = self._spawn_tiles(placer, ENEMY_SPAWN, self.enemy_count, [(player_tile, self.enemy_min_distance)])
+        self._create_enemies(enemy_tiles)
+
+        # Chave em um tile livre, longe do jogador; como os inimigos ocupam seus tiles, ela nunca nasce sobre um.
+        key_tile_x, key_tile_y = self._spawn_tiles(placer, KEY_SPAWN, 1, [(player_tile, self.item_min_distance)])[0]
+        self.key = self.spawn_item("key", "key", key_tile_x, key_tile_y)
+
+        # Porta em um tile livre, longe da chave e do jogador inicial.
+        door_tile_x, door_tile_y = self._spawn_tiles(placer, DOOR_SPAWN, 1,
+                                                     [(player_tile, self.item_min_distance),
+                                                      ((key_tile_x, key_tile_y), self.item_min_distance)])[0]
+        self.door = self.spawn_item("door", "door-closed", door_tile_x, door_tile_y) # Porta começa fechada
+
+    def _create_enemies(self, enemy_tiles):
+        """Cria os inimigos nos tiles sorteados, no backend escolhido."""
+        if self.enemy_backend == "numpy":
+            self.enemy_engine = EnemyEngine(self, enemy_tiles, self.enemy_speed, enemy_animations,
+                                            seed=self.rng.getrandbits(32))
+            self.enemies = self.enemy_engine.views(self.actor_factory)
+        else:
+            self.enemies = [self._spawn(Enemy, tile_x, tile_y, self.enemy_speed, enemy_animations,
+                                        self, self.actor_factory)
+                            for tile_x, tile_y in enemy_tiles]
+            for order, enemy in enumerate(self.enemies):
+                enemy.order = order
+                self.scheduler.schedule(enemy, enemy.action_delay())
+        for enemy, (tile_x, tile_y) in zip(self.enemies, enemy_tiles):
+            self.tile_index.add(enemy, tile_x, tile_y)
+            self.enemy_chunks.add(enemy, tile_x, tile_y)
+
+    def _tile_has_enemy(self, tile_x, tile_y):
+        """Verifica se algum inimigo ocupa o tile (consulta um único balde do índice)."""
+        for entity in self.tile_index.at(tile_x, tile_y):
+            if entity.kind == "enemy":
+                return True
+        return False
+
+    def _update_player(self):
+        """Passo suave do jogador: o tween dele no instante atual (a animação anda sozinha com o relógio)."""
+        self.tweens.update((self.player,))
+
+    def _update_enemies(self, dt):
+        """
+        Avança os inimigos. Em mundos pequenos todos andam a cada tick; em mundos grandes,
+        só os chunks perto do jogador andam a cada tick, e os distantes em rodízio (ver chunks.py).
+        """
+        if not self.enemy_engine:
+            self._update_scheduled_enemies(dt)
+            return
+        player = self.player
+        chunks = self.enemy_chunks
+        engine = self.enemy_engine
+        if chunks.all_active(*chunks.chunk_of(player.current_tile_x, player.current_tile_y)):
+            engine.step(dt) # Backend vetorizado: todos os inimigos avançam de uma vez
+            return
+        due, scale = chunks.due_mask(engine.tile_x, engine.tile_y,
+                                     player.current_tile_x, player.current_tile_y, self.tick_count)
+        engine.step(dt * scale, due)
+
+    def start_moving(self, enemy):
+        """Registra um inimigo que começou um passo (backend "python"); ele sai do escalonador até chegar."""
+        self.moving_enemies[enemy] = None
+
+    def _stop_moving(self, enemy):
+        """O inimigo chegou ao tile: volta para o escalonador, que o acorda no próximo turno."""
+        del self.moving_enemies[enemy]
+        self.scheduler.schedule(enemy, enemy.action_delay())
+
+    def _update_scheduled_enemies(self, dt):
+        """
+        Backend "python": só são visitados os inimigos em movimento e os que o escalonador acorda neste tick;
+        os parados não custam nada até a vez deles. Em mundos grandes, quem anda nos chunks distantes não tem
+        a posição avaliada (só a chegada), e quem está em um chunk dormindo (FAR_CHUNK_INTERVAL = 0) dorme no escalonador.
+        """
+        player = self.player
+        chunks = self.enemy_chunks
+        scheduler = self.scheduler
+        tick = self.tick_count
+        scheduler.tick = tick
+        center = chunks.chunk_of(player.current_tile_x, player.current_tile_y)
+        all_active = chunks.all_active(*center)
+        if center != self.awake_center: # O jogador mudou de chunk: acorda quem ficou perto dele
+            self.awake_center = center
+            for enemy in [enemy for enemy in scheduler.sleeping
+                          if all_active or not chunks.sleeping(enemy.current_tile_x, enemy.current_tile_y, *center)]:
+                scheduler.wake(enemy)
+
+        # 1. Quem está andando perto do jogador avança (um lote de tweens); ao chegar, o tween avisa
+        #    on_step_finished(), e o inimigo fica parado na fila do escalonador. Nos chunks distantes só
+        #    a chegada importa: a fila de chegadas dos tweens os termina no tick certo, sem avaliá-los.
+        if all_active:
+            self.tweens.update(list(self.moving_enemies))
+        else:
+            self.tweens.update([enemy for enemy in chunks.near(*center) if enemy.moving])
+            self.tweens.finish_due()
+
+        # 2. Só os inimigos cuja vez chegou escolhem um movimento
+        for enemy in scheduler.pop_due(tick):
+            if not all_active and chunks.sleeping(enemy.current_tile_x, enemy.current_tile_y, *center):
+                scheduler.sleep(enemy) # Age quando o jogador se aproximar do chunk
+                continue
+            enemy.choose_random_move()
+            if enemy.moving:
+                self.start_moving(enemy)
+            else:
+                scheduler.schedule(enemy, enemy.action_delay()) # Tile bloqueado: tenta de novo no próximo turno
+
+    def state_hash(self):
+        """
+        Resumo (hash) do estado da partida: tick, jogador, inimigos, chave e porta.
+        Duas execuções com a mesma semente e as mesmas entradas devem ter o mesmo hash a cada tick;
+        o replay (replay.py) compara esses hashes para achar o primeiro tick em que elas divergem.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        player = self.player
+        digest.update(struct.pack("<q2d2i?", self.tick_count, player.x, player.y,
+                                  player.current_tile_x, player.current_tile_y, self.player_has_key))
+        if self.enemy_engine:
+            engine = self.enemy_engine
+            for array in (engine.x, engine.y, engine.tile_x, engine.tile_y, engine.move_timer):
+                digest.update(array.tobytes())
+        else:
+            sleeping = self.scheduler.sleeping
+            for enemy in self.enemies:
+                next_tick = -1 if enemy.next_tick is None else enemy.next_tick
+                digest.update(struct.pack("<2d2q2i", enemy.x, enemy.y, next_tick, sleeping.get(enemy, -1),
+                                          enemy.current_tile_x, enemy.current_tile_y))
+        for item in (self.key, self.door):
+            if item:
+                digest.update(f"{item.kind}:{item.image}:{item.tile_x}:{item.tile_y};".encode())
+        digest.update(str(self.outcome).encode())
+        return digest.hexdigest()
+
+    def step(self, dt=FIXED_DT, move=None):
+        """
+        Avança a simulação em um tick.
+        'move' é a direção pedida pelo jogador, (dx, dy) em tiles, ou None; ou uma política
+        move(world) -> (dx, dy) ou None (ex: InputQueue.policy), chamada depois que o passo do jogador
+        foi avançado neste tick, para que o próximo passo comece no mesmo tick em que o anterior termina.
+        Retorna a lista de eventos que aconteceram neste tick.
+        """
+        events = []
+        if self.outcome or not self.player:
+            return events # Partida encerrada: nada mais se move
+        self.last_move = None
+        self.tick_count += 1
+        self.animation_clock.advance(dt)
+        player = self.player
+
+        with profiler.span("player_update"):
+            self._update_player()
+
+        with profiler.span("enemy_update"):
+            self._update_enemies(dt)
+
+        # Colisão entre jogador e inimigos: só os inimigos dos tiles vizinhos são testados
+        with profiler.span("collision"):
+            caught = next(self.touching(player, "enemy"), None)
+        if caught:
+            self.outcome = OUTCOME_GAME_OVER
+            events.append(EVENT_PLAYER_CAUGHT)
+            return events # Sai imediatamente para evitar mais lógica de jogo após o game over
+
+        # Lógica da Chave e da Porta
+        if self.key and not self.player_has_key:
+            key = next(self.touching(player, "key"), None)
+            if key:
+                self.player_has_key = True
+                self.tile_index.remove(key, key.tile_x, key.tile_y)
+                self.key = None # Remove a chave do mundo (não será mais desenhada)
+                events.append(EVENT_KEY_PICKED)
+
+        touching_door = bool(self.door and next(self.touching(player, "door"), None))
+        if touching_door:
+            if self.player_has_key:
+                if self.door.image == "door-closed": # Evita abrir (e tocar o som) mais de uma vez
+                    self.door.set_image("door-open")
+                    self.outcome = OUTCOME_VICTORY
+                    events.append(EVENT_DOOR_OPENED)
+            elif not self.touching_door: # Só no tick em que o jogador encosta, não a cada tick encostado
+                events.append(EVENT_DOOR_LOCKED)
+        self.touching_door = touching_door
+
+        # Movimento pedido pelo jogador: só inicia um novo passo se não estiver em transição.
+        if callable(move): # A política vê o tick inteiro, com o passo que terminou agora já concluído
+            move = move(self)
+        self.last_move = move
+        if move and not player.moving:
+            dx, dy = move
+            player.move_to_tile(player.current_tile_x + dx, player.current_tile_y + dy)
+
+        return events
+
+# Explicação da Decisão:
+# - 'World' reúne o estado que antes estava espalhado em variáveis globais do game.py,
+#   então várias partidas podem existir ao mesmo tempo (útil para testes e benchmarks).
+# - 'step' recebe a entrada como dado (uma direção) em vez de ler o teclado,
+#   o que permite dirigir o jogo por scripts, gravações ou IA. Uma política passada no lugar da direção
+#   é consultada depois do passo do jogador: lida antes, ela ainda o veria andando no tick em que ele
+#   chega, e uma tecla segurada deixaria um tick parado em cada tile.
+# - Os eventos retornados substituem os 'print' e sons que antes ficavam misturados à lógica.
+# - Colisões, coleta da chave e a porta consultam o 'tile_index' em vez de percorrer todas as
+#   entidades, então o custo por tick depende da vizinhança do jogador, não do total de inimigos.
+# - Em mundos maiores que a tela, os inimigos distantes do jogador são atualizados com menos frequência
+#   (ou dormem), então o custo por tick depende do que está perto do jogador, não do tamanho do mundo.
+# - No backend "python", inimigos parados ficam no escalonador (scheduler.py) até a vez deles: o custo
+#   por tick acompanha a quantidade de inimigos andando ou agindo, não a população.
+# - Com uma fase carregada, "dá para andar aqui?" é um acesso à grade de bytes do tilemap: o movimento,
+#   o spawn e os campos de distância da IA passam a respeitar as paredes sem nenhuma estrutura nova.
+
+
+def run_headless(ticks, enemy_count=ENEMY_COUNT, grid_width=WORLD_WIDTH, grid_height=WORLD_HEIGHT, policy=None,
+                 enemy_backend=DEFAULT_BACKEND, seed=None, level=None):
+    """
+    Simula 'ticks' ticks sem janela, reiniciando a partida sempre que ela termina.
+    'policy' é uma função opcional policy(world) -> (dx, dy) ou None que controla o jogador.
+    Retorna o mundo final e a quantidade de partidas jogadas.
+    """
+    world = World(grid_width, grid_height, enemy_count, enemy_backend=enemy_backend, seed=seed, level=level)
+    world.reset()
+    games = 1
+    for _ in range(ticks):
+        if world.outcome:
+            world.reset()
+            games += 1
+        move = policy(world) if policy else None
+        world.step(FIXED_DT, move)
+    return world, games
+
+
+def random_policy(world):
+    """
+    Política simples de teste: anda em uma direção aleatória sempre que está parado.
+    Usa o 'random' global, e não world.rng: a entrada do jogador não pode consumir números
+    do gerador da simulação, senão um replay (que só repete as entradas) sairia de sincronia.
+    """
+    if world.player.moving:
+        return None
+    return random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Executa a simulação do jogo sem janela.")
+    parser.add_argument("--ticks", type=int, default=60000, help="Quantidade de ticks a simular")
+    parser.add_argument("--enemies", type=int, default=ENEMY_COUNT, help="Quantidade de inimigos")
+    parser.add_argument("--width", type=int, default=WORLD_WIDTH, help="Largura do mundo em tiles")
+    parser.add_argument("--height", type=int, default=WORLD_HEIGHT, help="Altura do mundo em tiles")
+    parser.add_argument("--backend", choices=["python", "numpy"], default=DEFAULT_BACKEND,
+                        help="Backend dos inimigos")
+    parser.add_argument("--seed", type=int, default=None, help="Semente da simulação (padrão: aleatória)")
+    parser.add_argument("--record", metavar="ARQUIVO", default=None,
+                        help="Grava a primeira partida (semente e entradas) para reproduzir com replay.py")
+    parser.add_argument("--level", metavar="MAPA", default=None,
+                        help="Fase em tiles (.map, ver tilemap.py, ou dungeon:ESTILO:LxA:SEMENTE, ver dungeon.py); "
+                             "substitui --width/--height")
+    parser.add_argument("--no-player", action="store_true",
+                        help="Jogador parado (mede só o custo dos inimigos)")
+    args = parser.parse_args()
+
+    if args.record:
+        from replay import Recorder
+
+        world = World(args.width, args.height, args.enemies, enemy_backend=args.backend, seed=args.seed,
+                      level=args.level)
+        world.reset()
+        recorder = Recorder(world)
+        while len(recorder.recording) < args.ticks and not world.outcome:
+            recorder.step(FIXED_DT, None if args.no_player else random_policy(world))
+        recorder.recording.save(args.record)
+        print(f"Partida gravada em {args.record}: semente {world.seed}, {len(recorder.recording)} ticks, "
+              f"resultado: {world.outcome}")
+        raise SystemExit
+
+    start = time.perf_counter()
+    _, games = run_headless(args.ticks, args.enemies, args.width, args.height,
+                            policy=None if args.no_player else random_policy, enemy_backend=args.backend,
+                            seed=args.seed, level=args.level)
+    elapsed = time.perf_counter() - start
+    print(f"{args.ticks} ticks em {elapsed:.3f}s ({args.ticks / elapsed:.0f} ticks/s), {games} partidas")
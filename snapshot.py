@@ -0,0 +1,372 @@
+# snapshot.py
+
+# Fotografia (snapshot) binária do mundo inteiro e restauração exata.
+# O formato é versionado e compacto: um cabeçalho, os valores do mundo, o estado dos geradores
+# aleatórios e uma tabela de registros de tamanho fixo, um por entidade (ENTITY_RECORD).
+# Restaurar uma fotografia e continuar a simulação dá os mesmos estados (World.state_hash) que a
+# partida original: serve para "voltar no tempo" (rollback, um snapshot por tick) e para quick-save.
+#
+# Layout (little-endian):
+#     HEADER | WORLD_RECORD | LEVEL (tamanho + caminho da fase, UTF-8) | PY_RNG | [NP_RNG, só no backend "numpy"] | jogador (ENTITY_RECORD)
+#     | chave (ITEM_RECORD) | porta (ITEM_RECORD) | ordem dos inimigos (uint32 x N) | inimigos (ENTITY_RECORD x N)
+# A tabela de inimigos fica no fim, em um deslocamento calculável: um save grande pode ser aberto com
+# mmap e lido direto do arquivo (no backend "numpy", como um array sem cópia).
+#
+# Medir o custo por entidade:
+#     python snapshot.py
+import mmap
+import os
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError: # Sem NumPy, os registros são lidos e escritos com struct (mais lento, mesmo formato)
+    np = None
+
+from settings import FIXED_DT
+from simulation import World, OUTCOME_GAME_OVER, OUTCOME_VICTORY
+from entities import tile_center
+from scheduler import energy_rate_for
+from tween import EASING_NAMES
+from replay import world_config
+
+SNAPSHOT_FORMAT = 4 # Versão do layout; muda se qualquer registro mudar
+MAGIC = b"WSNP"
+
+HEADER = struct.Struct("<4sHH") # magic, versão, reservado
+# tick, semente, versão do mapa, relógio de animação, largura, altura, inimigos, backend, comportamento,
+# bloqueio, tem a chave, encostado na porta, resultado, velocidades (jogador, inimigo), distâncias de spawn
+WORLD_RECORD = struct.Struct("<qqIdIIIBB???BddII")
+LEVEL = struct.Struct("<H") # Tamanho, em bytes, do caminho da fase (.map) que vem logo depois; 0 = sem fase
+PY_RNG = struct.Struct("<625I?d") # Estado do random.Random (Mersenne Twister) e o gauss pendente
+NP_RNG = struct.Struct("<16s16sIQ") # Estado do PCG64 do NumPy: state, inc, has_uint32, uinteger
+# x, y, alvo x, alvo y, timer, intervalo, início da animação, início do passo (x, y, instante, duração),
+# tile x, tile y, andando, animação, dormindo, curva do passo
+# No backend "python", o "timer" guarda o tick da próxima ação no escalonador (-1 andando), ou os ticks
+# que faltavam quando o inimigo dormiu; no backend "numpy", o move_timer do EnemyEngine.
+# O passo é o tween em andamento (tween.py); zerado para quem está parado e no backend "numpy".
+ENTITY_RECORD = struct.Struct("<11d2iBB?B")
+ITEM_RECORD = struct.Struct("<?3xiiB3x") # existe, tile x, tile y, imagem
+
+if np is not None:
+    # O mesmo ENTITY_RECORD como tipo estruturado do NumPy (mesmos deslocamentos, 100 bytes).
+    ENTITY_DTYPE = np.dtype({
+        "names": ["x", "y", "target_x", "target_y", "move_timer", "move_interval", "animation_start",
+                  "step_x", "step_y", "step_start", "step_duration",
+                  "tile_x", "tile_y", "moving", "animation_id", "asleep", "easing"],
+        "formats": ["<f8"] * 11 + ["<i4", "<i4", "u1", "u1", "u1", "u1"],
+        "offsets": [0, 8, 16, 24, 32, 40, 48, 56, 64, 72, 80, 88, 92, 96, 97, 98, 99],
+        "itemsize": ENTITY_RECORD.size,
+    })
+
+BACKENDS = ["python", "numpy"]
+BEHAVIORS = ["wander", "chase", "flee"]
+OUTCOMES = [None, OUTCOME_GAME_OVER, OUTCOME_VICTORY]
+ITEM_IMAGES = ["key", "door-closed", "door-open"]
+
+
+def _animation_ids(animations):
+    return {name: i for i, name in enumerate(animations)}
+
+
+def _rng_offset(level_size):
+    """Deslocamento do estado dos geradores: depois do caminho da fase, que tem tamanho variável."""
+    return HEADER.size + WORLD_RECORD.size + LEVEL.size + level_size
+
+
+def _layout(enemy_count, numpy_rng, level_size):
+    """Deslocamentos (jogador, itens, ordem, inimigos) e tamanho total de uma fotografia."""
+    offset = _rng_offset(level_size) + PY_RNG.size + (NP_RNG.size if numpy_rng else 0)
+    player = offset
+    key = player + ENTITY_RECORD.size
+    door = key + ITEM_RECORD.size
+    order = door + ITEM_RECORD.size
+    enemies = order + 4 * enemy_count
+    return player, key, door, order, enemies, enemies + ENTITY_RECORD.size * enemy_count
+
+
+def read_config(data):
+    """
+    Lê o cabeçalho e devolve (semente, configuração do World) sem restaurar nada.
+    Lança ValueError se não for uma fotografia, se a versão for outra ou se o tamanho não bater com o layout.
+    """
+    if len(data) < HEADER.size + WORLD_RECORD.size + LEVEL.size:
+        raise ValueError("Fotografia truncada: o cabeçalho está incompleto.")
+    magic, version, _ = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo não é uma fotografia do mundo.")
+    if version != SNAPSHOT_FORMAT:
+        raise ValueError(f"Formato de fotografia {version} não suportado (esperado {SNAPSHOT_FORMAT}).")
+    fields = WORLD_RECORD.unpack_from(data, HEADER.size)
+    (_, seed, _, _, width, height, enemy_count, backend, behavior, blocking, _, _, _,
+     player_speed, enemy_speed, enemy_distance, item_distance) = fields
+    level_at = HEADER.size + WORLD_RECORD.size
+    level_size, = LEVEL.unpack_from(data, level_at)
+    expected = _layout(enemy_count, BACKENDS[backend] == "numpy", level_size)[-1]
+    if len(data) != expected: # Senão um arquivo cortado no meio da tabela restauraria menos inimigos, sem erro
+        raise ValueError(f"Fotografia truncada ou corrompida: {len(data)} bytes, esperado {expected}.")
+    level = bytes(data[level_at + LEVEL.size:level_at + LEVEL.size + level_size]).decode("utf-8") or None
+    config = {
+        "grid_width": width, "grid_height": height, "enemy_count": enemy_count,
+        "enemy_backend": BACKENDS[backend], "enemy_behavior": BEHAVIORS[behavior], "enemy_blocking": blocking,
+        "player_speed": player_speed, "enemy_speed": enemy_speed,
+        "enemy_min_distance": enemy_distance, "item_min_distance": item_distance, "level": level,
+    }
+    return seed, config
+
+
+def _pack_item(data, offset, item):
+    if item is None:
+        ITEM_RECORD.pack_into(data, offset, False, 0, 0, 0)
+    else:
+        ITEM_RECORD.pack_into(data, offset, True, item.tile_x, item.tile_y, ITEM_IMAGES.index(item.image))
+
+
+def _pack_character(data, offset, character, animation_ids, move_timer=0.0, move_interval=0.0, asleep=False):
+    tween = character.tweens.get(character)
+    step = (tween.start_x, tween.start_y, tween.start_time, tween.duration) if tween else (0.0, 0.0, 0.0, 0.0)
+    ENTITY_RECORD.pack_into(data, offset, character.x, character.y, character.target_x, character.target_y,
+                            move_timer, move_interval, character.animation_start, *step,
+                            character.current_tile_x, character.current_tile_y, character.moving,
+                            animation_ids[character.current_animation_name], asleep,
+                            EASING_NAMES.index(tween.easing) if tween else 0)
+
+
+def capture(world):
+    """Fotografa o mundo: retorna um bytearray com o layout descrito no topo do arquivo."""
+    engine = world.enemy_engine
+    count = len(world.enemies)
+    level = (world.level or "").encode("utf-8")
+    player_at, key_at, door_at, order_at, enemies_at, size = _layout(count, engine is not None, len(level))
+    data = bytearray(size)
+
+    HEADER.pack_into(data, 0, MAGIC, SNAPSHOT_FORMAT, 0)
+    WORLD_RECORD.pack_into(
+        data, HEADER.size, world.tick_count, world.seed, world.map_version, world.animation_clock.time,
+        world.grid_width, world.grid_height, count, BACKENDS.index(world.enemy_backend),
+        BEHAVIORS.index(world.enemy_behavior), world.enemy_blocking, world.player_has_key, world.touching_door,
+        OUTCOMES.index(world.outcome), world.player_speed, world.enemy_speed,
+        world.enemy_min_distance, world.item_min_distance)
+    LEVEL.pack_into(data, HEADER.size + WORLD_RECORD.size, len(level))
+    rng_at = _rng_offset(len(level))
+    data[rng_at - len(level):rng_at] = level
+    _, state, gauss = world.rng.getstate()
+    PY_RNG.pack_into(data, rng_at, *state, gauss is not None, gauss or 0.0)
+    if engine:
+        state = engine.rng.bit_generator.state
+        NP_RNG.pack_into(data, rng_at + PY_RNG.size, state["state"]["state"].to_bytes(16, "little"),
+                         state["state"]["inc"].to_bytes(16, "little"), state["has_uint32"], state["uinteger"])
+
+    _pack_character(data, player_at, world.player, _animation_ids(world.player.animations))
+    _pack_item(data, key_at, world.key)
+    _pack_item(data, door_at, world.door)
+
+    # Ordem dos inimigos no índice de chunks: define quem é atualizado primeiro em mundos grandes,
+    # ou seja, quem consome primeiro os números do gerador; sem ela o rollback sairia de sincronia.
+    position = {id(enemy): i for i, enemy in enumerate(world.enemies)}
+    order = array("I", [position[id(enemy)] for bucket in world.enemy_chunks.index.buckets.values()
+                        for enemy in bucket])
+    data[order_at:enemies_at] = order.tobytes()
+
+    if engine:
+        table = np.frombuffer(data, ENTITY_DTYPE, count, enemies_at) # Escreve direto no bytearray
+        for name in ("x", "y", "target_x", "target_y", "move_timer", "move_interval", "animation_start",
+                     "moving", "animation_id"):
+            table[name] = getattr(engine, name)
+        table["tile_x"] = engine.tile_x
+        table["tile_y"] = engine.tile_y
+        del table
+    elif count:
+        animation_ids = _animation_ids(world.enemies[0].animations)
+        sleeping = world.scheduler.sleeping
+        for i, enemy in enumerate(world.enemies):
+            asleep = enemy in sleeping
+            when = sleeping[enemy] if asleep else -1 if enemy.next_tick is None else enemy.next_tick
+            _pack_character(data, enemies_at + i * ENTITY_RECORD.size, enemy, animation_ids,
+                            when, enemy.move_interval, asleep)
+    return data
+
+
+def _restore_item(world, kind, data, offset):
+    present, tile_x, tile_y, image = ITEM_RECORD.unpack_from(data, offset)
+    item = getattr(world, kind)
+    if not present:
+        setattr(world, kind, None)
+        return None
+    image = ITEM_IMAGES[image]
+    if item is None: # Ex: a chave já tinha sido pega no mundo atual, mas não na fotografia
+        item = world.spawn_item(kind, image, tile_x, tile_y)
+        setattr(world, kind, item)
+    else:
+        item.tile_x, item.tile_y = tile_x, tile_y
+        item.x, item.y = tile_center(tile_x, tile_y)
+        if item.image != image:
+            item.set_image(image)
+    return item
+
+
+def _restore_character(character, record, animation_names):
+    (character.x, character.y, character.target_x, character.target_y, move_timer, move_interval,
+     character.animation_start, step_x, step_y, step_start, step_duration,
+     character.current_tile_x, character.current_tile_y, moving, animation, asleep, easing) = record
+    character.moving = bool(moving)
+    character.current_animation_name = animation_names[animation]
+    character.shown_frame = None # O Actor troca de imagem no próximo desenho
+    if character.moving: # O passo continua do mesmo ponto: o tween é refeito com o instante em que começou
+        character.tweens.restore(character, step_x, step_y, character.target_x, character.target_y,
+                                 step_start, step_duration, EASING_NAMES[easing], character.finish_step)
+    return move_timer, move_interval, asleep
+
+
+def _restore_schedule(world, data, enemies_at, count):
+    """Backend "python": restaura os inimigos e refaz o escalonador (fila, dormindo e quem está andando)."""
+    scheduler = world.scheduler
+    scheduler.clear(world.tick_count)
+    world.moving_enemies = {}
+    world.awake_center = None # A checagem de quem acorda roda de novo no próximo tick
+    animation_names = list(world.enemies[0].animations)
+    records = ENTITY_RECORD.iter_unpack(memoryview(data)[enemies_at:enemies_at + ENTITY_RECORD.size * count])
+    for enemy, record in zip(world.enemies, records):
+        when, enemy.move_interval, asleep = _restore_character(enemy, record, animation_names)
+        enemy.energy_rate = energy_rate_for(enemy.move_interval, FIXED_DT)
+        enemy.next_tick = None
+        if asleep:
+            scheduler.sleeping[enemy] = int(when)
+        elif enemy.moving:
+            world.start_moving(enemy)
+        elif when >= 0:
+            scheduler.schedule_at(enemy, int(when))
+
+
+def restore(data, world=None, actor_factory=None, pool=None):
+    """
+    Restaura uma fotografia ('data': bytes, bytearray, memoryview ou mmap).
+    Se 'world' tiver a mesma configuração, ele é reaproveitado (sem alocar entidades: é o caminho
+    do rollback); senão, um World novo é criado, com as entidades do 'pool' (pool.py), se houver.
+    Retorna o mundo restaurado.
+    """
+    seed, config = read_config(data)
+    if world is None or world_config(world) != config:
+        world = World(seed=seed, actor_factory=actor_factory, pool=pool, **config)
+        world.reset(seed)
+
+    (world.tick_count, world.seed, world.map_version, world.animation_clock.time, _, _, count, _, _, _,
+     world.player_has_key, world.touching_door, outcome, _, _, _, _) = WORLD_RECORD.unpack_from(data, HEADER.size)
+    world.outcome = OUTCOMES[outcome]
+    engine = world.enemy_engine
+    level_size = len((world.level or "").encode("utf-8"))
+    player_at, key_at, door_at, order_at, enemies_at, _ = _layout(count, engine is not None, level_size)
+
+    rng_at = _rng_offset(level_size)
+    *state, has_gauss, gauss = PY_RNG.unpack_from(data, rng_at)
+    world.rng.setstate((3, tuple(state), gauss if has_gauss else None))
+    if engine:
+        np_state, inc, has_uint32, uinteger = NP_RNG.unpack_from(data, rng_at + PY_RNG.size)
+        engine.rng.bit_generator.state = {
+            "bit_generator": "PCG64",
+            "state": {"state": int.from_bytes(np_state, "little"), "inc": int.from_bytes(inc, "little")},
+            "has_uint32": has_uint32, "uinteger": uinteger,
+        }
+
+    player = world.player
+    world.tweens.clear() # Os passos em andamento são os da fotografia, não os do mundo reaproveitado
+    _restore_character(player, ENTITY_RECORD.unpack_from(data, player_at), list(player.animations))
+    _restore_item(world, "key", data, key_at)
+    _restore_item(world, "door", data, door_at)
+
+    if engine:
+        table = np.frombuffer(data, ENTITY_DTYPE, count, enemies_at) # Lê direto do buffer (ou do mmap)
+        for name in ("x", "y", "target_x", "target_y", "move_timer", "move_interval", "animation_start",
+                     "moving", "animation_id"):
+            getattr(engine, name)[:] = table[name]
+        engine.tile_x[:] = table["tile_x"]
+        engine.tile_y[:] = table["tile_y"]
+        del table
+        for view in world.enemies:
+            view.shown_frame = None
+    elif count:
+        _restore_schedule(world, data, enemies_at, count)
+
+    # Índices refeitos a partir das posições, com os inimigos na ordem gravada.
+    order = array("I")
+    order.frombytes(bytes(memoryview(data)[order_at:enemies_at]))
+    world.tile_index.clear()
+    world.enemy_chunks.clear()
+    world.flow_fields.clear()
+    world.tile_index.add(player, player.current_tile_x, player.current_tile_y)
+    enemies = world.enemies
+    if engine: # Ler os arrays de uma vez evita uma propriedade do EnemyView por inimigo
+        tiles_x, tiles_y = engine.tile_x.tolist(), engine.tile_y.tolist()
+    else:
+        tiles_x = [enemy.current_tile_x for enemy in enemies]
+        tiles_y = [enemy.current_tile_y for enemy in enemies]
+    index_add, chunks_add = world.tile_index.add, world.enemy_chunks.add
+    for i in order:
+        index_add(enemies[i], tiles_x[i], tiles_y[i])
+        chunks_add(enemies[i], tiles_x[i], tiles_y[i])
+    for item in (world.key, world.door):
+        if item:
+            world.tile_index.add(item, item.tile_x, item.tile_y)
+    return world
+
+
+def save(world, path):
+    """Grava a fotografia em um arquivo (escreve em um temporário e troca, para nunca deixar um save pela metade)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(capture(world))
+    os.replace(temporary, path)
+
+
+def load(path, world=None, actor_factory=None, pool=None):
+    """Restaura um arquivo de fotografia lendo-o por mmap: a tabela de inimigos não é copiada para a memória antes."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return restore(data, world, actor_factory, pool)
+
+# Explicação da Decisão:
+# - Registros de tamanho fixo (struct) em vez de pickle/JSON: o formato não depende de nomes de
+#   classes, é versionado, e cada inimigo ocupa 100 bytes; o backend "numpy" lê e escreve a tabela
+#   inteira com um tipo estruturado de mesmo layout, sem laço por inimigo.
+# - O passo em andamento é gravado como o tween (ponto e instante de início, duração, curva), não como
+#   a posição a meio caminho: restaurado, ele continua calculando exatamente as mesmas posições.
+# - O estado dos geradores aleatórios entra na fotografia: sem ele, a partida restaurada sortearia
+#   outros movimentos e o rollback não reproduziria o que aconteceu.
+# - Restaurar em um mundo de mesma configuração só sobrescreve valores (nenhum objeto novo), e os
+#   índices espaciais são refeitos das posições: isso é rápido o bastante para rodar a cada tick.
+# - A tabela de inimigos vai no fim do arquivo, com deslocamento calculável: com mmap, o sistema
+#   operacional só lê as páginas que a restauração realmente toca.
+
+
+def benchmark(enemy_counts=(5, 1000, 10000), backends=("python", "numpy"), repeat=20):
+    """Tempo de capture() e restore() por entidade (microssegundos) e tamanho da fotografia."""
+    import time
+
+    rows = []
+    for backend in backends:
+        if backend == "numpy" and np is None:
+            continue
+        for count in enemy_counts:
+            side = max(12, int((count * 4) ** 0.5)) # Mapa com folga para os inimigos
+            world = World(side, side, count, enemy_backend=backend, seed=1)
+            world.reset()
+            for _ in range(30):
+                world.step()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                data = capture(world)
+            save_time = (time.perf_counter() - start) / repeat
+            start = time.perf_counter()
+            for _ in range(repeat):
+                restore(data, world)
+            load_time = (time.perf_counter() - start) / repeat
+            entities = count + 3
+            rows.append((backend, count, len(data), save_time * 1e6 / entities, load_time * 1e6 / entities))
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'backend':>8} {'inimigos':>9} {'bytes':>9} {'salvar (us/ent.)':>17} {'restaurar (us/ent.)':>20}")
+    for backend, count, size, save_us, load_us in benchmark():
+        print(f"{backend:>8} {count:>9} {size:>9} {save_us:>17.2f} {load_us:>20.2f}")
@@ -0,0 +1,81 @@
+# spatial.py
+
+# Índice espacial por tiles: um dicionário de "baldes" (buckets), um para cada tile ocupado,
+# com as entidades cujo tile atual (current_tile_x/current_tile_y) é aquele.
+# Em vez de testar o jogador contra todos os inimigos, consultamos só os baldes vizinhos.
+import math
+
+from settings import TILE_SIZE
+
+
+def reach(hitbox_a, hitbox_b):
+    """
+    Retorna (raio_x, raio_y) em tiles: a maior distância entre os tiles de duas entidades
+    para que suas caixas de colisão ainda possam se encostar.
+    No meio do movimento suave, cada entidade fica a menos de 1 tile do seu tile atual, então os
+    tiles das duas podem estar a menos de (meia soma das caixas em tiles + 2) de distância; o maior
+    inteiro abaixo disso nunca passa de ceil(meia soma / TILE_SIZE) + 1, que é o que somamos: 1 tile
+    de folga no total, não um por entidade.
+    """
+    half_w = (hitbox_a[0] + hitbox_b[0]) / 2
+    half_h = (hitbox_a[1] + hitbox_b[1]) / 2
+    return math.ceil(half_w / TILE_SIZE) + 1, math.ceil(half_h / TILE_SIZE) + 1
+
+
+class TileIndex:
+    # Mapeia (tile_x, tile_y) -> lista de entidades naquele tile.
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0 # Quantidade total de entidades indexadas
+
+    def clear(self):
+        """Remove todas as entidades do índice."""
+        self.buckets.clear()
+        self.count = 0
+
+    def add(self, entity, tile_x, tile_y):
+        """Coloca a entidade no balde do tile."""
+        bucket = self.buckets.get((tile_x, tile_y))
+        if bucket is None:
+            self.buckets[(tile_x, tile_y)] = [entity]
+        else:
+            bucket.append(entity)
+        self.count += 1
+
+    def remove(self, entity, tile_x, tile_y):
+        """Tira a entidade do balde do tile (apagando o balde se ele ficar vazio)."""
+        bucket = self.buckets[(tile_x, tile_y)]
+        bucket.remove(entity)
+        if not bucket:
+            del self.buckets[(tile_x, tile_y)]
+        self.count -= 1
+
+    def move(self, entity, old_x, old_y, new_x, new_y):
+        """Atualiza o índice quando a entidade confirma um novo tile."""
+        if (old_x, old_y) != (new_x, new_y):
+            self.remove(entity, old_x, old_y)
+            self.add(entity, new_x, new_y)
+
+    def at(self, tile_x, tile_y):
+        """Retorna as entidades de um único tile (tupla vazia se não houver nenhuma)."""
+        return self.buckets.get((tile_x, tile_y), ())
+
+    def near(self, tile_x, tile_y, radius_x, radius_y):
+        """Percorre as entidades dos tiles a até 'radius_x'/'radius_y' tiles de distância."""
+        buckets = self.buckets
+        for ty in range(tile_y - radius_y, tile_y + radius_y + 1):
+            for tx in range(tile_x - radius_x, tile_x + radius_x + 1):
+                bucket = buckets.get((tx, ty))
+                if bucket:
+                    yield from bucket
+
+    def __len__(self):
+        return self.count
+
+# Explicação da Decisão:
+# - Um dicionário indexado pelo tile é a estrutura mais simples para uma grade esparsa:
+#   só os tiles ocupados gastam memória, e o mundo pode crescer sem custo extra.
+# - O índice é atualizado apenas quando uma entidade confirma um novo tile (move_to_tile,
+#   choose_random_move), e não a cada tick: entre um tile e outro nada precisa mudar.
+# - 'reach' calcula quantos baldes vizinhos precisam ser olhados a partir das caixas de colisão,
+#   então a consulta continua correta mesmo com sprites mais altos que um tile.
@@ -0,0 +1,9 @@
+# conftest.py
+
+# Os módulos do jogo ficam na raiz do repositório (o 'pgzrun' e os scripts os importam pelo nome);
+# os testes fazem o mesmo.
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
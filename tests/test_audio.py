@@ -0,0 +1,91 @@
+# test_audio.py
+
+# Regras do AudioManager (audio.py): cooldown, limite de vozes por som e roubo de canal por prioridade.
+# Os canais do pygame.mixer são trocados por canais falsos, e o relógio é controlado pelo teste:
+# nada precisa de placa de som.
+from audio import AudioManager
+
+RULES = {
+    "step": {"cooldown": 0.0, "priority": 1, "max_voices": 2},
+    "door": {"cooldown": 0.5, "priority": 5, "max_voices": 1},
+}
+
+
+class FakeChannel:
+    # O mínimo de pygame.mixer.Channel que o AudioManager usa.
+    def __init__(self):
+        self.sound = None
+
+    def play(self, sound):
+        self.sound = sound
+
+    def stop(self):
+        self.sound = None
+
+    def get_busy(self):
+        return self.sound is not None
+
+
+def make_audio(channel_count=3):
+    now = [0.0]
+    audio = AudioManager(channel_count, RULES, clock=lambda: now[0])
+    audio.channels = [FakeChannel() for _ in range(channel_count)]
+    audio.voices = [None] * channel_count
+    for name in RULES:
+        audio.add(name, name)
+    return audio, now
+
+
+def playing(audio):
+    return sorted(voice.name for voice, channel in zip(audio.voices, audio.channels) if voice and channel.get_busy())
+
+
+def test_cooldown_ignores_repeats():
+    audio, now = make_audio()
+    assert audio.play("door")
+    now[0] = 0.3
+    assert not audio.play("door") # Dentro dos 0.5 s do cooldown
+    now[0] = 0.6
+    assert audio.play("door")
+    assert audio.stats["debounced"] == 1
+    assert audio.active_voices() == 1 # A segunda porta roubou o canal da primeira (max_voices 1)
+
+
+def test_voice_cap_steals_the_oldest_copy():
+    audio, now = make_audio()
+    for i in range(3):
+        now[0] = float(i)
+        assert audio.play("step")
+    assert audio.active_voices() == 2 # Sobra um canal livre: o limite é do som, não do mixer
+    assert audio.stats["stolen"] == 1
+    assert sorted(voice.started for voice in audio.voices if voice) == [1.0, 2.0]
+
+
+def test_priority_steals_and_drops():
+    audio, now = make_audio(channel_count=2)
+    audio.play("step")
+    now[0] = 1.0
+    audio.play("step")
+    now[0] = 2.0
+    assert audio.play("door") # Mixer cheio: a porta rouba o passo mais antigo
+    assert playing(audio) == ["door", "step"]
+    assert audio.voices[0].name == "door"
+    assert audio.stats["stolen"] == 1
+
+    audio.voices[1].priority = 9 # Os dois canais agora tocam algo mais importante que um passo
+    now[0] = 3.0
+    assert not audio.play("step")
+    assert audio.stats["dropped"] == 1
+    assert audio.active_voices() == 2
+
+
+def test_finished_channel_is_reused_without_stealing():
+    audio, now = make_audio(channel_count=2)
+    audio.play("step")
+    audio.play("door")
+    audio.channels[0].stop() # O passo terminou de tocar
+    assert audio.active_voices() == 1
+    now[0] = 1.0
+    assert audio.play("step")
+    assert audio.stats["stolen"] == 0
+    assert audio.active_voices() == 2
@@ -0,0 +1,84 @@
+# test_dungeon.py
+
+# Gerador de fases (dungeon.py): todo o piso gerado forma uma região só, alcançável a partir do
+# jogador, com a chave e a porta dentro dela; a rotulação de regiões confere com uma busca em largura.
+from collections import deque
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+import numpy as np
+
+import dungeon
+from simulation import World
+from tilemap import DOOR_SPAWN, KEY_SPAWN, PLAYER_SPAWN
+
+
+def reachable(is_walkable, start):
+    """Tiles alcançáveis a partir de 'start' andando nas quatro direções (busca em largura)."""
+    seen = {start}
+    frontier = deque([start])
+    while frontier:
+        x, y = frontier.popleft()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (nx, ny) not in seen and is_walkable(nx, ny):
+                seen.add((nx, ny))
+                frontier.append((nx, ny))
+    return seen
+
+
+@pytest.mark.parametrize("style", dungeon.STYLES)
+@pytest.mark.parametrize("seed", range(4))
+def test_every_floor_tile_reaches_player_key_and_door(style, seed):
+    level = dungeon.generate(60, 40, style, seed)
+    floor = {(x, y) for y in range(level.height) for x in range(level.width) if level.is_walkable(x, y)}
+    (player,) = level.markers(PLAYER_SPAWN)
+    (key,) = level.markers(KEY_SPAWN)
+    (door,) = level.markers(DOOR_SPAWN)
+    assert reachable(level.is_walkable, player) == floor # Nenhum bolsão isolado
+    assert key in floor and door in floor
+    assert len({player, key, door}) == 3
+    assert dungeon.is_connected(level)
+
+
+def test_regions_match_breadth_first_search():
+    rng = random.Random(5)
+    for _ in range(20):
+        width, height = rng.randint(1, 30), rng.randint(1, 30)
+        floor = np.array([[rng.random() < 0.55 for _ in range(width)] for _ in range(height)])
+        labels = dungeon.regions(floor)
+        tiles = {(x, y) for y in range(height) for x in range(width) if floor[y, x]}
+        assert (labels == -1).sum() == width * height - len(tiles)
+        walkable = lambda x, y: (x, y) in tiles
+        while tiles:
+            region = reachable(walkable, next(iter(tiles)))
+            assert len({int(labels[y, x]) for x, y in region}) == 1 # Uma região, um rótulo...
+            label = int(labels[next(iter(region))[::-1]])
+            assert int((labels == label).sum()) == len(region) # ...que nenhuma outra região usa
+            tiles -= region
+
+
+def test_same_spec_generates_the_same_level():
+    spec = dungeon.level_spec("mixed", 80, 50, 11)
+    assert bytes(dungeon.from_spec(spec).grid) == bytes(dungeon.from_spec(spec).grid)
+    assert bytes(dungeon.from_spec(spec).grid) != bytes(dungeon.generate(80, 50, "mixed", 12).grid)
+
+
+def test_world_on_a_generated_level():
+    for seed in range(3):
+        world = World(level=dungeon.level_spec("caves", 60, 40, seed), enemy_count=20, seed=seed)
+        world.reset(seed)
+        region = reachable(world.is_walkable, (world.player.current_tile_x, world.player.current_tile_y))
+        assert (world.key.tile_x, world.key.tile_y) in region
+        assert (world.door.tile_x, world.door.tile_y) in region
+        assert all((enemy.current_tile_x, enemy.current_tile_y) in region for enemy in world.enemies)
+
+
+def test_invalid_levels_are_rejected():
+    with pytest.raises(ValueError):
+        dungeon.generate(60, 40, "maze", 1)
+    with pytest.raises(ValueError):
+        dungeon.generate(4, 40, "rooms", 1)
+    with pytest.raises(ValueError):
+        dungeon.parse_spec("dungeon:rooms:60:1")
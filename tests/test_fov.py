@@ -0,0 +1,70 @@
+# test_fov.py
+
+# Campo de visão (fov.py): simetria (se A vê B, B vê A), paredes que bloqueiam o que está atrás,
+# o alcance circular e a memória dos tiles explorados.
+import random
+
+from fov import FieldOfView
+
+
+def grid(width, height, walls):
+    """Função is_transparent de uma grade com as paredes em 'walls' (fora do mapa também bloqueia)."""
+    return lambda x, y: 0 <= x < width and 0 <= y < height and (x, y) not in walls
+
+
+def visible_tiles(fov):
+    return {(x, y) for y in range(fov.height) for x in range(fov.width) if fov.is_visible(x, y)}
+
+
+def test_open_field_sees_the_whole_circle():
+    fov = FieldOfView(21, 21, grid(21, 21, set()), radius=6)
+    fov.update(10, 10)
+    assert visible_tiles(fov) == {(x, y) for y in range(21) for x in range(21)
+                                  if (x - 10) ** 2 + (y - 10) ** 2 <= 36}
+
+
+def test_visibility_is_symmetric():
+    width = height = 15
+    rng = random.Random(4)
+    for _ in range(5):
+        walls = {(x, y) for y in range(height) for x in range(width) if rng.random() < 0.2}
+        floors = [(x, y) for y in range(height) for x in range(width) if (x, y) not in walls]
+        sees = {}
+        for origin in floors:
+            fov = FieldOfView(width, height, grid(width, height, walls), radius=6)
+            fov.update(*origin)
+            sees[origin] = visible_tiles(fov) - walls
+        for a in floors:
+            for b in sees[a]:
+                assert a in sees[b], f"{a} vê {b}, mas {b} não vê {a}"
+
+
+def test_wall_blocks_what_is_behind_it():
+    walls = {(5, y) for y in range(11)} # Uma parede de ponta a ponta
+    fov = FieldOfView(11, 11, grid(11, 11, walls), radius=8)
+    fov.update(2, 5)
+    seen = visible_tiles(fov)
+    assert (5, 5) in seen # A parede em si aparece
+    assert not any(x > 5 for x, _ in seen)
+
+
+def test_pillar_casts_a_shadow():
+    walls = {(6, 5)}
+    fov = FieldOfView(15, 11, grid(15, 11, walls), radius=8)
+    fov.update(4, 5)
+    assert fov.is_visible(6, 5)
+    assert not fov.is_visible(7, 5) and not fov.is_visible(10, 5) # Logo atrás do pilar, na mesma linha
+    assert fov.is_visible(7, 3) # Fora da sombra
+
+
+def test_explored_tiles_are_remembered():
+    walls = {(5, y) for y in range(11) if y != 5} # Parede com uma passagem no meio
+    fov = FieldOfView(11, 11, grid(11, 11, walls), radius=3)
+    assert fov.update(1, 5)
+    first = visible_tiles(fov)
+    assert fov.update(1, 5) == [] # Mesma origem: nada é recalculado
+    changed = fov.update(8, 5)
+    assert changed
+    assert not fov.is_visible(1, 5)
+    assert all(fov.is_explored(x, y) for x, y in first)
+    assert {divmod(index, 11)[::-1] for index in changed} == first ^ visible_tiles(fov)
@@ -0,0 +1,122 @@
+# test_input_queue.py
+
+# Fila de entrada (input_queue.py) dirigindo um World sem janela pela mesma política do jogo
+# (InputQueue.policy passada para World.step), com o relógio da fila preso ao relógio do mundo.
+import math
+
+import pytest
+
+from input_queue import InputQueue
+from replay import MOVE_CODES, Recorder, replay
+from settings import FIXED_DT
+from simulation import World
+
+RIGHT, UP, DOWN = (1, 0), (0, -1), (0, 1)
+
+
+def make_world(**queue_args):
+    """Campo de 40 x 9 tiles sem inimigos e uma fila cujo relógio é o tempo de jogo."""
+    world = World(grid_width=40, grid_height=9, enemy_count=0, seed=1)
+    world.reset(1)
+    queue = InputQueue(clock=lambda: world.animation_clock.time, **queue_args)
+    return world, queue
+
+
+def run(world, queue, ticks, step=None):
+    """Avança 'ticks' ticks pela política da fila; devolve os passos começados como (tick, direção)."""
+    step = step or world.step
+    player = world.player
+    started = []
+    for _ in range(ticks):
+        tile = (player.current_tile_x, player.current_tile_y)
+        step(FIXED_DT, queue.policy)
+        tween = world.tweens.get(player)
+        if tween and tween.start_time == world.animation_clock.time: # O passo começou neste tick
+            started.append((world.tick_count, (player.current_tile_x - tile[0], player.current_tile_y - tile[1])))
+    return started
+
+
+def tap(queue, direction):
+    queue.key_down(direction)
+    queue.key_up(direction)
+
+
+def ticks_per_step(world):
+    return math.ceil(world.player.tweens.get(world.player).duration / FIXED_DT - 1e-9)
+
+
+def test_held_key_has_no_gap_between_steps():
+    world, queue = make_world()
+    queue.key_down(RIGHT)
+    started = run(world, queue, 1)
+    period = ticks_per_step(world)
+    for _ in range(10 * period):
+        started += run(world, queue, 1)
+        assert world.player.moving # Nenhum tick parado entre um tile e o próximo
+    ticks = [tick for tick, _ in started]
+    assert [b - a for a, b in zip(ticks, ticks[1:])] == [period] * (len(ticks) - 1)
+    assert {direction for _, direction in started} == {RIGHT}
+
+
+def test_tap_during_step_starts_when_it_ends():
+    world, queue = make_world()
+    tap(queue, RIGHT)
+    started = run(world, queue, 5)
+    period = ticks_per_step(world)
+    tap(queue, DOWN) # No meio do passo: fica guardado
+    started += run(world, queue, 3 * period)
+    assert started == [(1, RIGHT), (1 + period, DOWN)]
+    assert queue.latency == pytest.approx((1 + period - 5) * FIXED_DT)
+    assert not world.player.moving # Sem tecla segurada, o jogador para depois do passo guardado
+
+
+def test_buffered_tap_expires_after_window():
+    world, queue = make_world(buffer_window=0.1)
+    tap(queue, RIGHT)
+    started = run(world, queue, 5)
+    tap(queue, DOWN) # Guardado, mas o passo atual termina depois da janela de 0.1 s
+    started += run(world, queue, 3 * ticks_per_step(world))
+    assert started == [(1, RIGHT)]
+    assert not queue.buffered
+
+
+def test_buffer_disabled():
+    world, queue = make_world(buffer_size=0)
+    tap(queue, RIGHT) # Solta antes do tick: sem buffer, o toque se perde
+    assert run(world, queue, 5) == []
+    queue.key_down(RIGHT)
+    started = run(world, queue, 5)
+    queue.key_up(RIGHT)
+    tap(queue, DOWN)
+    started += run(world, queue, 3 * ticks_per_step(world))
+    assert started == [(6, RIGHT)]
+
+
+def test_buffered_tap_beats_held_key_and_last_held_wins():
+    world, queue = make_world()
+    queue.key_down(RIGHT)
+    queue.clear() # Só a tecla segurada, sem o toque guardado pelo key_down
+    started = run(world, queue, 5)
+    period = ticks_per_step(world)
+    tap(queue, UP)
+    started += run(world, queue, 2 * period)
+    queue.key_down(DOWN) # Segurada junto com a direita: a mais recente vence
+    queue.clear()
+    started += run(world, queue, period)
+    assert [direction for _, direction in started] == [RIGHT, UP, RIGHT, DOWN]
+    assert [tick for tick, _ in started] == [1, 1 + period, 1 + 2 * period, 1 + 3 * period]
+
+
+def test_recorded_policy_replays():
+    world, queue = make_world()
+    recorder = Recorder(world, checkpoint_interval=1)
+    queue.key_down(RIGHT)
+    run(world, queue, 1, recorder.step)
+    period = ticks_per_step(world)
+    run(world, queue, 100, recorder.step)
+    tap(queue, UP)
+    queue.key_up(RIGHT)
+    run(world, queue, 100, recorder.step)
+    inputs = recorder.recording.inputs
+    assert inputs[period] == MOVE_CODES[RIGHT] # Gravada a direção decidida no tick em que o passo terminou
+    assert replay(recorder.recording).state_hash() == world.state_hash()
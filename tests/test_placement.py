@@ -0,0 +1,72 @@
+# test_placement.py
+
+# Serviço de spawn (placement.py): distâncias mínimas sempre respeitadas, cada tile livre usado uma vez
+# e, quando nada serve, PlacementError em vez de um laço infinito.
+import random
+
+import pytest
+
+from placement import Placer, PlacementError
+from simulation import World
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_min_distance_is_respected(seed):
+    placer = Placer(30, 20, rng=random.Random(seed))
+    player = placer.place()
+    far_from = [(player, 8)]
+    tiles = []
+    for _ in range(40): # Muitos tiles: o sorteio passa a errar e a varredura entra em ação
+        tile = placer.place(far_from)
+        tiles.append(tile)
+        assert manhattan(tile, player) >= 8
+    assert len(set(tiles)) == len(tiles)
+
+
+def test_fills_every_free_tile_then_gives_up():
+    walls = {(1, 1), (2, 1)}
+    placer = Placer(4, 3, is_walkable=lambda x, y: (x, y) not in walls, rng=random.Random(3))
+    tiles = {placer.place() for _ in range(4 * 3 - len(walls))}
+    assert tiles == {(x, y) for x in range(4) for y in range(3)} - walls
+    with pytest.raises(PlacementError):
+        placer.place()
+
+
+def test_impossible_distance_raises():
+    placer = Placer(5, 5, rng=random.Random(1))
+    with pytest.raises(PlacementError):
+        placer.place(far_from=[((2, 2), 10)]) # Nenhum tile de uma grade 5x5 fica a 10 passos do centro
+    assert not any(placer.occupied) # Nada foi marcado
+
+
+def test_place_without_occupying():
+    placer = Placer(1, 1, rng=random.Random(1))
+    assert placer.place(occupy=False) == (0, 0)
+    assert placer.place() == (0, 0)
+    with pytest.raises(PlacementError):
+        placer.place()
+
+
+def test_world_spawn_respects_distances():
+    for seed in range(10):
+        world = World(grid_width=30, grid_height=20, enemy_count=20, enemy_min_distance=6, item_min_distance=5,
+                      seed=seed)
+        world.reset(seed)
+        player = (world.player.current_tile_x, world.player.current_tile_y)
+        key = (world.key.tile_x, world.key.tile_y)
+        door = (world.door.tile_x, world.door.tile_y)
+        enemies = [(enemy.current_tile_x, enemy.current_tile_y) for enemy in world.enemies]
+        assert all(manhattan(tile, player) >= 6 for tile in enemies)
+        assert manhattan(key, player) >= 5
+        assert manhattan(door, player) >= 5 and manhattan(door, key) >= 5
+        assert len({player, key, door, *enemies}) == len(enemies) + 3 # Um tile por entidade
+
+
+def test_crowded_world_raises():
+    world = World(grid_width=4, grid_height=4, enemy_count=50, seed=1)
+    with pytest.raises(PlacementError):
+        world.reset(1)
@@ -0,0 +1,152 @@
+# test_pool.py
+
+# Pools de entidades e Actors (pool.py): depois de devolvidas por World.release() (o discard_world()
+# do game.py) ou por um reinício, as entidades voltam inteiramente reiniciadas, iguais às de um mundo
+# novo com a mesma semente, e presas ao mundo novo, não ao anterior.
+import os
+
+import pytest
+
+from pool import ActorPool, EntityPool
+from simulation import World
+
+# Atributos que apontam para o mundo ou para o Actor: conferidos por identidade, não por valor.
+REFERENCES = {"world", "clock", "tweens", "rng", "actor"}
+CONFIG = {"grid_width": 20, "grid_height": 15, "enemy_count": 12, "enemy_behavior": "chase", "enemy_min_distance": 4}
+
+
+class FakeActor:
+    # O mínimo de um Actor do PgZero: imagem e posição.
+    def __init__(self, image, pos=None):
+        self.image = image
+        self.pos = pos
+
+
+def state(entity):
+    """Valores de todos os slots da entidade, menos as referências ao mundo e ao Actor."""
+    names = {name for cls in type(entity).__mro__ for name in getattr(cls, "__slots__", ())}
+    return {name: getattr(entity, name) for name in sorted(names - REFERENCES)}
+
+
+def entities(world):
+    return [world.player, *world.enemies, world.key, world.door]
+
+
+def assert_fully_reset(world, fresh):
+    """Compara cada entidade de 'world' com a mesma entidade de 'fresh' (mundo novo, sem pool)."""
+    assert world.state_hash() == fresh.state_hash()
+    for entity, expected in zip(entities(world), entities(fresh)):
+        assert state(entity) == state(expected)
+        if hasattr(entity, "tweens"): # Personagens
+            assert entity.world is world and entity.clock is world.animation_clock and entity.tweens is world.tweens
+        if hasattr(entity, "rng"): # Inimigos
+            assert entity.rng is world.rng
+        if entity.actor is not None:
+            assert entity.actor.image == expected.actor.image and entity.actor.pos == expected.actor.pos
+
+
+def play(world, ticks=400):
+    """Deixa o mundo "sujo": passos pela metade, animações andando, talvez a chave pega."""
+    moves = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    for tick in range(ticks):
+        if world.outcome:
+            break
+        world.step(move=moves[tick // 30 % 4])
+
+
+def fresh_world(seed):
+    world = World(seed=seed, actor_factory=FakeActor, **CONFIG)
+    world.reset(seed)
+    return world
+
+
+def test_released_entities_come_back_fully_reset():
+    actors = ActorPool(FakeActor)
+    pool = EntityPool(actors)
+    old = World(seed=3, actor_factory=actors, pool=pool, **CONFIG)
+    old.reset(3)
+    play(old)
+    used = {id(entity) for entity in entities(old)}
+    old.release() # Como o discard_world() do game.py
+    assert not old.tweens.tweens and not old.tweens.arrivals and not old.moving_enemies
+    assert all(entity.actor is None for entities_ in pool.free.values() for entity in entities_)
+
+    world = World(seed=8, actor_factory=actors, pool=pool, **CONFIG)
+    world.reset(8)
+    assert {id(entity) for entity in entities(world)} == used # As mesmas entidades, reaproveitadas
+    assert actors.created == len(used) # Nenhum Actor novo
+    assert_fully_reset(world, fresh_world(8))
+
+
+def test_restart_resets_in_place():
+    actors = ActorPool(FakeActor)
+    world = World(seed=3, actor_factory=actors, pool=EntityPool(actors), **CONFIG)
+    world.reset(3)
+    for seed in (5, 6, 7): # Como o R no game over: o mesmo mundo, outra semente
+        play(world)
+        world.reset(seed)
+        assert_fully_reset(world, fresh_world(seed))
+    assert world.pool.stats()["entities_created"] == len(entities(world))
+
+
+def test_numpy_views_are_not_pooled():
+    pytest.importorskip("numpy")
+    actors = ActorPool(FakeActor)
+    pool = EntityPool(actors)
+    world = World(seed=3, actor_factory=actors, pool=pool, enemy_backend="numpy", **CONFIG)
+    world.reset(3)
+    world.release()
+    assert all(cls.__name__ != "EnemyView" for cls in pool.free) # Os EnemyView morrem com o engine
+    assert len(actors.free) == actors.created # Todos os Actors voltam ao pool
+    world.reset(4)
+    assert actors.created == CONFIG["enemy_count"] + 3 # Reinício sem Actors novos
+
+
+@pytest.fixture(scope="module")
+def game():
+    """O game.py carregado como no 'pgzrun', sem janela (como no benchmark.py)."""
+    pytest.importorskip("pgzero")
+    cwd = os.getcwd()
+    from benchmark import load_game
+    module = load_game()
+    module.settings.RECORD_GAMES = False
+    module.settings.PROCEDURAL_LEVEL = False
+    yield module
+    os.chdir(cwd)
+
+
+def game_world_copy(world):
+    """Mundo novo, sem pool, com a mesma configuração e semente do mundo do jogo."""
+    fresh = World(seed=world.seed, actor_factory=FakeActor, level=world.level, **{
+        name: getattr(world, name) for name in ("grid_width", "grid_height", "enemy_count", "enemy_backend",
+                                                "enemy_behavior", "enemy_blocking")})
+    fresh.reset(world.seed)
+    return fresh
+
+
+def test_game_discard_and_start_reuse_pooled_entities(game):
+    game.start_game()
+    game.input_queue.key_down(game.MOVE_KEYS[game.keys.RIGHT])
+    for _ in range(120):
+        game.update(1 / 60)
+    game.input_queue.key_up(game.MOVE_KEYS[game.keys.RIGHT])
+    used = {id(entity) for entity in entities(game.world)}
+    created = game.actor_pool.created
+
+    game.discard_world() # ESC: volta ao menu
+    assert game.world is None
+    game.start_game()
+    world = game.world
+    assert {id(entity) for entity in entities(world)} == used
+    assert game.actor_pool.created == created
+    fresh = game_world_copy(world)
+    assert world.state_hash() == fresh.state_hash()
+    for entity, expected in zip(entities(world), entities(fresh)):
+        assert state(entity) == state(expected)
+        assert entity.actor is not None and entity.actor.image == expected.actor.image
+
+    game.GAME_STATE = "GAME_OVER" # R no game over: o mesmo mundo, reiniciado no lugar
+    game.start_game()
+    assert game.world is world
+    assert {id(entity) for entity in entities(world)} == used
+    assert world.state_hash() == game_world_copy(world).state_hash()
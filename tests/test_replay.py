@@ -0,0 +1,88 @@
+# test_replay.py
+
+# Determinismo da simulação: uma partida gravada (semente + entradas) refeita pelo replay precisa
+# passar por todos os checkpoints com o mesmo hash de estado.
+import os
+import random
+
+import pytest
+
+from conftest import ROOT
+from replay import CODE_MOVES, MOVE_CODES, Recorder, Recording, ReplayDesync, replay
+from simulation import World
+
+LEVEL = os.path.join(ROOT, "levels", "level1.map")
+
+# (argumentos do World, semente, ticks): mundo pequeno (todos os chunks ativos), perseguição, fase com
+# paredes, e um mundo grande, em que os inimigos distantes seguem o ritmo dos chunks e a fila de
+# chegadas dos tweens. As sementes são de partidas em que o jogador sobrevive a quase todos os ticks.
+CASES = [
+    ({"grid_width": 12, "grid_height": 9, "enemy_count": 3, "enemy_behavior": "wander"}, 1, 1500),
+    ({"grid_width": 40, "grid_height": 40, "enemy_count": 30, "enemy_behavior": "chase",
+      "enemy_min_distance": 8}, 7, 1500),
+    ({"level": LEVEL, "enemy_count": 5, "enemy_behavior": "flee"}, 6, 1500),
+    ({"grid_width": 200, "grid_height": 200, "enemy_count": 1500, "enemy_behavior": "wander",
+      "enemy_min_distance": 12}, 2, 1500),
+]
+
+
+def record(config, ticks, seed=7, checkpoint_interval=10):
+    """Joga uma partida com um jogador que anda ao acaso (gerador próprio) e devolve (gravação, mundo)."""
+    world = World(seed=seed, **config)
+    world.reset(seed)
+    recorder = Recorder(world, checkpoint_interval)
+    policy = random.Random(seed) # Fora do world.rng: as entradas não podem mexer no gerador da simulação
+    for _ in range(ticks):
+        if world.outcome:
+            break
+        move = None if world.player.moving else policy.choice(list(CODE_MOVES.values())[1:])
+        recorder.step(move=move)
+    return recorder.recording, world
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("config, seed, ticks", CASES)
+def test_replay_matches_every_checkpoint(config, seed, ticks, backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    recording, world = record({**config, "enemy_backend": backend}, ticks, seed)
+    assert recording.checkpoints
+    replayed = replay(recording) # Lança ReplayDesync no primeiro checkpoint diferente
+    assert replayed.tick_count == world.tick_count
+    assert replayed.state_hash() == world.state_hash()
+    assert replayed.outcome == world.outcome
+
+
+def test_every_tick_checkpoint():
+    recording, world = record(CASES[1][0], 400, CASES[1][1], checkpoint_interval=1)
+    assert len(recording.checkpoints) == world.tick_count
+    assert replay(recording).state_hash() == world.state_hash()
+
+
+def test_saved_recording_replays(tmp_path):
+    recording, world = record(CASES[0][0], 1000, CASES[0][1])
+    path = tmp_path / "partida.rec"
+    recording.save(str(path))
+    loaded = Recording.load(str(path))
+    assert loaded.inputs == recording.inputs
+    assert loaded.checkpoints == recording.checkpoints
+    assert replay(loaded).state_hash() == world.state_hash()
+
+
+def test_changed_input_is_detected():
+    recording, _ = record(CASES[1][0], 600, CASES[1][1])
+    tick = next(i for i, code in enumerate(recording.inputs) if code != MOVE_CODES[None])
+    recording.inputs[tick] = MOVE_CODES[None] # O jogador deixa de dar um passo
+    with pytest.raises(ReplayDesync) as error:
+        replay(recording)
+    assert error.value.tick > tick
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    recording, _ = record(CASES[0][0], 50)
+    path = tmp_path / "partida.rec"
+    recording.save(str(path))
+    header, inputs = path.read_bytes().split(b"\n", 1)
+    path.write_bytes(header.replace(b'"format": ', b'"format": 9', 1) + b"\n" + inputs)
+    with pytest.raises(ValueError):
+        Recording.load(str(path))
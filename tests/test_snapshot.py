@@ -0,0 +1,104 @@
+# test_snapshot.py
+
+# Fotografias do mundo (snapshot.py): restaurar uma fotografia e repetir as mesmas entradas precisa
+# reproduzir a mesma sequência de hashes de estado; arquivos de outra versão ou cortados são recusados.
+import random
+
+import pytest
+
+from replay import CODE_MOVES
+from simulation import World
+from snapshot import ENTITY_RECORD, HEADER, MAGIC, capture, load, restore, save
+
+# (argumentos do World, semente): mundo pequeno (todos os chunks ativos) e um mundo grande, com
+# inimigos dormindo e passos em andamento na fila de chegadas dos tweens no momento da fotografia.
+CASES = [
+    ({"grid_width": 12, "grid_height": 9, "enemy_count": 3, "enemy_behavior": "wander"}, 1),
+    ({"grid_width": 200, "grid_height": 200, "enemy_count": 1500, "enemy_behavior": "wander",
+      "enemy_min_distance": 12}, 2),
+]
+
+
+def play(world, ticks, policy):
+    """Joga 'ticks' ticks com um jogador que anda ao acaso; devolve (entradas, hashes de cada tick)."""
+    moves, hashes = [], []
+    for _ in range(ticks):
+        move = None if world.player.moving else policy.choice(list(CODE_MOVES.values())[1:])
+        world.step(move=move)
+        moves.append(move)
+        hashes.append(world.state_hash())
+    return moves, hashes
+
+
+def replay_moves(world, moves):
+    hashes = []
+    for move in moves:
+        world.step(move=move)
+        hashes.append(world.state_hash())
+    return hashes
+
+
+def snapshot_of(config, seed, backend, ticks=300):
+    """Mundo jogado por 'ticks' ticks e a fotografia dele."""
+    world = World(seed=seed, **config, enemy_backend=backend)
+    world.reset(seed)
+    play(world, ticks, random.Random(seed))
+    return world, capture(world)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("config, seed", CASES)
+def test_restore_reproduces_state_hashes(config, seed, backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    world, data = snapshot_of(config, seed, backend)
+    before = world.state_hash()
+    moves, hashes = play(world, 300, random.Random(seed + 1))
+
+    fresh = restore(data) # Mundo novo, criado a partir do cabeçalho
+    assert fresh is not world
+    assert fresh.state_hash() == before
+    assert replay_moves(fresh, moves) == hashes
+
+    rolled_back = restore(data, world) # Rollback: o mesmo mundo, sem alocar entidades
+    assert rolled_back is world
+    assert world.state_hash() == before
+    assert replay_moves(world, moves) == hashes
+
+
+def test_saved_snapshot_loads(tmp_path):
+    world, data = snapshot_of(*CASES[0], "python")
+    path = tmp_path / "mundo.snap"
+    save(world, str(path))
+    assert path.read_bytes() == bytes(data)
+    loaded = load(str(path)) # Lido pelo mmap
+    assert loaded.state_hash() == world.state_hash()
+
+
+def test_wrong_version_is_rejected(tmp_path):
+    world, data = snapshot_of(*CASES[0], "python", ticks=50)
+    _, version, flags = HEADER.unpack_from(data, 0)
+    HEADER.pack_into(data, 0, MAGIC, version + 1, flags)
+    with pytest.raises(ValueError):
+        restore(data)
+    path = tmp_path / "mundo.snap"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        load(str(path), world)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_truncated_snapshot_is_rejected(tmp_path, backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    world, data = snapshot_of(*CASES[0], backend, ticks=50)
+    # Cortes no meio de um registro, no limite de um inimigo (o que o iter_unpack aceitaria) e no cabeçalho.
+    for size in (len(data) - 1, len(data) - ENTITY_RECORD.size, HEADER.size + 3):
+        with pytest.raises(ValueError):
+            restore(bytes(data[:size]))
+        path = tmp_path / "mundo.snap"
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            load(str(path), world)
+    with pytest.raises(ValueError): # Bytes a mais também não batem com o layout
+        restore(bytes(data) + b"\0")
@@ -0,0 +1,106 @@
+# test_tween.py
+
+# Gerenciador de tweens (tween.py): posição pelo relógio, ordem de chegada da fila de prioridade e o
+# limite da fila depois de muitos passos terminados por update() (_compact).
+import pytest
+
+from tween import COMPACT_SLACK, TweenManager
+
+
+class Clock:
+    def __init__(self):
+        self.time = 0.0
+
+
+class Target:
+    def __init__(self, name):
+        self.name = name
+        self.x = 0.0
+        self.y = 0.0
+
+
+def make_manager():
+    clock = Clock()
+    return TweenManager(clock), clock
+
+
+def test_position_follows_the_clock():
+    tweens, clock = make_manager()
+    target = Target("a")
+    done = []
+    tweens.move(target, 10.0, 20.0, duration=1.0, on_done=lambda: done.append(target.name))
+    clock.time = 0.25
+    assert tweens.update() == 0
+    assert (target.x, target.y) == (2.5, 5.0)
+    clock.time = 1.5 # Passou do fim: para exatamente no destino
+    assert tweens.update() == 1
+    assert (target.x, target.y) == (10.0, 20.0)
+    assert done == ["a"]
+    assert tweens.get(target) is None
+
+
+def test_easing_keeps_the_end_points():
+    tweens, clock = make_manager()
+    target = Target("a")
+    tweens.move(target, 10.0, 0.0, duration=1.0, easing="smoothstep")
+    clock.time = 0.25
+    tweens.update()
+    assert target.x == pytest.approx(10.0 * 0.15625)
+    with pytest.raises(ValueError):
+        tweens.move(target, 0.0, 0.0, duration=1.0, easing="bounce")
+
+
+def test_finish_due_in_arrival_order():
+    tweens, clock = make_manager()
+    done = []
+    ends = {"a": 0.3, "b": 0.1, "c": 0.2, "d": 0.1, "e": 0.9}
+    for name, duration in ends.items():
+        target = Target(name)
+        tweens.move(target, 1.0, 1.0, duration, on_done=lambda name=name: done.append(name))
+    clock.time = 0.5
+    assert tweens.finish_due() == 4
+    assert done == ["b", "d", "c", "a"] # Chegadas no mesmo instante saem na ordem em que começaram
+    assert [tween.target.name for tween in tweens.tweens.values()] == ["e"]
+
+
+def test_replaced_and_updated_entries_are_skipped():
+    tweens, clock = make_manager()
+    done = []
+    a, b = Target("a"), Target("b")
+    tweens.move(a, 1.0, 0.0, 0.1, on_done=lambda: done.append("a1"))
+    tweens.move(a, 2.0, 0.0, 0.5, on_done=lambda: done.append("a2")) # Substitui o primeiro movimento
+    tweens.move(b, 1.0, 0.0, 0.1, on_done=lambda: done.append("b"))
+    clock.time = 0.2
+    tweens.update((b,)) # Termina 'b' por update(): a entrada dele na fila fica antiga
+    assert tweens.finish_due() == 0
+    clock.time = 0.6
+    assert tweens.finish_due() == 1
+    assert done == ["b", "a2"]
+    assert a.x == 2.0
+
+
+def test_compact_bounds_the_arrivals_heap():
+    tweens, clock = make_manager()
+    targets = [Target(str(i)) for i in range(5)]
+    for _ in range(2000): # Todos avaliados por update() a cada tick, sem finish_due()
+        for target in targets:
+            if tweens.get(target) is None:
+                tweens.move(target, target.x + 1.0, 0.0, 0.05)
+        clock.time += 1 / 60
+        tweens.update(targets)
+        assert len(tweens.arrivals) <= 2 * len(targets) + COMPACT_SLACK # Checado a cada inserção: no máximo um tween por alvo
+    assert tweens.pushes > 10 * (2 * len(targets) + COMPACT_SLACK) # A fila de fato foi compactada várias vezes
+
+
+def test_compact_keeps_arrival_order():
+    tweens, clock = make_manager()
+    done = []
+    stale = Target("stale")
+    for i in range(3 * COMPACT_SLACK): # Entradas antigas do mesmo alvo, cada uma substituída pela seguinte
+        tweens.move(stale, 0.0, 0.0, 10.0 + i)
+    for name, duration in (("c", 0.3), ("a", 0.1), ("b", 0.2), ("d", 0.1)):
+        tweens.move(Target(name), 1.0, 1.0, duration, on_done=lambda name=name: done.append(name))
+    assert len(tweens.arrivals) <= 2 * len(tweens.tweens) + COMPACT_SLACK
+    clock.time = 1.0
+    tweens.finish_due()
+    assert done == ["a", "d", "b", "c"]
@@ -0,0 +1,228 @@
+# tilemap.py
+
+# Formato de fase (level) em tiles: piso, paredes e marcadores de spawn em uma grade plana de bytes.
+# O arquivo binário (.map) é um cabeçalho seguido de largura x altura bytes, linha por linha, um byte
+# por tile. Ele é aberto com mmap: nenhum texto é interpretado ao carregar, e o sistema operacional
+# só lê do disco as páginas da grade que o jogo realmente consulta.
+#
+# As fases são escritas à mão em texto (levels/*.txt), um caractere por tile:
+#     .  piso             #  parede
+#     @  jogador          e  inimigo
+#     k  chave            d  porta
+# Linhas que começam com ';' são comentários; linhas mais curtas são completadas com parede.
+# Os marcadores são piso: eles só dizem onde as entidades nascem (World.reset()).
+#
+# Converter a fase de texto para o formato binário:
+#     python tilemap.py levels/level1.txt                (grava levels/level1.map)
+#     python tilemap.py --show levels/level1.map          (imprime a fase de volta em texto)
+#     python tilemap.py --benchmark 2000                  (texto x mmap em um mapa 2000 x 2000)
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError: # Sem NumPy, só are_walkable() (usada pelo backend "numpy") fica indisponível
+    np = None
+
+TILEMAP_FORMAT = 1 # Versão do layout; muda se o cabeçalho ou os códigos mudarem
+MAGIC = b"TMAP"
+HEADER = struct.Struct("<4sHHII") # magic, versão, reservado, largura, altura
+
+# Códigos dos tiles (um byte cada). Só WALL bloqueia o movimento.
+FLOOR = 0
+WALL = 1
+PLAYER_SPAWN = 2
+ENEMY_SPAWN = 3
+KEY_SPAWN = 4
+DOOR_SPAWN = 5
+
+SYMBOLS = {".": FLOOR, "#": WALL, "@": PLAYER_SPAWN, "e": ENEMY_SPAWN, "k": KEY_SPAWN, "d": DOOR_SPAWN}
+CHARACTERS = {code: symbol for symbol, code in SYMBOLS.items()}
+COMMENT = ";"
+
+
+class TileMap:
+    # Grade de tiles somente leitura sobre qualquer buffer (bytes, bytearray ou mmap).
+    def __init__(self, width, height, data, offset=0):
+        if len(data) - offset < width * height:
+            raise ValueError(f"Mapa {width}x{height} precisa de {width * height} bytes de grade; "
+                             f"o arquivo tem {len(data) - offset}.")
+        self.width = width
+        self.height = height
+        self.data = data # Buffer inteiro (mantém o mmap vivo enquanto o mapa existir)
+        self.offset = offset # Onde a grade começa dentro do buffer
+        self.grid = memoryview(data)[offset:offset + width * height] # Índice y * width + x -> código
+        self._markers = {} # código -> lista de tiles, calculada na primeira consulta
+        self._array = None # A mesma grade como array NumPy (altura x largura), sem cópia
+
+    def code(self, tile_x, tile_y):
+        """Código do tile; fora do mapa, conta como parede."""
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.grid[tile_y * self.width + tile_x]
+        return WALL
+
+    def is_walkable(self, tile_x, tile_y):
+        """O tile está dentro do mapa e não é parede: uma comparação e um acesso à grade, O(1)."""
+        return 0 <= tile_x < self.width and 0 <= tile_y < self.height and \
+            self.grid[tile_y * self.width + tile_x] != WALL
+
+    def array(self):
+        """A grade como array NumPy (altura x largura) que aponta para o mesmo buffer."""
+        if self._array is None:
+            self._array = np.frombuffer(self.grid, dtype=np.uint8).reshape(self.height, self.width)
+        return self._array
+
+    def are_walkable(self, tile_x, tile_y):
+        """Versão de is_walkable para arrays NumPy de tiles; retorna um array de booleanos."""
+        inside = (tile_x >= 0) & (tile_x < self.width) & (tile_y >= 0) & (tile_y < self.height)
+        result = inside.copy()
+        result[inside] = self.array()[tile_y[inside], tile_x[inside]] != WALL
+        return result
+
+    def markers(self, code):
+        """Tiles (x, y) com o marcador 'code', em ordem de leitura (linha por linha)."""
+        tiles = self._markers.get(code)
+        if tiles is None:
+            tiles = []
+            data, start, end, needle = self.data, self.offset, self.offset + self.width * self.height, bytes([code])
+            position = data.find(needle, start, end) # Busca em C: não percorre a grade tile a tile
+            while position != -1:
+                index = position - start
+                tiles.append((index % self.width, index // self.width))
+                position = data.find(needle, position + 1, end)
+            self._markers[code] = tiles
+        return tiles
+
+    def to_bytes(self):
+        """O mapa no formato binário (cabeçalho + grade)."""
+        return HEADER.pack(MAGIC, TILEMAP_FORMAT, 0, self.width, self.height) + bytes(self.grid)
+
+    def to_text(self):
+        """O mapa de volta no formato de texto editável."""
+        width = self.width
+        rows = bytes(self.grid).decode("latin-1").translate({code: symbol for code, symbol in CHARACTERS.items()})
+        return "\n".join(rows[y * width:(y + 1) * width] for y in range(self.height)) + "\n"
+
+
+def parse_text(text):
+    """Lê uma fase em texto; lança ValueError apontando linha e coluna de um caractere desconhecido."""
+    rows = []
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.rstrip()
+        if not line or line.startswith(COMMENT):
+            continue
+        for column, symbol in enumerate(line, 1):
+            if symbol not in SYMBOLS:
+                raise ValueError(f"Linha {number}, coluna {column}: caractere {symbol!r} desconhecido "
+                                 f"(use {' '.join(SYMBOLS)}).")
+        rows.append(line)
+    if not rows:
+        raise ValueError("A fase está vazia.")
+    width = max(len(row) for row in rows)
+    grid = bytearray([WALL]) * (width * len(rows)) # Linhas curtas ficam completadas com parede
+    table = str.maketrans({symbol: chr(code) for symbol, code in SYMBOLS.items()})
+    for y, row in enumerate(rows):
+        grid[y * width:y * width + len(row)] = row.translate(table).encode("latin-1")
+    return TileMap(width, len(rows), grid)
+
+
+def load_text(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_text(f.read())
+
+
+def save(tilemap, path):
+    """Grava o mapa binário (em um temporário e troca, como os saves)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(tilemap.to_bytes())
+    os.replace(temporary, path)
+
+
+def load(path):
+    """Abre um mapa binário por mmap: só o cabeçalho é lido agora, a grade é lida sob demanda."""
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) # O mmap continua válido depois de fechar o arquivo
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: arquivo curto demais para um mapa.")
+    magic, version, _, width, height = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: não é um mapa de tiles.")
+    if version != TILEMAP_FORMAT:
+        raise ValueError(f"{path}: formato de mapa {version} não suportado (esperado {TILEMAP_FORMAT}).")
+    return TileMap(width, height, data, HEADER.size)
+
+
+def convert(source, target=None):
+    """Converte uma fase de texto para o formato binário; retorna o caminho gravado."""
+    target = target or os.path.splitext(source)[0] + ".map"
+    save(load_text(source), target)
+    return target
+
+# Explicação da Decisão:
+# - Um byte por tile em uma grade plana: a pergunta "dá para andar aqui?" vira um acesso por índice
+#   (y * largura + x), sem dicionários nem objetos por tile, tanto no movimento quanto no spawn.
+# - O formato binário não precisa ser interpretado: abrir um mapa enorme custa o mesmo que abrir um
+#   pequeno (ler o cabeçalho), e a mesma grade serve ao NumPy sem cópia (backend "numpy").
+# - O texto continua sendo a fonte editável (e o que vai para o controle de versão); o .map é gerado
+#   pelo conversor, do mesmo jeito que o atlas de sprites é gerado a partir das imagens.
+# - Os marcadores de spawn ficam na própria grade: quem desenha a fase decide onde o jogador, a chave e a
+#   porta nascem; sem marcadores, o sorteio com distâncias mínimas (placement.py) continua valendo.
+
+
+def benchmark(side=2000, seed=1):
+    """Tempo para abrir um mapa side x side a partir do texto e a partir do binário (mmap)."""
+    import random
+    import tempfile
+    import time
+
+    rng = random.Random(seed)
+    rows = ["".join(rng.choice("....#") for _ in range(side)) for _ in range(side)]
+    text = "\n".join(rows) + "\n"
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "bench.map")
+        start = time.perf_counter()
+        tilemap = parse_text(text)
+        text_time = time.perf_counter() - start
+        save(tilemap, path)
+        start = time.perf_counter()
+        loaded = load(path)
+        load_time = time.perf_counter() - start
+        queries = [(rng.randrange(side), rng.randrange(side)) for _ in range(100000)]
+        start = time.perf_counter()
+        for tile_x, tile_y in queries:
+            loaded.is_walkable(tile_x, tile_y)
+        query_time = (time.perf_counter() - start) / len(queries)
+        del loaded, tilemap
+    return {"side": side, "text_ms": text_time * 1000, "mmap_ms": load_time * 1000, "query_ns": query_time * 1e9}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Converte fases de texto para o formato binário de tiles.")
+    parser.add_argument("source", nargs="?", help="Fase em texto (ex: levels/level1.txt)")
+    parser.add_argument("target", nargs="?", help="Arquivo .map de saída (padrão: mesmo nome, extensão .map)")
+    parser.add_argument("--show", metavar="MAPA", help="Imprime um arquivo .map de volta em texto")
+    parser.add_argument("--benchmark", metavar="LADO", type=int, help="Compara texto e mmap em um mapa LADO x LADO")
+    args = parser.parse_args()
+
+    if args.show:
+        tilemap = load(args.show)
+        print(f"{args.show}: {tilemap.width}x{tilemap.height}")
+        print(tilemap.to_text(), end="")
+    elif args.benchmark:
+        result = benchmark(args.benchmark)
+        print(f"Mapa {result['side']}x{result['side']}: texto {result['text_ms']:.1f} ms, "
+              f"mmap {result['mmap_ms']:.3f} ms, is_walkable {result['query_ns']:.0f} ns")
+    elif args.source:
+        try:
+            target = convert(args.source, args.target)
+        except ValueError as e:
+            raise SystemExit(f"{args.source}: {e}")
+        tilemap = load(target)
+        print(f"{target}: {tilemap.width}x{tilemap.height}, {len(tilemap.markers(ENEMY_SPAWN))} inimigos marcados")
+    else:
+        parser.print_help()
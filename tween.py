@@ -0,0 +1,169 @@
+# tween.py
+
+# Interpolações de movimento (tweens) compartilhadas por todos os personagens.
+# Um passo entre dois tiles vira um único registro: início, fim, instante de início, duração e curva
+# (easing). A posição não é somada tick a tick: ela é uma conta a partir do relógio do mundo,
+#     progresso = (agora - início) / duração
+#     posição   = início + (fim - início) * easing(progresso)
+# e, quando o tempo do passo se esgota, o personagem fica exatamente no fim e o gerenciador chama o
+# 'on_done' do registro (ex: voltar para a animação "idle").
+# Quem não precisa da posição a meio caminho (ex: inimigos longe da tela) nem é avaliado: uma fila
+# de prioridade ordenada pelo instante de chegada entrega só os movimentos que terminaram.
+#
+# Uso:
+#     tweens = TweenManager(world.animation_clock)
+#     tweens.move(player, 160.0, 96.0, duration=0.4, on_done=player.finish_step)
+#     tweens.update((player,))                    (uma vez por tick, depois de avançar o relógio)
+#     tweens.finish_due()                          (termina todos os movimentos que já chegaram)
+import heapq
+
+
+# Curvas de progresso: recebem e devolvem um valor entre 0 e 1.
+def linear(t):
+    return t
+
+
+def smoothstep(t):
+    return t * t * (3 - 2 * t) # Começa e termina devagar
+
+
+def ease_out(t):
+    return 1 - (1 - t) * (1 - t) # Começa rápido e freia no tile
+
+
+EASINGS = {"linear": linear, "smoothstep": smoothstep, "ease_out": ease_out}
+EASING_NAMES = list(EASINGS) # Ordem fixa: o índice da curva é o que vai para as fotografias (snapshot.py)
+EPSILON = 1e-9 # Folga (em segundos) na comparação do fim: o relógio é uma soma de floats
+COMPACT_SLACK = 64 # Entradas antigas toleradas na fila de chegadas além do número de movimentos em andamento
+
+
+class Tween:
+    # Um movimento em andamento; 'target' é qualquer objeto com atributos 'x' e 'y'.
+    __slots__ = ("target", "start_x", "start_y", "end_x", "end_y", "start_time", "duration", "end_time",
+                 "easing", "on_done")
+
+    def __init__(self, target, start_x, start_y, end_x, end_y, start_time, duration, easing, on_done):
+        self.target = target
+        self.start_x = start_x
+        self.start_y = start_y
+        self.end_x = end_x
+        self.end_y = end_y
+        self.start_time = start_time # Instante do relógio em que o movimento começou
+        self.duration = duration # Segundos até chegar ao fim
+        self.end_time = start_time + duration # Instante da chegada
+        self.easing = easing # Nome da curva (chave de EASINGS)
+        self.on_done = on_done # Função sem argumentos chamada ao chegar (ou None)
+
+
+class TweenManager:
+    # Todos os movimentos em andamento, no máximo um por alvo, avaliados em lote pelo mesmo relógio.
+    def __init__(self, clock):
+        self.clock = clock # Qualquer objeto com 'time' em segundos (ex: o AnimationClock do mundo)
+        self.tweens = {} # alvo -> Tween
+        self.arrivals = [] # Heap de (instante de chegada, contador, Tween); entradas antigas são ignoradas ao sair ou descartadas por _compact()
+        self.pushes = 0 # Contador de inserções: desempata chegadas no mesmo instante sem comparar Tweens
+
+    def clear(self):
+        self.tweens = {}
+        self.arrivals = []
+
+    def move(self, target, end_x, end_y, duration, easing="linear", on_done=None):
+        """Começa a mover o alvo da posição atual até (end_x, end_y) em 'duration' segundos (substitui um movimento anterior)."""
+        return self.restore(target, target.x, target.y, end_x, end_y, self.clock.time, duration, easing, on_done)
+
+    def restore(self, target, start_x, start_y, end_x, end_y, start_time, duration, easing="linear", on_done=None):
+        """Recria um movimento que começou no instante 'start_time' (ex: ao restaurar uma fotografia)."""
+        if easing not in EASINGS:
+            raise ValueError(f"Curva de movimento desconhecida: {easing!r} (use {', '.join(EASINGS)}).")
+        tween = self.tweens[target] = Tween(target, start_x, start_y, end_x, end_y, start_time, duration,
+                                            easing, on_done)
+        self.pushes += 1
+        heapq.heappush(self.arrivals, (tween.end_time, self.pushes, tween))
+        if len(self.arrivals) > 2 * len(self.tweens) + COMPACT_SLACK:
+            self._compact()
+        return tween
+
+    def get(self, target):
+        """O movimento em andamento do alvo, ou None."""
+        return self.tweens.get(target)
+
+    def update(self, targets=None):
+        """
+        Põe cada alvo (todos, ou só os de 'targets') na posição do instante atual do relógio.
+        Os que chegaram ao fim saem do gerenciador e têm o 'on_done' chamado, depois de todos os
+        outros terem sido posicionados. Retorna quantos movimentos terminaram.
+        """
+        now = self.clock.time
+        tweens = self.tweens
+        running = list(tweens.values()) if targets is None else map(tweens.get, targets)
+        finished = []
+        for tween in running:
+            if tween is None: # Alvo sem movimento em andamento
+                continue
+            if now >= tween.end_time - EPSILON: # Também cobre passos de duração zero
+                finished.append(tween)
+                continue
+            progress = (now - tween.start_time) / tween.duration
+            easing = tween.easing
+            if easing != "linear":
+                progress = EASINGS[easing](progress)
+            start_x, start_y = tween.start_x, tween.start_y
+            target = tween.target
+            target.x = start_x + (tween.end_x - start_x) * progress
+            target.y = start_y + (tween.end_y - start_y) * progress
+        return self._finish(finished)
+
+    def finish_due(self):
+        """
+        Termina todos os movimentos cujo instante de chegada já passou, avaliados ou não por update().
+        O custo depende só de quantos chegaram, não de quantos estão em andamento.
+        """
+        limit = self.clock.time + EPSILON
+        arrivals = self.arrivals
+        tweens = self.tweens
+        finished = []
+        while arrivals and arrivals[0][0] <= limit:
+            tween = heapq.heappop(arrivals)[2]
+            if tweens.get(tween.target) is tween: # Senão é uma entrada antiga (substituída ou já terminada por update())
+                finished.append(tween)
+        return self._finish(finished)
+
+    def _compact(self):
+        """
+        Descarta da fila de chegadas as entradas de movimentos que já terminaram por update() ou foram
+        substituídos. Sem isso, quem nunca chama finish_due() (ex: todos os alvos avaliados
+        por update() a cada tick) acumularia uma entrada por passo dado, prendendo os alvos na memória.
+        """
+        tweens = self.tweens
+        self.arrivals = [entry for entry in self.arrivals if tweens.get(entry[2].target) is entry[2]]
+        heapq.heapify(self.arrivals) # O contador desempata: a ordem de saída é a mesma de antes
+
+    def _finish(self, finished):
+        """Põe os alvos exatamente no fim, tira os movimentos do gerenciador e chama os 'on_done'."""
+        tweens = self.tweens
+        for tween in finished:
+            target = tween.target
+            target.x = tween.end_x # Exatamente no fim, sem passar do ponto
+            target.y = tween.end_y
+            del tweens[target]
+        for tween in finished:
+            if tween.on_done:
+                tween.on_done()
+        return len(finished)
+
+# Explicação da Decisão:
+# - Antes, cada personagem recalculava a cada tick a distância até o alvo (raiz quadrada e divisão)
+#   para andar 'speed * dt' pixels; agora a conta por tick é uma interpolação, e a chegada é uma
+#   comparação do tempo, não da distância.
+# - A posição depende só do relógio: não acumula erro de arredondamento, não depende de quantas vezes
+#   o alvo foi avaliado e chega ao tile no mesmo tick a qualquer taxa de quadros. Por isso quem está
+#   longe da tela nem precisa ser avaliado: a fila de chegadas (como a do scheduler.py) o termina no
+#   tick certo, e uma avaliação posterior continua do ponto exato.
+# - As entradas antigas da fila são apagadas de forma preguiçosa: ao sair (finish_due) ou, quando
+#   passam do dobro dos movimentos em andamento, de uma vez (_compact). A fila fica limitada em
+#   qualquer caminho do World, inclusive quando todos os alvos são avaliados por update(), e o custo
+#   da limpeza se dilui entre os passos que a encheram.
+# - O fim do movimento é um evento (on_done): quem precisa reagir à chegada (animação "idle",
+#   escalonador de turnos) é chamado uma vez, em vez de checar 'moving' a cada tick.
+# - Todos os registros ficam em um único dicionário avaliado em lote; o gerenciador não conhece
+#   personagens, só objetos com 'x' e 'y'.